@@ -0,0 +1,63 @@
+"""Compare JSON and binary ingest throughput up to normalized events.
+
+JSON path:   json.loads -> EventIn validation -> model_dump -> normalize
+Binary path: decode_events -> normalize
+
+Usage: python benchmarks/bench_ingest.py [--events N] [--repeat R]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+from main import EventIn  # noqa: E402
+from security_dashboard import EventNormalizer  # noqa: E402
+from security_dashboard.codec import decode_events, encode_events  # noqa: E402
+from synthetic import generate_events  # noqa: E402
+
+
+def best_of(repeat: int, run: Callable[[], List[object]]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw_events = generate_events(args.events)
+    json_body = json.dumps(raw_events).encode()
+    binary_body = encode_events(raw_events)
+    normalizer = EventNormalizer(id_factory=lambda event: str(event.get("id")))
+
+    def json_path() -> List[object]:
+        models = [EventIn.model_validate(item) for item in json.loads(json_body)]
+        return [normalizer.normalize(model.model_dump(exclude_none=True)) for model in models]
+
+    def binary_path() -> List[object]:
+        return [normalizer.normalize(raw_event) for raw_event in decode_events(binary_body)]
+
+    json_seconds = best_of(args.repeat, json_path)
+    binary_seconds = best_of(args.repeat, binary_path)
+    print(f"events:        {args.events}")
+    print(f"payload bytes: json={len(json_body)} binary={len(binary_body)}")
+    print(f"json path:     {args.events / json_seconds:,.0f} events/s")
+    print(f"binary path:   {args.events / binary_seconds:,.0f} events/s")
+    print(f"speedup:       {json_seconds / binary_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
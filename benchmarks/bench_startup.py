@@ -0,0 +1,117 @@
+"""Check batch start-up cost: package import time and time to first event.
+
+Each repeat runs a fresh interpreter that times ``import security_dashboard``,
+then building ``default_pipeline`` over a small event file and receiving the
+first normalized event. Medians are compared against the targets and the run
+fails (exit status 1) when a target is missed or when optional heavy
+dependencies such as rich or fastapi were imported on the way.
+
+Usage: python benchmarks/bench_startup.py [--repeat R] [--import-target-ms MS] [--first-event-target-ms MS]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "benchmarks")]
+
+from synthetic import generate_events  # noqa: E402
+
+HEAVY_MODULES = ("rich", "fastapi", "pydantic", "multiprocessing.shared_memory")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import security_dashboard
+imported = time.perf_counter()
+first = []
+
+class FirstEvent:
+    def on_event(self, event):
+        if not first:
+            first.append(time.perf_counter())
+    def on_alert(self, alert): pass
+    def on_incident(self, incident): pass
+    def on_report(self, report): pass
+
+pipeline = security_dashboard.default_pipeline(security_dashboard.FileEventSource([sys.argv[1]]))
+pipeline.observers.append(FirstEvent())
+pipeline.run()
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_event_ms": (first[0] - started) * 1000,
+    "run_ms": (finished - started) * 1000,
+    "heavy_modules": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def probe(events_file: Path) -> Dict[str, object]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, str(events_file)], env=env, capture_output=True, text=True, check=True
+    )
+    result = json.loads(output.stdout)
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def interpreter_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--import-target-ms", type=float, default=50.0)
+    parser.add_argument("--first-event-target-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        events_file = Path(directory) / "events.jsonl"
+        events_file.write_text("\n".join(json.dumps(event) for event in generate_events(args.events)))
+        runs: List[Dict[str, object]] = [probe(events_file) for _ in range(args.repeat)]
+    baseline = statistics.median(interpreter_ms() for _ in range(args.repeat))
+
+    medians = {
+        name: statistics.median(run[name] for run in runs)
+        for name in ("import_ms", "first_event_ms", "run_ms", "process_ms")
+    }
+    heavy = sorted({name for run in runs for name in run["heavy_modules"]})
+    print(f"interpreter start:   {baseline:7.1f} ms")
+    print(f"import package:      {medians['import_ms']:7.1f} ms (target {args.import_target_ms:.0f})")
+    print(f"first event:         {medians['first_event_ms']:7.1f} ms (target {args.first_event_target_ms:.0f})")
+    print(f"run {args.events} events:      {medians['run_ms']:7.1f} ms")
+    print(f"whole process:       {medians['process_ms']:7.1f} ms")
+    print(f"heavy modules:       {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if medians["import_ms"] > args.import_target_ms:
+        failures.append("import time")
+    if medians["first_event_ms"] > args.first_event_target_ms:
+        failures.append("time to first event")
+    if heavy:
+        failures.append("heavy imports")
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""Step up load on POST /run-pipeline and report latency percentiles and saturation.
+
+By default the FastAPI app runs in-process through httpx's ASGI transport.
+Pass --serve to start a local uvicorn, or --url to target a running server.
+For every batch size, concurrency is stepped up until throughput stops
+growing by --min-gain, p99 exceeds --p99-target or requests fail; the last
+step before that is reported as the saturation point. Each request carries
+fresh event ids so the result cache does not hide pipeline cost. Every step
+reports its sample count; a percentile needs at least MIN_SAMPLES requests
+(1000 for p999) and is reported as n/a (null) below that, since with fewer
+samples the nearest rank is simply the slowest request.
+
+Usage: python benchmarks/loadtest.py [--concurrency 1,2,4,8] [--batch-sizes 10,100,1000]
+                                     [--requests N] [--mix baseline] [--output FILE]
+                                     [--baseline FILE] [--serve | --url URL]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+from synthetic import MIXES, generate_events  # noqa: E402
+
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+# Fewest samples for which a percentile is not just the maximum: 1000 for p999.
+MIN_SAMPLES = {name: math.ceil(round(100 / (100 - q), 9)) for name, q in PERCENTILES.items()}
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of ``values``; ``nan`` when empty."""
+
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(1, math.ceil(round(q * len(ordered) / 100, 9)))
+    return ordered[rank - 1]
+
+
+def percentiles(values: Sequence[float], scale: float = 1.0) -> Dict[str, Optional[float]]:
+    """:data:`PERCENTILES` of ``values`` times ``scale``; ``None`` below :data:`MIN_SAMPLES`."""
+
+    return {
+        name: percentile(values, q) * scale if len(values) >= MIN_SAMPLES[name] else None
+        for name, q in PERCENTILES.items()
+    }
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse ``name;dur=ms`` entries of a ``Server-Timing`` header."""
+
+    timings: Dict[str, float] = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if name and key == "dur":
+                timings[name] = float(value)
+    return timings
+
+
+def summarize(
+    concurrency: int,
+    batch_size: int,
+    latencies: List[float],
+    stage_timings: List[Dict[str, float]],
+    errors: int,
+    cache_hits: int,
+    elapsed: float,
+) -> Dict[str, Any]:
+    completed = len(latencies)
+    stages: Dict[str, List[float]] = {}
+    for timings in stage_timings:
+        for name, duration in timings.items():
+            stages.setdefault(name, []).append(duration)
+    return {
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "requests": completed + errors,
+        "samples": completed,
+        "errors": errors,
+        "cache_hits": cache_hits,
+        "elapsed_s": elapsed,
+        "requests_per_s": completed / elapsed if elapsed else 0.0,
+        "events_per_s": completed * batch_size / elapsed if elapsed else 0.0,
+        "latency_ms": percentiles(latencies, 1000),
+        "server_timing_ms": {
+            name: {"mean": sum(values) / len(values), "p99": percentiles(values)["p99"]}
+            for name, values in stages.items()
+        },
+    }
+
+
+def find_saturation(
+    steps: Sequence[Dict[str, Any]], min_gain: float, p99_target_ms: Optional[float]
+) -> Optional[Dict[str, Any]]:
+    """Return the step where ``steps`` (ascending load) stop scaling, or ``None``.
+
+    A step saturates when it has errors, breaches ``p99_target_ms`` or does
+    not raise throughput by at least ``min_gain`` over the best step so far.
+    Steps with too few samples for a p99 are not checked against the target.
+    The returned dict names the last healthy step and the reason.
+    """
+
+    best: Optional[Dict[str, Any]] = None
+    for step in steps:
+        reason = None
+        if step["errors"]:
+            reason = "errors"
+        elif p99_target_ms is not None and (step["latency_ms"]["p99"] or 0.0) > p99_target_ms:
+            reason = "p99"
+        elif best is not None and step["events_per_s"] < best["events_per_s"] * (1 + min_gain):
+            reason = "throughput"
+        if reason is not None:
+            return {
+                "reason": reason,
+                "concurrency": best["concurrency"] if best else None,
+                "events_per_s": best["events_per_s"] if best else 0.0,
+                "first_saturated_concurrency": step["concurrency"],
+            }
+        best = step
+    return None
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    batch_size: int,
+    requests: int,
+    mix: str,
+    counter: "itertools.count[int]",
+) -> Dict[str, Any]:
+    payloads = [
+        generate_events(batch_size, seed=None, id_prefix=f"load-{next(counter)}", **MIXES[mix])
+        for _ in range(requests)
+    ]
+    queue: "asyncio.Queue[List[Dict[str, object]]]" = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+    latencies: List[float] = []
+    stage_timings: List[Dict[str, float]] = []
+    errors = 0
+    cache_hits = 0
+
+    async def worker() -> None:
+        nonlocal errors, cache_hits
+        while not queue.empty():
+            payload = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.post("/run-pipeline", json=payload)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latency = time.perf_counter() - started
+            if response.status_code != 200:
+                errors += 1
+                continue
+            latencies.append(latency)
+            stage_timings.append(parse_server_timing(response.headers.get("server-timing", "")))
+            cache_hits += response.headers.get("x-cache") == "HIT"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(concurrency, batch_size, latencies, stage_timings, errors, cache_hits, elapsed)
+
+
+async def run_load(args: argparse.Namespace, client: httpx.AsyncClient) -> Dict[str, Any]:
+    counter = itertools.count()
+    # Warm up imports, rule compilation and the thread pool before measuring.
+    await client.post("/run-pipeline", json=generate_events(10, id_prefix="warmup"))
+    series = []
+    for batch_size in args.batch_sizes:
+        steps: List[Dict[str, Any]] = []
+        for concurrency in args.concurrency:
+            step = await run_step(client, concurrency, batch_size, args.requests, args.mix, counter)
+            steps.append(step)
+            print(format_step(step), flush=True)
+            if not args.full and find_saturation(steps, args.min_gain, args.p99_target):
+                break
+        saturation = find_saturation(steps, args.min_gain, args.p99_target)
+        if saturation:
+            print(
+                f"  saturated at concurrency {saturation['first_saturated_concurrency']} "
+                f"({saturation['reason']}); best {saturation['events_per_s']:,.0f} events/s "
+                f"at concurrency {saturation['concurrency']}"
+            )
+        series.append({"batch_size": batch_size, "steps": steps, "saturation": saturation})
+    return {"series": series}
+
+
+def format_ms(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def format_step(step: Dict[str, Any]) -> str:
+    latency = step["latency_ms"]
+    stages = " ".join(f"{name}={values['mean']:.1f}" for name, values in step["server_timing_ms"].items())
+    quantiles = " ".join(f"{name}={format_ms(latency[name])}" for name in PERCENTILES)
+    return (
+        f"batch={step['batch_size']:>5} conc={step['concurrency']:>3} n={step['samples']:>5} "
+        f"{step['requests_per_s']:8.1f} req/s {step['events_per_s']:10,.0f} ev/s "
+        f"{quantiles} ms err={step['errors']} [{stages}]"
+    )
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and p99 changes against a saved run for matching steps."""
+
+    previous = {
+        (step["batch_size"], step["concurrency"]): step
+        for series in baseline["series"]
+        for step in series["steps"]
+    }
+    print(f"compared with {baseline['started_at']} ({baseline.get('git_revision') or 'unknown revision'}):")
+    for series in result["series"]:
+        for step in series["steps"]:
+            old = previous.get((step["batch_size"], step["concurrency"]))
+            if old is None:
+                continue
+            throughput = step["events_per_s"] / old["events_per_s"] - 1 if old["events_per_s"] else math.nan
+            new_p99, old_p99 = step["latency_ms"]["p99"], old["latency_ms"]["p99"]
+            p99 = new_p99 / old_p99 - 1 if new_p99 is not None and old_p99 else math.nan
+            print(
+                f"  batch={step['batch_size']:>5} conc={step['concurrency']:>3} "
+                f"throughput {throughput:+.1%} p99 {p99:+.1%}"
+            )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def start_uvicorn() -> "tuple[subprocess.Popen, str]":
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(ROOT / "src"), "--port", str(port),
+         "--log-level", "warning"],
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during start-up; is it installed?")
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("uvicorn did not become healthy within 30s")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    process = None
+    if args.serve:
+        process, args.url = start_uvicorn()
+    try:
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        else:
+            from main import app
+
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout
+            )
+        async with client:
+            return await run_load(args, client)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=parse_ints, default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--batch-sizes", type=parse_ints, default=[10, 100, 1000])
+    parser.add_argument(
+        "--requests", type=int, default=200, help=f"requests per step; p999 needs at least {MIN_SAMPLES['p999']}"
+    )
+    parser.add_argument("--mix", choices=sorted(MIXES), default="baseline")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="throughput gain needed per step")
+    parser.add_argument("--p99-target", type=float, default=None, help="p99 latency budget in ms")
+    parser.add_argument("--full", action="store_true", help="run every step even after saturation")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier result file to compare with")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--serve", action="store_true", help="start a local uvicorn")
+    target.add_argument("--url", default=None, help="base URL of a running server")
+    args = parser.parse_args(argv)
+
+    started_at = datetime.now(UTC)
+    result = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "target": "uvicorn" if args.serve else args.url or "in-process",
+        "parameters": {
+            "concurrency": args.concurrency,
+            "batch_sizes": args.batch_sizes,
+            "requests": args.requests,
+            "mix": args.mix,
+            "min_gain": args.min_gain,
+            "p99_target_ms": args.p99_target,
+        },
+        **asyncio.run(run(args)),
+    }
+    output = args.output or ROOT / "benchmarks" / "results" / f"loadtest-{started_at:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"saved {output}")
+    if args.baseline:
+        compare(result, json.loads(args.baseline.read_text()))
+    return result
+
+
+if __name__ == "__main__":
+    main()
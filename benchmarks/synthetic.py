@@ -0,0 +1,49 @@
+"""Synthetic event generator shared by the benchmarks."""
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+SEVERITY_WEIGHTS = [60, 25, 10, 5]
+CATEGORIES = ["network", "auth", "system"]
+SOURCES = ["ids", "auth", "edr", "firewall"]
+
+# Named event mixes: severity weights and category weights in the order above.
+MIXES: Dict[str, Dict[str, Optional[Sequence[int]]]] = {
+    "baseline": {"severity_weights": None, "category_weights": None},
+    "auth-heavy": {"severity_weights": None, "category_weights": [15, 75, 10]},
+    "critical-burst": {"severity_weights": [20, 20, 30, 30], "category_weights": None},
+}
+
+
+def generate_events(
+    count: int,
+    assets: int = 50,
+    seed: Optional[int] = 0,
+    start: Optional[datetime] = None,
+    id_prefix: str = "evt",
+    severity_weights: Optional[Sequence[int]] = None,
+    category_weights: Optional[Sequence[int]] = None,
+) -> List[Dict[str, object]]:
+    """Return ``count`` raw events in the shape accepted by ``EventNormalizer``."""
+
+    rng = random.Random(seed)
+    start = start or datetime.now(UTC) - timedelta(seconds=count)
+    events = []
+    for index in range(count):
+        event: Dict[str, object] = {
+            "id": f"{id_prefix}-{index}",
+            "source": rng.choice(SOURCES),
+            "asset_id": f"srv-{rng.randint(1, assets)}",
+            "severity": rng.choices(SEVERITIES, weights=severity_weights or SEVERITY_WEIGHTS)[0],
+            "category": rng.choices(CATEGORIES, weights=category_weights)[0]
+            if category_weights
+            else rng.choice(CATEGORIES),
+            "timestamp": (start + timedelta(seconds=index)).isoformat(),
+        }
+        if event["category"] == "auth" and rng.random() < 0.3:
+            event["failed_attempts"] = rng.randint(1, 10)
+        events.append(event)
+    return events
@@ -0,0 +1,37 @@
+"""Stream a synthetic event batch through the pipeline into the live dashboard."""
+import random
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import InMemoryEventSource, default_pipeline
+from security_dashboard.pretty import LiveDashboard
+
+
+def build_events(count: int = 20000):
+    now = datetime.now(UTC)
+    severities = ["low", "medium", "high", "critical"]
+    events = []
+    for index in range(count):
+        event = {
+            "id": f"evt-{index}",
+            "source": random.choice(["ids", "auth", "edr"]),
+            "asset_id": f"srv-{random.randint(1, 50)}",
+            "severity": random.choices(severities, weights=[60, 25, 10, 5])[0],
+            "category": random.choice(["network", "auth", "system"]),
+            "timestamp": (now - timedelta(seconds=count - index)).isoformat(),
+        }
+        if event["category"] == "auth" and random.random() < 0.3:
+            event["failed_attempts"] = random.randint(1, 10)
+        events.append(event)
+    return events
+
+
+def main() -> None:
+    pipeline = default_pipeline(InMemoryEventSource(build_events()))
+    live = LiveDashboard(refresh_per_second=4)
+    pipeline.observers.append(live)
+    with live:
+        pipeline.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,61 @@
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import time
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import AliasChoices, BaseModel, Field
 
-from security_dashboard import InMemoryEventSource, default_pipeline
+from security_dashboard import (
+    ApprovalQueue,
+    EventDeduplicator,
+    InMemoryEventSource,
+    LoggingActionExecutor,
+    default_pipeline,
+)
+from security_dashboard.cache import ResultCache, canonical_hash, pipeline_fingerprint
+from security_dashboard.codec import CONTENT_TYPE, CodecError, decode_events
+from security_dashboard.query import ResultStore, project
+from security_dashboard.serialization import to_jsonable
+from security_dashboard.streaming import AlertBroadcaster, format_sse
+from security_dashboard.timeline import TimelineEntryType
+
+STREAM_BUFFER_SIZE = 1000
+STREAM_KEEPALIVE_SECONDS = 15.0
+MAX_PAGE_SIZE = 500
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+RESULT_STORE_MAX_ITEMS = 100_000
 
 class EventIn(BaseModel):
     id: str
     asset_id: str
-    serverity: str
+    severity: str = Field(validation_alias=AliasChoices("severity", "serverity"))
     category: str
     timestamp : str
     source: Optional[str] = None
     failed_attempts: Optional[int] = Field(default = None)
 
-def to_jsonable(obj: Any) -> Any:
-
-    if is_dataclass(obj):
-        d = asdict(obj)
-        return {k: to_jsonable(v) for k, v in d.items()}
-    if isinstance(obj, Enum):
-        return obj.value
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    if isinstance(obj, dict):
-        return {k: to_jsonable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple, set)):
-        return [to_jsonable(v) for v in obj]
-    return obj
+broadcaster = AlertBroadcaster(serializer=to_jsonable)
+result_store = ResultStore(max_items=RESULT_STORE_MAX_ITEMS)
+incident_ids = itertools.count(1)
+result_cache = ResultCache(max_bytes=RESULT_CACHE_BYTES)
+approved_actions: List[str] = []
+approval_queue = ApprovalQueue(
+    executor_factory=lambda playbook: LoggingActionExecutor(approved_actions),
+    journal_path=os.environ.get("SECURITY_DASHBOARD_APPROVAL_JOURNAL"),
+)
+atexit.register(approval_queue.close)
+deduplicator = EventDeduplicator(exact_capacity=100_000, bloom_capacity=100_000)
+RULESET_VERSION = pipeline_fingerprint(default_pipeline(InMemoryEventSource([])))
 
 app = FastAPI(title="Security Dashboard API", version="0.1.0")
 app.add_middleware(
@@ -44,15 +66,227 @@ app.add_middleware(
     allow_headers={"*"},
 )
 
+def server_timing(timings: Dict[str, float]) -> str:
+    """Format stage durations in seconds as a ``Server-Timing`` header value."""
+
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items())
+
 @app.post("/run-pipeline")
-def run_pipeline(events: List[EventIn]) -> Dict[str, Any]:
+def run_pipeline(events: List[EventIn]) -> Response:
+
+    started = time.perf_counter()
+    raw_events: List[Dict[str, Any]] = [e.model_dump(exclude_none=True) for e in events]
+    cache_key = canonical_hash(raw_events, RULESET_VERSION)
+
+    return execute_batch(lambda: raw_events, cache_key, {"prepare": time.perf_counter() - started})
+
+@app.post("/run-pipeline/binary")
+async def run_pipeline_binary(request: Request) -> Response:
+    if request.headers.get("content-type", "").split(";")[0].strip() != CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Expected {CONTENT_TYPE}")
+    started = time.perf_counter()
+    body = await request.body()
+    try:
+        raw_events, cache_key = await run_in_threadpool(prepare_binary, body)
+    except CodecError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return await run_in_threadpool(
+        execute_batch, lambda: raw_events, cache_key, {"prepare": time.perf_counter() - started}
+    )
+
+def prepare_binary(body: bytes) -> Tuple[List[Dict[str, Any]], str]:
+    """Decode a binary batch and key it like the same events posted as JSON."""
+
+    raw_events = decode_events(body)
+    return raw_events, canonical_hash(raw_events, RULESET_VERSION)
+
+def execute_batch(
+    load_events: Callable[[], List[Dict[str, Any]]],
+    cache_key: str,
+    timings: Optional[Dict[str, float]] = None,
+) -> Response:
+    timings = dict(timings or {})
+    started = time.perf_counter()
+
+    def compute() -> bytes:
+        stage = time.perf_counter()
+        pipeline = default_pipeline(
+            InMemoryEventSource(load_events()), approval_queue=approval_queue, deduplicator=deduplicator
+        )
+        pipeline.incident_id = f"INC-{next(incident_ids)}"
+        pipeline.observers.append(result_store)
+        pipeline.observers.append(broadcaster.stream(pipeline.incident_id))
+        result = pipeline.run()
+        timings["pipeline"] = time.perf_counter() - stage
+        stage = time.perf_counter()
+        body = json.dumps(to_jsonable(result), separators=(",", ":")).encode()
+        timings["serialize"] = time.perf_counter() - stage
+        return body
+
+    body, cached = result_cache.get_or_compute(cache_key, compute)
+    timings["total"] = timings.get("prepare", 0.0) + time.perf_counter() - started
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "X-Cache": "HIT" if cached else "MISS",
+            "X-Ruleset-Version": RULESET_VERSION,
+            "Server-Timing": server_timing(timings),
+        },
+    )
+
+def wake_on(loop: asyncio.AbstractEventLoop, wake: asyncio.Event, on_closed: Callable[[], None]) -> Callable[[], None]:
+    """Build a notify callback that sets ``wake`` on ``loop`` from pipeline threads.
+
+    Once the loop has closed, ``on_closed`` runs instead of failing the
+    request whose pipeline is publishing.
+    """
+
+    def notify() -> None:
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            on_closed()
+
+    return notify
+
+@app.get("/stream")
+async def stream(request: Request) -> StreamingResponse:
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    client = broadcaster.subscribe(
+        max_items=STREAM_BUFFER_SIZE,
+        notify=wake_on(loop, wake, lambda: broadcaster.unsubscribe(client)),
+    )
+
+    async def messages():
+        try:
+            yield "retry: 1000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                wake.clear()
+                for kind, payload in client.drain():
+                    yield format_sse(kind, payload)
+        finally:
+            broadcaster.unsubscribe(client)
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def query_collection(
+    name: str,
+    filters: Dict[str, Optional[str]],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+) -> Dict[str, Any]:
+    try:
+        page = result_store.query(name, filters=filters, since=since, until=until, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    selected = [name.strip() for name in fields.split(",")] if fields else None
+    return {
+        "items": [project(to_jsonable(item), selected) for item in page.items],
+        "next_cursor": page.next_cursor,
+    }
+
+@app.get("/events")
+def list_events(
+    asset: Optional[str] = None,
+    severity: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    filters = {"asset": asset, "severity": severity, "category": category}
+    return query_collection("events", filters, since, until, cursor, limit, fields)
+
+@app.get("/alerts")
+def list_alerts(
+    asset: Optional[str] = None,
+    severity: Optional[str] = None,
+    rule: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    filters = {"asset": asset, "severity": severity, "rule": rule, "status": status}
+    return query_collection("alerts", filters, since, until, cursor, limit, fields)
+
+@app.get("/incidents")
+def list_incidents(
+    asset: Optional[str] = None,
+    severity: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    filters = {"asset": asset, "severity": severity, "status": status}
+    return query_collection("incidents", filters, since, until, cursor, limit, fields)
+
+@app.get("/incidents/{incident_id}/timeline")
+def incident_timeline(
+    incident_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    type: Optional[str] = None,
+) -> Dict[str, Any]:
+    incident = result_store.incidents.get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail=f"No incident {incident_id}")
+    try:
+        entry_type = TimelineEntryType[type.upper()] if type else None
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=f"Unknown timeline entry type {type!r}") from exc
+    records = incident.timeline.records(offset, limit, entry_type)
+    return {
+        "total": len(incident.timeline),
+        "offset": offset,
+        "items": [
+            {"at": record.at.isoformat(), "type": record.type.name.lower(), "refs": list(record.refs), "text": record.render()}
+            for record in records
+        ],
+    }
+
+class ApprovalDecision(BaseModel):
+    approver: str
+    reason: Optional[str] = None
 
-    raw_events: List[Dict[str, Any]] = [e.model_dump() for e in events]
+@app.get("/approvals")
+def list_approvals(status: Optional[str] = "pending", alert_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    return to_jsonable(approval_queue.query(status=status, alert_id=alert_id))
 
-    pipeline = default_pipeline(InMemoryEventSource(raw_events))
-    result = pipeline.run()
+@app.post("/approvals/{request_id}/approve")
+def approve(request_id: str, decision: ApprovalDecision) -> Dict[str, Any]:
+    request = approval_queue.approve(request_id, decision.approver)
+    if request is None:
+        raise HTTPException(status_code=404, detail=f"No pending approval {request_id}")
+    return to_jsonable(request)
 
-    return to_jsonable(result)
+@app.post("/approvals/{request_id}/reject")
+def reject(request_id: str, decision: ApprovalDecision) -> Dict[str, Any]:
+    request = approval_queue.reject(request_id, decision.approver, decision.reason)
+    if request is None:
+        raise HTTPException(status_code=404, detail=f"No pending approval {request_id}")
+    return to_jsonable(request)
 
 @app.get("/health")
 def health():
@@ -2,6 +2,7 @@ import { useEffect, useMemo, useState } from "react";
 import {BarChart, Bar, XAxis, YAxis, Tooltip, Legend, ResponsiveContainer} from "recharts";
 
 const API_BASE = import.meta.env.VITE_API_BASE || "http://localhost:8000"
+const LIVE_ALERT_ROWS = 50;
 
 
 const sampleEvents = () => {
@@ -20,6 +21,36 @@ export default function App(){
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState(null);
   const [error, setError] = useState(" ");
+  const [liveAlerts, setLiveAlerts] = useState([]);
+  const [liveIncidents, setLiveIncidents] = useState({});
+  const [liveReports, setLiveReports] = useState({});
+  const [streamStatus, setStreamStatus] = useState("connecting");
+
+  useEffect(() => {
+    const source = new EventSource(`${API_BASE}/stream`);
+    source.onopen = () => setStreamStatus("live");
+    source.onerror = () => setStreamStatus("reconnecting");
+    source.addEventListener("alert", (msg) => {
+      const alert = JSON.parse(msg.data);
+      setLiveAlerts((alerts) => [alert, ...alerts].slice(0, LIVE_ALERT_ROWS));
+    });
+    source.addEventListener("incident", (msg) => {
+      const incident = JSON.parse(msg.data);
+      setLiveIncidents((incidents) => ({...incidents, [incident.id]: incident}));
+    });
+    source.addEventListener("report", (msg) => {
+      const delta = JSON.parse(msg.data);
+      setLiveReports((reports) => ({
+        ...reports,
+        [delta.id]: {...reports[delta.id], type: delta.type, findings: {...reports[delta.id]?.findings, ...delta.findings}},
+      }));
+    });
+    source.addEventListener("dropped", (msg) => {
+      const {count} = JSON.parse(msg.data);
+      setError(`Live stream fell behind; ${count} updates were skipped`);
+    });
+    return () => source.close();
+  }, []);
 
   const runPipeline = async () => {
     setLoading(true); setError(" ");
@@ -124,6 +155,28 @@ export default function App(){
         </div>
       </section>
 
+      <section className="bg-white rounded-2xl shadow p-4">
+        <div className="flex items-center justify-between mb-3">
+          <h2 className="font-semibold">Live Stream</h2>
+          <span className="text-sm text-gray-500">{streamStatus}</span>
+        </div>
+        <div className="grid grid-cols-1 md:grid-cols-2 gap-6 text-sm">
+          <ul>
+            {liveAlerts.map((a) => (
+              <li key={a.id} className="border-b last:border-0 py-1">{a.id} · {a.rule_id} · {a.severity}</li>
+            ))}
+          </ul>
+          <ul>
+            {Object.values(liveIncidents).map((inc) => (
+              <li key={inc.id} className="border-b last:border-0 py-1">{inc.id} · {inc.priority} · {(inc.alert_ids || []).length} alerts</li>
+            ))}
+            {Object.entries(liveReports).map(([id, rep]) => (
+              <li key={id} className="border-b last:border-0 py-1">{id}: {rep.findings?.total_events ?? rep.findings?.total_incidents}</li>
+            ))}
+          </ul>
+        </div>
+      </section>
+
         {result && (
           <>
             <section className="grid grid-cols-1 md:grid-cols-2 gap-6">
@@ -1,43 +1,123 @@
-"""Security dashboard simulation package."""
-from .automation import LoggingActionExecutor, PlaybookEngine
-from .dashboard import DashboardPipeline, default_pipeline
-from .incidents import IncidentPolicy, IncidentService
-from .ingestion import EventNormalizer, InMemoryEventSource, stream_events
-from .models import (
-    Alert,
-    Event,
-    Incident,
-    Playbook,
-    PlaybookAction,
-    Report,
-    Severity,
-    group_events_by_asset,
-    pick_highest_severity,
-)
-from .reporting import ReportBuilder
-from .rules import CorrelationRule, DetectionRule, RuleEngine
-
-__all__ = [
-    "Alert",
-    "DashboardPipeline",
-    "DetectionRule",
-    "CorrelationRule",
-    "Event",
-    "Incident",
-    "IncidentPolicy",
-    "IncidentService",
-    "LoggingActionExecutor",
-    "Playbook",
-    "PlaybookAction",
-    "PlaybookEngine",
-    "Report",
-    "ReportBuilder",
-    "Severity",
-    "default_pipeline",
-    "EventNormalizer",
-    "InMemoryEventSource",
-    "stream_events",
-    "group_events_by_asset",
-    "pick_highest_severity",
-    "RuleEngine",
-]
\ No newline at end of file
+"""Security dashboard simulation package.
+
+Public names are imported from their submodules on first access, so
+``import security_dashboard`` stays cheap for short batch runs.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+_EXPORTS = {
+    "AdaptiveBatcher": "batching",
+    "AhoCorasickMatcher": "enrichment",
+    "Alert": "models",
+    "ApprovalQueue": "approvals",
+    "ApprovalRequest": "approvals",
+    "BloomFilter": "dedup",
+    "CorrelationRule": "rules",
+    "DashboardPipeline": "dashboard",
+    "DetectionRule": "rules",
+    "DomainSuffixTrie": "enrichment",
+    "Event": "models",
+    "EventDeduplicator": "dedup",
+    "EventNormalizer": "ingestion",
+    "EventSummaryAccumulator": "reporting",
+    "EventTimeClock": "replay",
+    "ExternalGrouper": "spill",
+    "ExternalSorter": "spill",
+    "EventFileError": "ingestion",
+    "FileEventSource": "ingestion",
+    "HashIndex": "enrichment",
+    "Incident": "models",
+    "IncidentPolicy": "incidents",
+    "IncidentService": "incidents",
+    "IncidentTimeline": "timeline",
+    "InMemoryEventSource": "ingestion",
+    "IpIntervalIndex": "enrichment",
+    "LoggingActionExecutor": "automation",
+    "PipelineObserver": "dashboard",
+    "Playbook": "models",
+    "PlaybookAction": "models",
+    "PlaybookEngine": "automation",
+    "Report": "models",
+    "ReportBuilder": "reporting",
+    "RuleEngine": "rules",
+    "RuleProfiler": "rules",
+    "RuleStats": "rules",
+    "SequenceMatcher": "rules",
+    "SequenceRule": "rules",
+    "SequenceStep": "rules",
+    "Severity": "models",
+    "SpillPolicy": "spill",
+    "ThreatIntelEnricher": "enrichment",
+    "ThreatIntelIndex": "enrichment",
+    "TimelineEntryType": "timeline",
+    "TimelineRecord": "timeline",
+    "TimelineSegment": "timeline",
+    "WatermarkBuffer": "replay",
+    "default_pipeline": "dashboard",
+    "group_events_by_asset": "models",
+    "iter_events_by_asset": "models",
+    "pick_highest_severity": "models",
+    "stream_events": "ingestion",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .approvals import ApprovalQueue, ApprovalRequest
+    from .automation import LoggingActionExecutor, PlaybookEngine
+    from .batching import AdaptiveBatcher
+    from .dashboard import DashboardPipeline, PipelineObserver, default_pipeline
+    from .dedup import BloomFilter, EventDeduplicator
+    from .enrichment import (
+        AhoCorasickMatcher,
+        DomainSuffixTrie,
+        HashIndex,
+        IpIntervalIndex,
+        ThreatIntelEnricher,
+        ThreatIntelIndex,
+    )
+    from .incidents import IncidentPolicy, IncidentService
+    from .ingestion import EventNormalizer, FileEventSource, InMemoryEventSource, stream_events
+    from .models import (
+        Alert,
+        Event,
+        Incident,
+        Playbook,
+        PlaybookAction,
+        Report,
+        Severity,
+        group_events_by_asset,
+        iter_events_by_asset,
+        pick_highest_severity,
+    )
+    from .replay import EventTimeClock, WatermarkBuffer
+    from .reporting import EventSummaryAccumulator, ReportBuilder
+    from .rules import (
+        CorrelationRule,
+        DetectionRule,
+        RuleEngine,
+        RuleProfiler,
+        RuleStats,
+        SequenceMatcher,
+        SequenceRule,
+        SequenceStep,
+    )
+    from .spill import ExternalGrouper, ExternalSorter, SpillPolicy
+    from .timeline import IncidentTimeline, TimelineEntryType, TimelineRecord, TimelineSegment
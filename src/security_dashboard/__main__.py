@@ -0,0 +1,6 @@
+"""Allow ``python -m security_dashboard``."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,264 @@
+"""Approval queue for playbooks that must not run without a human decision."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .models import Alert, Playbook, utcnow
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from .automation import ActionExecutor
+
+PENDING = "pending"
+APPROVED = "approved"
+REJECTED = "rejected"
+EXPIRED = "expired"
+
+DISPATCHED = "dispatched"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class ApprovalRequest:
+    """A parked playbook run waiting for approval.
+
+    Once approved, ``dispatch_status`` follows the background run of its
+    actions: ``dispatched``, then ``completed`` or ``failed`` with the error
+    in ``dispatch_error``.
+    """
+
+    id: str
+    playbook_id: str
+    alert_id: str
+    context: Dict[str, object]
+    created_at: datetime
+    expires_at: datetime
+    status: str = PENDING
+    decided_by: Optional[str] = None
+    decided_at: Optional[datetime] = None
+    reason: Optional[str] = None
+    dispatch_status: Optional[str] = None
+    dispatch_error: Optional[str] = None
+
+
+@dataclass
+class ApprovalQueue:
+    """Persistent, indexed queue of playbook runs awaiting approval.
+
+    Parking a request appends to in-memory indexes and, when
+    ``journal_path`` is set, to an append-only JSON-lines journal that is
+    replayed on start-up. Each record is written and flushed to the OS
+    through one long-lived handle before the call returns (and fsynced with
+    ``journal_fsync``), so an acknowledged request survives a crash of the
+    process. Approved requests run on a background thread pool, so deciding
+    never waits for the actions themselves.
+    Pending requests expire through a heap ordered by deadline that is swept
+    on every queue operation.
+    """
+
+    executor_factory: Callable[[Playbook], "ActionExecutor"]
+    ttl: timedelta = timedelta(hours=4)
+    journal_path: Optional[Union[str, Path]] = None
+    journal_fsync: bool = False
+    max_workers: int = 2
+    clock: Callable[[], datetime] = utcnow
+    _requests: Dict[str, ApprovalRequest] = field(default_factory=dict, repr=False)
+    _by_status: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    _by_alert: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    _playbooks: Dict[str, Playbook] = field(default_factory=dict, repr=False)
+    _deadlines: List[Tuple[datetime, str]] = field(default_factory=list, repr=False)
+    _futures: List[Future] = field(default_factory=list, repr=False)
+    _ids: "itertools.count[int]" = field(default_factory=lambda: itertools.count(1), repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _pool: Optional[ThreadPoolExecutor] = field(default=None, repr=False)
+    _journal_handle: Optional[IO[str]] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.journal_path is not None and Path(self.journal_path).exists():
+            self._replay()
+
+    def register_playbooks(self, playbooks: Iterable[Playbook]) -> None:
+        """Make playbooks available for dispatch, e.g. after replaying a journal."""
+
+        with self._lock:
+            for playbook in playbooks:
+                self._playbooks[playbook.id] = playbook
+
+    def park(self, playbook: Playbook, alert: Alert, context: Dict[str, object]) -> ApprovalRequest:
+        with self._lock:
+            self.expire()
+            self._playbooks[playbook.id] = playbook
+            now = self.clock()
+            request = ApprovalRequest(
+                id=f"APR-{next(self._ids)}",
+                playbook_id=playbook.id,
+                alert_id=alert.id,
+                context=dict(context),
+                created_at=now,
+                expires_at=now + self.ttl,
+            )
+            self._index(request)
+            self._journal("park", request)
+            return request
+
+    def get(self, request_id: str) -> Optional[ApprovalRequest]:
+        return self._requests.get(request_id)
+
+    def query(self, status: Optional[str] = PENDING, alert_id: Optional[str] = None) -> List[ApprovalRequest]:
+        with self._lock:
+            self.expire()
+            ids: Optional[Set[str]] = None
+            if status is not None:
+                ids = set(self._by_status.get(status, ()))
+            if alert_id is not None:
+                alert_ids = self._by_alert.get(alert_id, set())
+                ids = alert_ids & ids if ids is not None else set(alert_ids)
+            requests = self._requests.values() if ids is None else (self._requests[i] for i in ids)
+            return sorted(requests, key=lambda request: request.created_at)
+
+    def approve(self, request_id: str, approver: str) -> Optional[ApprovalRequest]:
+        """Approve a pending request and dispatch its actions in the background."""
+
+        with self._lock:
+            request = self._decide(request_id, APPROVED, approver)
+            if request is None:
+                return None
+            playbook = self._playbooks.get(request.playbook_id)
+            if playbook is None:
+                self._record_dispatch(request, FAILED, f"Playbook {request.playbook_id!r} is not registered")
+                return request
+            self._record_dispatch(request, DISPATCHED)
+            self._futures = [future for future in self._futures if not future.done()]
+            self._futures.append(self._executor().submit(self._dispatch, playbook, request))
+            return request
+
+    def reject(self, request_id: str, approver: str, reason: Optional[str] = None) -> Optional[ApprovalRequest]:
+        with self._lock:
+            return self._decide(request_id, REJECTED, approver, reason)
+
+    def expire(self, now: Optional[datetime] = None) -> List[ApprovalRequest]:
+        """Mark every pending request past its deadline as expired."""
+
+        now = now or self.clock()
+        expired: List[ApprovalRequest] = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, request_id = heapq.heappop(self._deadlines)
+                request = self._requests.get(request_id)
+                if request is not None and request.status == PENDING:
+                    self._set_status(request, EXPIRED)
+                    request.decided_at = now
+                    self._journal("decide", request)
+                    expired.append(request)
+        return expired
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until dispatched actions have finished (for tests and shutdown)."""
+
+        for future in list(self._futures):
+            future.result(timeout=timeout)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._lock:
+            if self._journal_handle is not None:
+                self._journal_handle.close()
+                self._journal_handle = None
+
+    def _decide(
+        self, request_id: str, status: str, approver: str, reason: Optional[str] = None
+    ) -> Optional[ApprovalRequest]:
+        self.expire()
+        request = self._requests.get(request_id)
+        if request is None or request.status != PENDING:
+            return None
+        self._set_status(request, status)
+        request.decided_by = approver
+        request.decided_at = self.clock()
+        request.reason = reason
+        self._journal("decide", request)
+        return request
+
+    def _dispatch(self, playbook: Playbook, request: ApprovalRequest) -> None:
+        try:
+            executor = self.executor_factory(playbook)
+            for action in playbook.actions:
+                executor.execute(action, request.context)
+        except Exception as exc:
+            with self._lock:
+                self._record_dispatch(request, FAILED, f"{type(exc).__name__}: {exc}")
+            raise
+        with self._lock:
+            self._record_dispatch(request, COMPLETED)
+
+    def _record_dispatch(self, request: ApprovalRequest, status: str, error: Optional[str] = None) -> None:
+        request.dispatch_status = status
+        request.dispatch_error = error
+        self._journal("dispatch", request)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="approvals")
+        return self._pool
+
+    def _index(self, request: ApprovalRequest) -> None:
+        self._requests[request.id] = request
+        self._by_status.setdefault(request.status, set()).add(request.id)
+        self._by_alert.setdefault(request.alert_id, set()).add(request.id)
+        if request.status == PENDING:
+            heapq.heappush(self._deadlines, (request.expires_at, request.id))
+
+    def _set_status(self, request: ApprovalRequest, status: str) -> None:
+        self._by_status[request.status].discard(request.id)
+        request.status = status
+        self._by_status.setdefault(status, set()).add(request.id)
+
+    def _journal(self, kind: str, request: ApprovalRequest) -> None:
+        if self.journal_path is None:
+            return
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_path, "a", encoding="utf-8")
+        record = {"kind": kind, "request": asdict(request)}
+        self._journal_handle.write(json.dumps(record, default=str) + "\n")
+        self._journal_handle.flush()
+        if self.journal_fsync:
+            os.fsync(self._journal_handle.fileno())
+
+    def _replay(self) -> None:
+        highest = 0
+        with open(self.journal_path, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                data = json.loads(line)["request"]
+                for name in ("created_at", "expires_at", "decided_at"):
+                    if data.get(name):
+                        data[name] = datetime.fromisoformat(data[name])
+                request = ApprovalRequest(**data)
+                existing = self._requests.get(request.id)
+                if existing is None:
+                    self._index(request)
+                else:
+                    self._set_status(existing, request.status)
+                    existing.decided_by = request.decided_by
+                    existing.decided_at = request.decided_at
+                    existing.reason = request.reason
+                    existing.dispatch_status = request.dispatch_status
+                    existing.dispatch_error = request.dispatch_error
+                highest = max(highest, int(request.id.rsplit("-", 1)[-1]))
+        self._ids = itertools.count(highest + 1)
+
@@ -1,9 +1,10 @@
 """SOAR automation helpers."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Protocol
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Protocol
 
+from .approvals import ApprovalQueue, ApprovalRequest
 from .models import Alert, Playbook, PlaybookAction
 
 
@@ -26,15 +27,24 @@ class LoggingActionExecutor:
 
 @dataclass
 class PlaybookEngine:
-    """Run playbooks that match an alert."""
+    """Run playbooks that match an alert.
+
+    Playbooks with ``approval_required`` are parked in ``approval_queue``
+    instead of running inline; without a queue they run immediately.
+    """
 
     playbooks: Iterable[Playbook]
     executor_factory: Callable[[Playbook], ActionExecutor]
+    approval_queue: Optional[ApprovalQueue] = None
+    parked: List[ApprovalRequest] = field(default_factory=list)
 
     def run(self, alert: Alert, context: Dict[str, object]) -> List[str]:
         executed: List[str] = []
         for playbook in self.playbooks:
             if playbook.trigger_condition in {alert.rule_id, alert.severity.value, "*"}:
+                if playbook.approval_required and self.approval_queue is not None:
+                    self.parked.append(self.approval_queue.park(playbook, alert, context))
+                    continue
                 executor = self.executor_factory(playbook)
                 for action in playbook.actions:
                     executor.execute(action, context)
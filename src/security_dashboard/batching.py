@@ -0,0 +1,183 @@
+"""Adaptive micro-batching between ingestion and detection."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .models import Event
+
+
+@dataclass
+class AdaptiveBatcher:
+    """Group events into batches sized to keep processing near ``target_latency``.
+
+    The batch size follows an exponentially weighted estimate of the per-event
+    processing cost: under load batches grow towards ``max_batch_size`` to
+    amortize per-batch overhead, and when processing is slow they shrink so a
+    single batch does not exceed the latency target. A partial batch is
+    flushed once its oldest event has waited ``flush_timeout`` seconds, which
+    keeps latency low when traffic is light.
+
+    Batching does not reorder events. Consumers that depend on event order
+    across batches, such as sequence rules, need time-ordered input or a
+    reorder stage in front of the batcher; otherwise they only see each
+    batch in order.
+    """
+
+    target_latency: float = 0.05
+    max_batch_size: int = 1000
+    min_batch_size: int = 1
+    flush_timeout: float = 0.1
+    smoothing: float = 0.3
+    clock: Callable[[], float] = time.monotonic
+    batch_size: int = field(init=False)
+    cost_per_event: Optional[float] = field(default=None, init=False)
+    _pending: List[Event] = field(default_factory=list, init=False, repr=False)
+    _oldest: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.batch_size = max(self.min_batch_size, min(self.max_batch_size, 64))
+
+    def add(self, event: Event) -> Optional[List[Event]]:
+        """Buffer ``event`` and return a batch if it is now due."""
+
+        if not self._pending:
+            self._oldest = self.clock()
+        self._pending.append(event)
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return self.poll()
+
+    def poll(self) -> Optional[List[Event]]:
+        """Return the pending batch if its oldest event has waited ``flush_timeout``."""
+
+        if self._pending and self.clock() - self._oldest >= self.flush_timeout:
+            return self.flush()
+        return None
+
+    def flush(self) -> List[Event]:
+        batch, self._pending, self._oldest = self._pending, [], None
+        return batch
+
+    def record(self, batch_size: int, seconds: float) -> None:
+        """Feed back how long a batch took to process and resize future batches."""
+
+        if batch_size <= 0:
+            return
+        cost = seconds / batch_size
+        if self.cost_per_event is None:
+            self.cost_per_event = cost
+        else:
+            self.cost_per_event += self.smoothing * (cost - self.cost_per_event)
+        if self.cost_per_event > 0:
+            wanted = int(self.target_latency / self.cost_per_event)
+        else:
+            wanted = self.max_batch_size
+        self.batch_size = max(self.min_batch_size, min(self.max_batch_size, wanted))
+
+    def run(self, events: Iterable[Event], handler: Callable[[List[Event]], None]) -> int:
+        """Drive ``handler`` with adaptive batches from ``events`` and return the batch count.
+
+        ``events`` is consumed on a background reader thread and handed over
+        with timed reads, so a partial batch is still flushed after
+        ``flush_timeout`` while a slow source is blocked on its next event.
+        ``handler`` always runs on the calling thread. When ``run`` returns or
+        raises, the reader stops before requesting another event and closes
+        ``events`` if it is a generator; a read already in progress finishes
+        first, so sources should bound their own blocking reads.
+        """
+
+        batches = 0
+        reader = _SourceReader(events, maxsize=self.max_batch_size)
+        try:
+            for event in reader.events(self._wait):
+                batch = self.add(event) if event is not _IDLE else self.poll()
+                if batch:
+                    self._handle(batch, handler)
+                    batches += 1
+        finally:
+            reader.close()
+        batch = self.flush()
+        if batch:
+            self._handle(batch, handler)
+            batches += 1
+        return batches
+
+    def _wait(self) -> Optional[float]:
+        if self._oldest is None:
+            return None
+        return max(0.0, self._oldest + self.flush_timeout - self.clock())
+
+    def _handle(self, batch: List[Event], handler: Callable[[List[Event]], None]) -> None:
+        started = time.perf_counter()
+        handler(batch)
+        self.record(len(batch), time.perf_counter() - started)
+
+
+_IDLE: Any = object()
+
+
+class _SourceReader:
+    """Iterate a source on a daemon thread and hand items over through a bounded queue."""
+
+    def __init__(self, items: Iterable[Any], maxsize: int) -> None:
+        self._queue: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._read, args=(items,), name="batcher-reader", daemon=True)
+        self._thread.start()
+
+    def events(self, timeout: Callable[[], Optional[float]]) -> Iterator[Any]:
+        """Yield source items, or ``_IDLE`` whenever ``timeout()`` seconds pass without one."""
+
+        while True:
+            try:
+                more, item = self._queue.get(timeout=timeout())
+            except queue.Empty:
+                yield _IDLE
+                continue
+            if not more:
+                if item is not None:
+                    raise item
+                return
+            yield item
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop reading, unblock a pending hand-over and wait briefly for the thread."""
+
+        self._stopped.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join(timeout)
+
+    def _read(self, items: Iterable[Any]) -> None:
+        iterator = iter(items)
+        try:
+            while not self._stopped.is_set():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self._put((False, None))
+                    return
+                if not self._put((True, item)):
+                    return
+        except BaseException as exc:
+            self._put((False, exc))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, entry: Tuple[bool, Any]) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
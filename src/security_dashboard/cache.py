@@ -0,0 +1,203 @@
+"""Content-addressed caching of pipeline results."""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .dashboard import DashboardPipeline
+from .models import Severity
+
+_DEFAULT_FIELDS = {"source": "unknown", "asset_id": "unknown", "category": "unknown", "severity": Severity.LOW}
+
+
+def canonical_hash(raw_events: Iterable[Dict[str, Any]], version: str) -> str:
+    """Hash a submitted batch by what the pipeline will see, not by how it was encoded.
+
+    Key order, whitespace, timestamp spelling and offset, enum versus string
+    severities and omitted fields that default to the same value all hash
+    alike, so a batch posted as JSON and the same batch decoded from the
+    binary format share a cache entry.
+    """
+
+    digest = hashlib.sha256(version.encode())
+    for raw_event in raw_events:
+        canonical = _canonical_event(raw_event)
+        digest.update(json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _canonical_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
+    canonical = {name: _canonical_value(value) for name, value in raw_event.items()}
+    for name, default in _DEFAULT_FIELDS.items():
+        canonical.setdefault(name, _canonical_value(default))
+    timestamp = raw_event.get("timestamp")
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            pass
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        canonical["timestamp"] = timestamp.astimezone(timezone.utc).isoformat()
+    return canonical
+
+
+def _canonical_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _callable_fingerprint(function: Callable[..., Any], _active: Optional[set] = None) -> str:
+    """Fingerprint a function by its code, default arguments and captured closure values."""
+
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return repr(function)
+    active = set() if _active is None else _active
+    if id(function) in active:
+        return "<recursive>"
+    active.add(id(function))
+    parts = [_code_fingerprint(code)]
+    for default in getattr(function, "__defaults__", None) or ():
+        parts.append(_value_fingerprint(default, active))
+    for cell in getattr(function, "__closure__", None) or ():
+        try:
+            parts.append(_value_fingerprint(cell.cell_contents, active))
+        except ValueError:
+            parts.append("<empty cell>")
+    active.discard(id(function))
+    return "|".join(parts)
+
+
+def _code_fingerprint(code: types.CodeType) -> str:
+    consts = ",".join(
+        _code_fingerprint(const) if isinstance(const, types.CodeType) else repr(const) for const in code.co_consts
+    )
+    return f"{code.co_code.hex()}|{consts}|{code.co_names!r}"
+
+
+def _value_fingerprint(value: Any, active: set) -> str:
+    if hasattr(value, "__code__"):
+        return f"fn({_callable_fingerprint(value, active)})"
+    return repr(value)
+
+
+def pipeline_fingerprint(pipeline: DashboardPipeline) -> str:
+    """Version string for everything in a pipeline that can change its output.
+
+    Rule conditions are fingerprinted by their bytecode, default arguments
+    and closure values, so editing a lambda or a constant it captures
+    invalidates cached results just like renaming a rule does. Values read
+    from module globals at call time are not covered.
+    """
+
+    parts = [pipeline.normalizer.timestamp_field, _callable_fingerprint(pipeline.normalizer.id_factory)]
+    for rule in pipeline.detection_rules:
+        parts.append(f"D|{rule.id}|{rule.name}|{rule.severity.value}|{_callable_fingerprint(rule.condition)}")
+    for rule in pipeline.correlation_rules:
+        parts.append(
+            f"C|{rule.id}|{rule.name}|{rule.severity.value}|{rule.threshold}|{_callable_fingerprint(rule.group_key)}"
+        )
+    for rule in pipeline.sequence_rules:
+        steps = ",".join(f"{step.min_count}:{_callable_fingerprint(step.condition)}" for step in rule.steps)
+        parts.append(
+            f"S|{rule.id}|{rule.name}|{rule.severity.value}|{rule.window}|{_callable_fingerprint(rule.key)}|{steps}"
+        )
+    for severity, response_time in sorted(
+        pipeline.incident_policy.sla_per_severity.items(), key=lambda item: item[0].value
+    ):
+        parts.append(f"P|{severity.value}|{response_time}")
+    for playbook in pipeline.playbooks:
+        actions = ",".join(f"{action.type}:{sorted(action.parameters.items())}" for action in playbook.actions)
+        parts.append(f"B|{playbook.id}|{playbook.trigger_condition}|{playbook.approval_required}|{actions}")
+    parts.append(f"R|{pipeline.report_builder.generated_by}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Optional[bytes] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class ResultCache:
+    """LRU cache of encoded results bounded by total size in bytes.
+
+    Concurrent requests for a key that is still being computed wait for the
+    first computation instead of starting their own.
+    """
+
+    max_bytes: int = 64 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    _entries: "OrderedDict[str, bytes]" = field(default_factory=OrderedDict)
+    _size: int = 0
+    _in_flight: Dict[str, _Flight] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> Tuple[bytes, bool]:
+        """Return the cached value for ``key`` and whether it was served without computing."""
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, True
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if flight.error is None:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
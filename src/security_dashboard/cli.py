@@ -0,0 +1,136 @@
+"""Command-line entry point for batch runs of the default pipeline.
+
+Usage: security-dashboard PATH [PATH ...] [--output DIR] [--replay] [--memory-budget N] [--pretty]
+
+Reads events from the given files and directories (see
+:class:`~security_dashboard.ingestion.FileEventSource`), runs
+:func:`~security_dashboard.dashboard.default_pipeline` and writes one JSON
+file per report to ``--output``, or all reports to stdout. Playbook runs
+that wait for approval are written to ``pending-approvals.json`` in
+``--output`` or listed on stderr, and ``--approval-journal`` keeps them in an
+approval journal for later decisions. A malformed event file ends the run
+with exit status 2. Only the modules a run needs are imported, and ``rich``
+only with ``--pretty``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="security-dashboard", description="Run the security dashboard pipeline over event files."
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="event files or directories to scan")
+    parser.add_argument("-o", "--output", type=Path, help="directory for report files (default: stdout)")
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="process events in event-time order and time incidents by the events, not the wall clock",
+    )
+    parser.add_argument(
+        "--allowed-lateness", type=float, default=60.0, help="seconds an event may arrive late in --replay mode"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        help=(
+            "process in chunks of this many events without keeping them, spilling correlation groups to disk; "
+            "the alerts written out still list every matched event id, so their size is O(matched events)"
+        ),
+    )
+    parser.add_argument(
+        "--approval-journal", type=Path, help="append playbook runs awaiting approval to this approval journal"
+    )
+    parser.add_argument("--pretty", action="store_true", help="print the result with rich")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary line")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    missing = [str(path) for path in args.paths if not path.exists()]
+    if missing:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+
+    from .dashboard import default_pipeline
+    from .ingestion import EventFileError, FileEventSource
+    from .serialization import to_jsonable
+
+    approval_queue = None
+    if args.approval_journal is not None:
+        from .approvals import ApprovalQueue
+        from .automation import LoggingActionExecutor
+
+        approved_actions: List[str] = []
+        approval_queue = ApprovalQueue(
+            executor_factory=lambda playbook: LoggingActionExecutor(approved_actions),
+            journal_path=args.approval_journal,
+        )
+    pipeline = default_pipeline(FileEventSource(args.paths), approval_queue=approval_queue)
+    if args.replay:
+        from .replay import WatermarkBuffer
+
+        pipeline.reorder_buffer = WatermarkBuffer(allowed_lateness=timedelta(seconds=args.allowed_lateness))
+    if args.memory_budget is not None:
+        from .spill import SpillPolicy
+
+        pipeline.spill = SpillPolicy(memory_budget=args.memory_budget)
+        pipeline.retain_events = False
+    try:
+        result = pipeline.run()
+    except EventFileError as exc:
+        print(f"{parser.prog}: malformed event file {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if approval_queue is not None:
+            approval_queue.close()
+
+    reports = [to_jsonable(report) for report in result["reports"]]
+    approvals = to_jsonable(result["pending_approvals"])
+    if args.output is not None:
+        args.output.mkdir(parents=True, exist_ok=True)
+        for report in reports:
+            (args.output / f"{report['id']}.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        (args.output / "pending-approvals.json").write_text(json.dumps(approvals, indent=2), encoding="utf-8")
+    else:
+        if not args.pretty:
+            json.dump(reports, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        if not args.quiet:
+            for approval in approvals:
+                print(
+                    f"pending approval {approval['id']}: playbook {approval['playbook_id']} "
+                    f"for alert {approval['alert_id']}",
+                    file=sys.stderr,
+                )
+    if args.pretty:
+        from .pretty import render_rich_dashboard
+
+        render_rich_dashboard(result)
+    if not args.quiet:
+        print(_summary(result), file=sys.stderr)
+    return 0
+
+
+def _summary(result: dict) -> str:
+    parts: List[str] = [
+        f"{result['event_count']} events",
+        f"{len(result['alerts'])} alerts",
+        f"{len(result['incidents'])} incidents",
+        f"{result['duplicates_dropped']} duplicates dropped",
+        f"{len(result['pending_approvals'])} playbook runs awaiting approval",
+    ]
+    if "late_events" in result:
+        parts.append(f"{result['late_events']} late events dropped")
+    return ", ".join(parts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
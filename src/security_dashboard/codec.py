@@ -0,0 +1,161 @@
+"""Compact binary batch format for event ingestion.
+
+A batch is a header, a string table and fixed-size records that refer to
+strings by index, so repeated values such as asset ids and categories are
+stored and decoded once per batch::
+
+    magic    4s   b"SDEB"
+    version  B    1
+    strings  I    count, then per string: H length + UTF-8 bytes (at most 65535)
+    records  I    count, then per record (little-endian, unpadded):
+             I id, I source, I asset_id, I category   (string indexes)
+             B severity code
+             q timestamp, microseconds since the Unix epoch (UTC; naive
+               timestamps are taken as UTC, as :class:`EventNormalizer` does)
+             i failed_attempts, -1 when absent
+             I extra fields as a JSON object string, 0xFFFFFFFF when absent
+"""
+from __future__ import annotations
+
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+
+from .models import Severity
+
+MAGIC = b"SDEB"
+VERSION = 1
+CONTENT_TYPE = "application/x-security-events"
+
+_HEADER = struct.Struct("<4sB")
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+_MAX_STRING_BYTES = 0xFFFF
+_RECORD = struct.Struct("<IIIIBqiI")
+_NO_STRING = 0xFFFFFFFF
+_NO_ATTEMPTS = -1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SEVERITIES = list(Severity)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_FIXED_FIELDS = {"id", "source", "asset_id", "category", "severity", "timestamp", "failed_attempts"}
+
+
+class CodecError(ValueError):
+    """Raised when a binary batch is malformed."""
+
+
+def encode_events(raw_events: Iterable[Dict[str, object]]) -> bytes:
+    """Encode raw event dictionaries into a binary batch."""
+
+    strings: Dict[str, int] = {}
+
+    def intern(value: object) -> int:
+        text = str(value)
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    records = []
+    for raw_event in raw_events:
+        timestamp = raw_event.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        if not isinstance(timestamp, datetime):
+            raise CodecError(f"Event {raw_event.get('id')!r} has no timestamp")
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        attempts = raw_event.get("failed_attempts")
+        extras = {key: value for key, value in raw_event.items() if key not in _FIXED_FIELDS}
+        records.append(
+            _RECORD.pack(
+                intern(raw_event.get("id")),
+                intern(raw_event.get("source", "unknown")),
+                intern(raw_event.get("asset_id", "unknown")),
+                intern(raw_event.get("category", "unknown")),
+                _SEVERITY_CODES[Severity(raw_event.get("severity", Severity.LOW))],
+                (timestamp - _EPOCH) // timedelta(microseconds=1),
+                _NO_ATTEMPTS if attempts is None else int(attempts),
+                intern(json.dumps(extras, separators=(",", ":"), default=str)) if extras else _NO_STRING,
+            )
+        )
+
+    parts = [_HEADER.pack(MAGIC, VERSION), _COUNT.pack(len(strings))]
+    for text in strings:
+        encoded = text.encode("utf-8")
+        if len(encoded) > _MAX_STRING_BYTES:
+            raise CodecError(f"String {text[:40]!r}... is {len(encoded)} bytes, over the {_MAX_STRING_BYTES}-byte limit")
+        parts.append(_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(_COUNT.pack(len(records)))
+    parts.extend(records)
+    return b"".join(parts)
+
+
+def decode_events(data: bytes) -> List[Dict[str, object]]:
+    """Decode a binary batch straight into :class:`EventNormalizer` input.
+
+    Timestamps and severities are decoded into ``datetime`` and
+    :class:`Severity` values, so normalization does not parse them again.
+    """
+
+    view = memoryview(data)
+    try:
+        magic, version = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CodecError(f"Unsupported batch header {magic!r} v{version}")
+        offset = _HEADER.size
+        (string_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        strings: List[str] = []
+        for _ in range(string_count):
+            (length,) = _LENGTH.unpack_from(view, offset)
+            offset += _LENGTH.size
+            strings.append(str(view[offset : offset + length], "utf-8"))
+            offset += length
+        (record_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        end = offset + record_count * _RECORD.size
+        if end != len(view):
+            raise CodecError(f"Expected {end} bytes for {record_count} records, got {len(view)}")
+        records = _RECORD.iter_unpack(view[offset:end])
+    except struct.error as exc:
+        raise CodecError(f"Truncated batch: {exc}") from exc
+    except UnicodeDecodeError as exc:
+        raise CodecError(f"String table is not valid UTF-8: {exc}") from exc
+
+    extras_cache: Dict[int, Dict[str, object]] = {}
+    timestamps: Dict[int, datetime] = {}
+    events: List[Dict[str, object]] = []
+    try:
+        for event_id, source, asset_id, category, severity, micros, attempts, extras in records:
+            timestamp = timestamps.get(micros)
+            if timestamp is None:
+                timestamp = timestamps[micros] = _EPOCH + timedelta(microseconds=micros)
+            raw_event: Dict[str, object] = {
+                "id": strings[event_id],
+                "source": strings[source],
+                "asset_id": strings[asset_id],
+                "category": strings[category],
+                "severity": _SEVERITIES[severity],
+                "timestamp": timestamp,
+            }
+            if attempts != _NO_ATTEMPTS:
+                raw_event["failed_attempts"] = attempts
+            if extras != _NO_STRING:
+                decoded = extras_cache.get(extras)
+                if decoded is None:
+                    decoded = json.loads(strings[extras])
+                    if not isinstance(decoded, dict):
+                        raise CodecError(f"Extra fields of event {raw_event['id']!r} are not a JSON object")
+                    extras_cache[extras] = decoded
+                raw_event.update(decoded)
+            events.append(raw_event)
+    except IndexError as exc:
+        raise CodecError("Record refers to a missing string or severity") from exc
+    except CodecError:
+        raise
+    except (ValueError, TypeError, OverflowError) as exc:
+        raise CodecError(f"Malformed record: {exc}") from exc
+    return events
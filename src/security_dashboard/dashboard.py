@@ -2,20 +2,66 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import timedelta
-from typing import Iterable, List
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Protocol
 
+from .approvals import ApprovalQueue
 from .automation import LoggingActionExecutor, PlaybookEngine
+from .dedup import EventDeduplicator
 from .incidents import IncidentPolicy, IncidentService
 from .ingestion import EventNormalizer, EventSource, stream_events
-from .models import Alert, Event, Playbook, PlaybookAction, Severity
+from .models import Alert, Event, Incident, Playbook, PlaybookAction, Report, Severity, utcnow
 from .reporting import ReportBuilder
-from .rules import CorrelationRule, DetectionRule, RuleEngine
+from .rules import CorrelationRule, DetectionRule, RuleEngine, SequenceRule, SequenceStep
+
+if TYPE_CHECKING:
+    from .batching import AdaptiveBatcher
+    from .enrichment import ThreatIntelEnricher
+    from .replay import WatermarkBuffer
+    from .rules import RuleProfiler
+    from .spill import SpillPolicy
+    from .timeline import TimelineSegment
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class PipelineObserver(Protocol):
+    """Receives pipeline output as soon as each item is produced."""
+
+    def on_event(self, event: Event) -> None:
+        """Called for every normalized (and enriched) event."""
+
+    def on_alert(self, alert: Alert) -> None:
+        """Called for every alert raised by the rule engine."""
+
+    def on_incident(self, incident: Incident) -> None:
+        """Called when an incident is created or changes."""
+
+    def on_report(self, report: Report) -> None:
+        """Called for every report produced at the end of a run."""
 
 
 @dataclass
 class DashboardPipeline:
-    """End-to-end pipeline that ingests events and produces alerts and incidents."""
+    """End-to-end pipeline that ingests events and produces alerts and incidents.
+
+    By default every event is kept and returned under ``"events"``. For runs
+    larger than memory set ``retain_events=False`` together with ``spill``:
+    events then only pass through detection, the event-summary accumulator
+    and the observers, are processed in chunks of ``spill.memory_budget``,
+    and correlation groups keep event ids on disk. ``spill`` on its own does
+    not bound memory, because the returned event list still holds every event.
+    The output alerts are still built in memory: each correlation alert lists
+    the ids of every event in its group (with the default ``CORR-1`` that is
+    every event of an asset with three or more), so memory for alerts grows
+    with the number of matched events, O(matched events), not with the budget.
+
+    Sequence rules see events in timestamp order within each batch handed to
+    detection. With a ``batcher`` or ``retain_events=False`` detection runs
+    per batch, so input that is not already in event-time order needs a
+    ``reorder_buffer`` to get the same sequence alerts as a single batch.
+    """
 
     event_source: EventSource
     normalizer: EventNormalizer
@@ -25,37 +71,169 @@ class DashboardPipeline:
     playbooks: Iterable[Playbook]
     report_builder: ReportBuilder
     executed_actions: List[str] = field(default_factory=list)
+    sequence_rules: Iterable[SequenceRule] = ()
+    enricher: Optional[ThreatIntelEnricher] = None
+    observers: List[PipelineObserver] = field(default_factory=list)
+    batcher: Optional[AdaptiveBatcher] = None
+    profiler: Optional[RuleProfiler] = None
+    approval_queue: Optional[ApprovalQueue] = None
+    deduplicator: Optional[EventDeduplicator] = None
+    clock: Optional[Callable[[], datetime]] = None
+    reorder_buffer: Optional[WatermarkBuffer] = None
+    spill: Optional[SpillPolicy] = None
+    timeline_segment: Optional[TimelineSegment] = None
+    retain_events: bool = True
+    incident_id: str = "INC-1"
+    _duplicates_dropped: int = field(default=0, init=False, repr=False)
 
     def run(self) -> dict:
-        events = list(stream_events(self.event_source, self.normalizer))
+        events: Optional[List[Event]] = [] if self.retain_events else None
+        alerts: List[Alert] = []
+        clock = self._clock()
         engine = RuleEngine(
             detection_rules=list(self.detection_rules),
             correlation_rules=list(self.correlation_rules),
+            sequence_rules=list(self.sequence_rules),
+            profiler=self.profiler,
+            clock=clock,
+            spill=self.spill,
+        )
+        event_summary = self.report_builder.event_summary_accumulator()
+        self._duplicates_dropped = 0
+
+        def handle(batch: List[Event]) -> None:
+            event_summary.add(batch)
+            self._publish_alerts(engine.process(batch), alerts)
+
+        if self.batcher is not None and self.reorder_buffer is None:
+            # The batcher reads the source on its own thread; accept the
+            # events on this one so observers are only called from here.
+            self.batcher.run(self._read(), lambda batch: handle(self._accept(batch, events)))
+        elif self.batcher is not None:
+            # Only reading happens on the batcher's thread. Watermark release,
+            # and with it the event-time clock, advances here, one group at a
+            # time, exactly as in the replay branch below.
+            self.batcher.run(self._read(), lambda batch: self._release_each(batch, events, handle))
+            self._release_each((), events, handle, flush=True)
+        elif self.reorder_buffer is not None:
+            # Replay: detect on each group the watermark releases so the
+            # event-time clock is close to the events being evaluated.
+            self._release_each(self._read(), events, handle, flush=True)
+        elif self.retain_events:
+            handle(list(chain.from_iterable(self._ingest(events))))
+        else:
+            chunk_size = self.spill.memory_budget if self.spill is not None else DEFAULT_CHUNK_SIZE
+            stream = chain.from_iterable(self._ingest(events))
+            while True:
+                chunk = list(islice(stream, chunk_size))
+                if not chunk:
+                    break
+                handle(chunk)
+        self._publish_alerts(engine.finish(), alerts)
+        incident_service = IncidentService(
+            self.incident_policy, clock=clock, timeline_segment=self.timeline_segment
         )
-        alerts = engine.evaluate(events)
-        incident_service = IncidentService(self.incident_policy)
         incidents = []
         if alerts:
-            incident = incident_service.create_incident("INC-1", alerts)
+            incident = incident_service.create_incident(self.incident_id, alerts)
             incidents.append(incident)
+            for observer in self.observers:
+                observer.on_incident(incident)
         playbook_engine = PlaybookEngine(
             playbooks=list(self.playbooks),
             executor_factory=lambda playbook: LoggingActionExecutor(self.executed_actions),
+            approval_queue=self.approval_queue,
         )
         for alert in alerts:
-            playbook_engine.run(alert, {"incident_id": "INC-1", "alert_id": alert.id})
-        event_report = self.report_builder.build_event_summary(events)
+            playbook_engine.run(alert, {"incident_id": self.incident_id, "alert_id": alert.id})
+        event_report = event_summary.build()
         incident_report = self.report_builder.build_incident_summary(incidents, alerts)
-        return {
-            "events": events,
+        for report in (event_report, incident_report):
+            for observer in self.observers:
+                observer.on_report(report)
+        result = {
+            "events": events if events is not None else [],
+            "event_count": event_summary.total_events,
             "alerts": alerts,
             "incidents": incidents,
             "reports": [event_report, incident_report],
             "executed_actions": list(self.executed_actions),
+            "pending_approvals": list(playbook_engine.parked),
+            "duplicates_dropped": self._duplicates_dropped,
         }
+        if self.profiler is not None:
+            result["rule_profile"] = self.profiler.report()
+        if self.reorder_buffer is not None:
+            result["late_events"] = self.reorder_buffer.late_events
+        return result
+
+    def _clock(self) -> Callable[[], datetime]:
+        if self.clock is not None:
+            return self.clock
+        if self.reorder_buffer is not None:
+            return self.reorder_buffer.clock
+        return utcnow
+
+    def _read(self) -> Iterator[Event]:
+        """Yield normalized, deduplicated and enriched events in arrival order."""
+
+        for event in stream_events(self.event_source, self.normalizer, self.deduplicator, self._count_duplicate):
+            if self.enricher is not None:
+                event = self.enricher.enrich(event)
+            yield event
+
+    def _ingest(self, sink: Optional[List[Event]]) -> Iterator[List[Event]]:
+        """Yield accepted groups of events ready for detection (without a reorder buffer)."""
 
+        for event in self._read():
+            yield self._accept([event], sink)
 
-def default_pipeline(event_source: EventSource) -> DashboardPipeline:
+    def _release_each(
+        self,
+        arrived: Iterable[Event],
+        sink: Optional[List[Event]],
+        handle: Callable[[List[Event]], None],
+        flush: bool = False,
+    ) -> None:
+        """Push events through the reorder buffer and handle every group it releases.
+
+        With ``flush`` the buffer is drained afterwards, at the end of the input.
+        """
+
+        buffer = self.reorder_buffer
+        for event in arrived:
+            released = buffer.push(event)
+            if released:
+                handle(self._accept(released, sink))
+        if flush:
+            released = buffer.flush()
+            if released:
+                handle(self._accept(released, sink))
+
+    def _count_duplicate(self, raw_event: Dict[str, object]) -> None:
+        self._duplicates_dropped += 1
+
+    def _accept(self, released: List[Event], sink: Optional[List[Event]]) -> List[Event]:
+        if sink is not None:
+            sink.extend(released)
+        for event in released:
+            for observer in self.observers:
+                observer.on_event(event)
+        return released
+
+    def _publish_alerts(self, new_alerts: List[Alert], sink: List[Alert]) -> None:
+        sink.extend(new_alerts)
+        for alert in new_alerts:
+            for observer in self.observers:
+                observer.on_alert(alert)
+
+
+def default_pipeline(
+    event_source: EventSource,
+    enricher: Optional[ThreatIntelEnricher] = None,
+    approval_queue: Optional[ApprovalQueue] = None,
+    deduplicator: Optional[EventDeduplicator] = None,
+) -> DashboardPipeline:
     normalizer = EventNormalizer(id_factory=lambda event: str(event.get("id")))
     detection_rules = [
         DetectionRule(
@@ -70,6 +248,12 @@ def default_pipeline(event_source: EventSource) -> DashboardPipeline:
             severity=Severity.HIGH,
             condition=lambda event: event.category == "auth" and event.raw_payload.get("failed_attempts", 0) > 5,
         ),
+        DetectionRule(
+            id="RULE-3",
+            name="Threat intelligence match",
+            severity=Severity.HIGH,
+            condition=lambda event: bool(event.tags),
+        ),
     ]
     correlation_rules = [
         CorrelationRule(
@@ -80,6 +264,25 @@ def default_pipeline(event_source: EventSource) -> DashboardPipeline:
             threshold=3,
         )
     ]
+    sequence_rules = [
+        SequenceRule(
+            id="SEQ-1",
+            name="Brute force followed by login and network activity",
+            severity=Severity.CRITICAL,
+            steps=[
+                SequenceStep(
+                    condition=lambda event: event.category == "auth" and bool(event.raw_payload.get("failed_attempts")),
+                    min_count=3,
+                ),
+                SequenceStep(
+                    condition=lambda event: event.category == "auth" and not event.raw_payload.get("failed_attempts"),
+                ),
+                SequenceStep(condition=lambda event: event.category == "network"),
+            ],
+            key=lambda event: event.asset_id,
+            window=timedelta(minutes=10),
+        )
+    ]
     incident_policy = IncidentPolicy(
         sla_per_severity={
             Severity.CRITICAL: timedelta(minutes=15),
@@ -110,7 +313,7 @@ def default_pipeline(event_source: EventSource) -> DashboardPipeline:
         ),
     ]
     report_builder = ReportBuilder(generated_by="dashboard-system")
-    return DashboardPipeline(
+    pipeline = DashboardPipeline(
         event_source=event_source,
         normalizer=normalizer,
         detection_rules=detection_rules,
@@ -118,4 +321,14 @@ def default_pipeline(event_source: EventSource) -> DashboardPipeline:
         incident_policy=incident_policy,
         playbooks=playbooks,
         report_builder=report_builder,
-    )
\ No newline at end of file
+        sequence_rules=sequence_rules,
+        enricher=enricher,
+        deduplicator=deduplicator or EventDeduplicator(exact_capacity=100_000, bloom_capacity=100_000),
+    )
+    if approval_queue is None:
+        approval_queue = ApprovalQueue(
+            executor_factory=lambda playbook: LoggingActionExecutor(pipeline.executed_actions)
+        )
+    approval_queue.register_playbooks(playbooks)
+    pipeline.approval_queue = approval_queue
+    return pipeline
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""Idempotent ingestion: drop re-delivered events before normalization."""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+
+def event_id_fingerprint(raw_event: Dict[str, object]) -> str:
+    """Fingerprint by event id, or by the whole event content when it has no id."""
+
+    event_id = raw_event.get("id")
+    if event_id is None:
+        return content_fingerprint(raw_event)
+    return f"id:{event_id}"
+
+
+def content_fingerprint(raw_event: Dict[str, object]) -> str:
+    canonical = json.dumps(raw_event, sort_keys=True, separators=(",", ":"), default=str)
+    return "content:" + hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def field_fingerprint(*names: str) -> Callable[[Dict[str, object]], str]:
+    """Build a fingerprint from selected fields, for collectors that re-send with new ids."""
+
+    def fingerprint(raw_event: Dict[str, object]) -> str:
+        return "\x1f".join(str(raw_event.get(name)) for name in names)
+
+    return fingerprint
+
+
+@dataclass
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``false_positive_rate``."""
+
+    capacity: int
+    false_positive_rate: float
+    count: int = 0
+    num_bits: int = field(init=False)
+    num_hashes: int = field(init=False)
+    _bits: bytearray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < self.false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        capacity = max(1, self.capacity)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(self.false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.num_bits for index in range(self.num_hashes))
+
+
+@dataclass
+class EventDeduplicator:
+    """Time-bounded, memory-capped duplicate detector keyed on an event fingerprint.
+
+    Recent keys are held exactly in an insertion-ordered map capped at
+    ``exact_capacity`` entries and ``window`` age; a hit there is a confirmed
+    duplicate, counted in ``duplicates`` and dropped. Every key is also added
+    to the current generation of a two-generation Bloom filter that rotates
+    every ``window`` (or when a generation reaches ``bloom_capacity``). A key
+    found only in the Bloom filter may be an older re-delivery or a false
+    positive, so it is counted in ``unconfirmed_duplicates`` and only dropped
+    when ``drop_unconfirmed`` is set. One instance may be shared by
+    concurrent pipelines to drop re-deliveries across batches.
+    """
+
+    window: timedelta = timedelta(hours=1)
+    exact_capacity: int = 100_000
+    bloom_capacity: int = 1_000_000
+    false_positive_rate: float = 1e-4
+    fingerprint: Callable[[Dict[str, object]], str] = event_id_fingerprint
+    clock: Callable[[], float] = time.monotonic
+    drop_unconfirmed: bool = False
+    duplicates: int = 0
+    unconfirmed_duplicates: int = 0
+    _recent: "OrderedDict[str, float]" = field(default_factory=OrderedDict, repr=False)
+    _current: BloomFilter = field(init=False, repr=False)
+    _previous: Optional[BloomFilter] = field(default=None, init=False, repr=False)
+    _generation_started: float = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        self._current = self._new_generation()
+        self._generation_started = self.clock()
+
+    def is_duplicate(self, raw_event: Dict[str, object]) -> bool:
+        """Record ``raw_event`` and return whether it should be dropped as already seen."""
+
+        key = self.fingerprint(raw_event)
+        with self._lock:
+            now = self.clock()
+            self._rotate(now)
+            self._evict(now)
+            if key in self._recent:
+                self.duplicates += 1
+                return True
+            if key in self._current or (self._previous is not None and key in self._previous):
+                self.unconfirmed_duplicates += 1
+                if self.drop_unconfirmed:
+                    return True
+            self._recent[key] = now
+            if len(self._recent) > self.exact_capacity:
+                self._recent.popitem(last=False)
+            self._current.add(key)
+            return False
+
+    def _evict(self, now: float) -> None:
+        horizon = now - self.window.total_seconds()
+        while self._recent:
+            oldest_key, seen_at = next(iter(self._recent.items()))
+            if seen_at > horizon:
+                break
+            del self._recent[oldest_key]
+
+    def _rotate(self, now: float) -> None:
+        if (
+            now - self._generation_started >= self.window.total_seconds()
+            or self._current.count >= self.bloom_capacity
+        ):
+            self._previous = self._current
+            self._current = self._new_generation()
+            self._generation_started = now
+
+    def _new_generation(self) -> BloomFilter:
+        return BloomFilter(capacity=self.bloom_capacity, false_positive_rate=self.false_positive_rate)
@@ -0,0 +1,312 @@
+"""Threat-intelligence enrichment of normalized events.
+
+Indicators are loaded from local feed files into one index per indicator kind:
+
+* IPs and CIDRs are flattened into sorted, non-overlapping integer intervals
+  and looked up with a binary search.
+* Domains live in a label trie keyed from the TLD down, so ``a.evil.com``
+  matches an indicator for ``evil.com``.
+* File hashes are kept in a plain set.
+* Substring indicators are compiled into an Aho-Corasick automaton so a field
+  is scanned once regardless of the number of patterns.
+
+Lookups for repeated values are served from a bounded LRU cache.
+"""
+from __future__ import annotations
+
+import ipaddress
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .models import Event
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class IpIntervalIndex:
+    """Map IP addresses to tags using sorted, non-overlapping intervals."""
+
+    _ranges: List[Tuple[int, int, int, str]] = field(default_factory=list)
+    _starts: Dict[int, List[int]] = field(default_factory=dict)
+    _segments: Dict[int, List[Tuple[int, int, FrozenSet[str]]]] = field(default_factory=dict)
+    _dirty: bool = False
+
+    def add(self, indicator: str, tag: str) -> None:
+        network = ipaddress.ip_network(indicator.strip(), strict=False)
+        self._ranges.append(
+            (network.version, int(network.network_address), int(network.broadcast_address), tag)
+        )
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def lookup(self, value: str) -> FrozenSet[str]:
+        try:
+            address = ipaddress.ip_address(value.strip())
+        except ValueError:
+            return _EMPTY
+        if self._dirty:
+            self._build()
+        starts = self._starts.get(address.version)
+        if not starts:
+            return _EMPTY
+        number = int(address)
+        position = bisect_right(starts, number) - 1
+        if position < 0:
+            return _EMPTY
+        _, end, tags = self._segments[address.version][position]
+        return tags if number <= end else _EMPTY
+
+    def _build(self) -> None:
+        """Split overlapping ranges into disjoint segments carrying the union of their tags."""
+
+        self._starts = {}
+        self._segments = {}
+        for version in (4, 6):
+            boundaries: Dict[int, List[Tuple[int, str]]] = {}
+            for range_version, start, end, tag in self._ranges:
+                if range_version != version:
+                    continue
+                boundaries.setdefault(start, []).append((1, tag))
+                boundaries.setdefault(end + 1, []).append((-1, tag))
+            active: Dict[str, int] = {}
+            segments: List[Tuple[int, int, FrozenSet[str]]] = []
+            points = sorted(boundaries)
+            for index, point in enumerate(points):
+                for delta, tag in boundaries[point]:
+                    active[tag] = active.get(tag, 0) + delta
+                    if not active[tag]:
+                        del active[tag]
+                if active and index + 1 < len(points):
+                    tags = frozenset(active)
+                    end = points[index + 1] - 1
+                    if segments and segments[-1][1] == point - 1 and segments[-1][2] == tags:
+                        segments[-1] = (segments[-1][0], end, tags)
+                    else:
+                        segments.append((point, end, tags))
+            self._segments[version] = segments
+            self._starts[version] = [segment[0] for segment in segments]
+        self._dirty = False
+
+
+@dataclass
+class DomainSuffixTrie:
+    """Match domains and all of their subdomains against indicator domains."""
+
+    _root: Dict[str, dict] = field(default_factory=dict)
+    _size: int = 0
+
+    def add(self, indicator: str, tag: str) -> None:
+        node = self._root
+        for label in reversed(_domain_labels(indicator)):
+            node = node.setdefault(label, {})
+        node.setdefault("", set()).add(tag)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(self, value: str) -> FrozenSet[str]:
+        node = self._root
+        found: Set[str] = set()
+        for label in reversed(_domain_labels(value)):
+            node = node.get(label)
+            if node is None:
+                break
+            found.update(node.get("", ()))
+        return frozenset(found) if found else _EMPTY
+
+
+def _domain_labels(value: str) -> List[str]:
+    host = value.strip().lower()
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    return [label for label in host.split(".") if label]
+
+
+@dataclass
+class HashIndex:
+    """Exact-match index for file hashes."""
+
+    _tags: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def add(self, indicator: str, tag: str) -> None:
+        self._tags.setdefault(indicator.strip().lower(), set()).add(tag)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def lookup(self, value: str) -> FrozenSet[str]:
+        tags = self._tags.get(value.strip().lower())
+        return frozenset(tags) if tags else _EMPTY
+
+
+@dataclass
+class AhoCorasickMatcher:
+    """Case-insensitive multi-pattern substring matcher."""
+
+    _goto: List[Dict[str, int]] = field(default_factory=lambda: [{}])
+    _fail: List[int] = field(default_factory=lambda: [0])
+    _output: List[Set[str]] = field(default_factory=lambda: [set()])
+    _patterns: int = 0
+    _dirty: bool = False
+
+    def add(self, pattern: str, tag: str) -> None:
+        state = 0
+        for char in pattern.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(tag)
+        self._patterns += 1
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return self._patterns
+
+    def lookup(self, text: str) -> FrozenSet[str]:
+        if not self._patterns:
+            return _EMPTY
+        if self._dirty:
+            self._build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        found: Set[str] = set()
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return frozenset(found) if found else _EMPTY
+
+    def _build(self) -> None:
+        """Compute failure links breadth-first and fold outputs along them."""
+
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+        self._dirty = False
+
+
+@dataclass
+class ThreatIntelIndex:
+    """Collection of IOC indexes, one per indicator kind."""
+
+    ips: IpIntervalIndex = field(default_factory=IpIntervalIndex)
+    domains: DomainSuffixTrie = field(default_factory=DomainSuffixTrie)
+    hashes: HashIndex = field(default_factory=HashIndex)
+    substrings: AhoCorasickMatcher = field(default_factory=AhoCorasickMatcher)
+    invalid_indicators: int = 0
+
+    def add(self, kind: str, indicator: str, tag: str) -> None:
+        self._index(kind).add(indicator, tag)
+
+    def lookup(self, kind: str, value: str) -> FrozenSet[str]:
+        return self._index(kind).lookup(value)
+
+    def load_file(self, path: Union[str, Path], kind: str, tag: Optional[str] = None) -> int:
+        """Load a feed file with one ``indicator[,tag]`` per line and return the count.
+
+        Blank lines and lines starting with ``#`` are ignored. Indicators without
+        an explicit tag use ``tag`` or, failing that, the file stem. Indicators
+        the index rejects, such as malformed networks, are skipped and counted
+        in ``invalid_indicators`` instead of aborting the load.
+        """
+
+        index = self._index(kind)
+        default_tag = tag or Path(path).stem
+        loaded = 0
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                indicator, _, line_tag = line.partition(",")
+                try:
+                    index.add(indicator.strip(), line_tag.strip() or default_tag)
+                except ValueError:
+                    self.invalid_indicators += 1
+                    continue
+                loaded += 1
+        return loaded
+
+    def _index(self, kind: str):
+        if kind == "ip":
+            return self.ips
+        if kind == "domain":
+            return self.domains
+        if kind == "hash":
+            return self.hashes
+        if kind == "substring":
+            return self.substrings
+        raise ValueError(f"Unknown indicator kind: {kind!r}")
+
+
+@dataclass
+class ThreatIntelEnricher:
+    """Tag events whose payload fields match indicators in a :class:`ThreatIntelIndex`."""
+
+    index: ThreatIntelIndex
+    field_kinds: Dict[str, Sequence[str]] = field(
+        default_factory=lambda: {
+            "ip": ("src_ip", "dst_ip", "ip"),
+            "domain": ("domain", "hostname", "url"),
+            "hash": ("md5", "sha1", "sha256", "file_hash"),
+            "substring": ("command_line", "url", "details"),
+        }
+    )
+    cache_size: int = 65536
+    _cache: "OrderedDict[Tuple[str, str], FrozenSet[str]]" = field(default_factory=OrderedDict, repr=False)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def enrich(self, event: Event) -> Event:
+        payload = event.raw_payload
+        tags: Set[str] = set()
+        for kind, fields in self.field_kinds.items():
+            for name in fields:
+                value = payload.get(name)
+                if isinstance(value, str) and value:
+                    tags.update(self._lookup(kind, value))
+        if not tags:
+            return event
+        return replace(event, tags=event.tags | tags)
+
+    def enrich_all(self, events: Iterable[Event]) -> List[Event]:
+        return [self.enrich(event) for event in events]
+
+    def _lookup(self, kind: str, value: str) -> FrozenSet[str]:
+        key = (kind, value)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        tags = self.index.lookup(kind, value)
+        self._cache[key] = tags
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tags
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import timedelta
-from typing import Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
 
-from .models import Alert, Incident, Severity, pick_highest_severity
+from .models import Alert, Incident, Severity, pick_highest_severity, utcnow
+from .timeline import IncidentTimeline, TimelineSegment
 
 
 @dataclass
@@ -24,29 +25,33 @@ class IncidentService:
 
     policy: IncidentPolicy
     incidents: Dict[str, Incident] = field(default_factory=dict)
+    clock: Callable[[], datetime] = utcnow
+    timeline_segment: Optional[TimelineSegment] = None
 
     def create_incident(self, incident_id: str, alerts: Iterable[Alert]) -> Incident:
         alerts_list = list(alerts)
         severity = pick_highest_severity(alert.severity for alert in alerts_list)
+        now = self.clock()
         incident = Incident(
             id=incident_id,
             alert_ids={alert.id for alert in alerts_list},
             priority=severity,
+            created_at=now,
+            timeline=IncidentTimeline(self.timeline_segment),
         )
         self.incidents[incident_id] = incident
-        incident.add_timeline_entry(
-            f"Incident created with alerts: {', '.join(alert.id for alert in alerts_list)}"
-        )
+        incident.record_created([alert.id for alert in alerts_list], at=now)
         incident.assign(
             assignee="soc_on_call",
             response_time=self.policy.response_time(severity),
+            now=now,
         )
         return incident
 
     def resolve_incident(self, incident_id: str, resolution: str) -> Optional[Incident]:
         incident = self.incidents.get(incident_id)
         if incident:
-            incident.resolve(resolution)
+            incident.resolve(resolution, now=self.clock())
         return incident
 
     def open_incidents(self) -> List[Incident]:
@@ -1,10 +1,13 @@
 """Event ingestion utilities for the security dashboard."""
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Callable, Dict, Iterable, Iterator, List, Protocol
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Union
 
+from .dedup import EventDeduplicator
 from .models import Event, Severity
 
 
@@ -25,6 +28,69 @@ class InMemoryEventSource:
         return list(self.events)
 
 
+@dataclass
+class FileEventSource:
+    """Event source that streams raw events from files and directories.
+
+    ``.jsonl``/``.ndjson`` files hold one event per line, ``.sdeb`` files use
+    the binary batch codec, and other files hold a JSON list of events, a
+    single event or an object with an ``events`` list. Directories are
+    searched recursively for ``patterns``. Events are yielded as they are
+    read, so the first one is available before later files are opened.
+    """
+
+    paths: Sequence[Union[str, Path]]
+    patterns: Sequence[str] = ("*.json", "*.jsonl", "*.ndjson", "*.sdeb")
+
+    def files(self) -> Iterator[Path]:
+        for path in map(Path, self.paths):
+            if path.is_dir():
+                found = {match for pattern in self.patterns for match in path.rglob(pattern) if match.is_file()}
+                yield from sorted(found)
+            else:
+                yield path
+
+    def fetch(self) -> Iterator[Dict[str, object]]:
+        """Yield raw events file by file; malformed content raises :class:`EventFileError`."""
+
+        for path in self.files():
+            if path.suffix in (".jsonl", ".ndjson"):
+                with open(path, encoding="utf-8") as handle:
+                    for number, line in enumerate(handle, start=1):
+                        if line.strip():
+                            try:
+                                yield json.loads(line)
+                            except json.JSONDecodeError as exc:
+                                raise EventFileError(path, number, exc.msg) from exc
+            elif path.suffix == ".sdeb":
+                from .codec import CodecError, decode_events
+
+                try:
+                    events = decode_events(path.read_bytes())
+                except CodecError as exc:
+                    raise EventFileError(path, None, str(exc)) from exc
+                yield from events
+            else:
+                with open(path, encoding="utf-8") as handle:
+                    try:
+                        data = json.load(handle)
+                    except json.JSONDecodeError as exc:
+                        raise EventFileError(path, exc.lineno, exc.msg) from exc
+                if isinstance(data, dict):
+                    data = data.get("events", [data])
+                yield from data
+
+
+class EventFileError(ValueError):
+    """Raised when an event file cannot be parsed; carries the file and, if known, the line."""
+
+    def __init__(self, path: Path, line: Optional[int], message: str) -> None:
+        location = f"{path}:{line}" if line is not None else str(path)
+        super().__init__(f"{location}: {message}")
+        self.path = path
+        self.line = line
+
+
 @dataclass
 class EventNormalizer:
     """Convert raw event dictionaries into :class:`Event` instances."""
@@ -40,6 +106,12 @@ class EventNormalizer:
             timestamp = timestamp_value
         else:
             timestamp = datetime.now(timezone.utc)
+        # Naive timestamps are taken as UTC and every timestamp is kept in UTC,
+        # matching what the binary codec can represent.
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        else:
+            timestamp = timestamp.astimezone(timezone.utc)
         severity = Severity(raw_event.get("severity", Severity.LOW))
         return Event(
             id=self.id_factory(raw_event),
@@ -52,8 +124,17 @@ class EventNormalizer:
         )
 
 
-def stream_events(source: EventSource, normalizer: EventNormalizer) -> Iterator[Event]:
-    """Yield normalized events from the event source."""
+def stream_events(
+    source: EventSource,
+    normalizer: EventNormalizer,
+    deduplicator: Optional[EventDeduplicator] = None,
+    on_duplicate: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Iterator[Event]:
+    """Yield normalized events from the event source, skipping duplicates if a deduplicator is given."""
 
     for raw_event in source.fetch():
+        if deduplicator is not None and deduplicator.is_duplicate(raw_event):
+            if on_duplicate is not None:
+                on_duplicate(raw_event)
+            continue
         yield normalizer.normalize(raw_event)
\ No newline at end of file
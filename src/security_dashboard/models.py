@@ -4,7 +4,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, Iterable, List, Optional, Sequence, Set
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .timeline import IncidentTimeline, TimelineEntryType
+
+if TYPE_CHECKING:
+    from .spill import SpillPolicy
 
 
 class Severity(str, Enum):
@@ -27,6 +32,7 @@ class Event:
     category: str
     timestamp: datetime
     raw_payload: Dict[str, object]
+    tags: FrozenSet[str] = frozenset()
 
 
 def utcnow() -> datetime:
@@ -48,11 +54,11 @@ class Alert:
     created_at: datetime = field(default_factory=utcnow)
     acknowledged_at: Optional[datetime] = None
 
-    def acknowledge(self, owner: str) -> None:
+    def acknowledge(self, owner: str, at: Optional[datetime] = None) -> None:
         """Mark the alert as acknowledged by an owner."""
         self.status = "acknowledged"
         self.owner = owner
-        self.acknowledged_at = utcnow()
+        self.acknowledged_at = at or utcnow()
 
 
 @dataclass
@@ -65,20 +71,24 @@ class Incident:
     assignee: Optional[str] = None
     sla_due_at: Optional[datetime] = None
     resolution: Optional[str] = None
-    timeline: List[str] = field(default_factory=list)
+    timeline: IncidentTimeline = field(default_factory=IncidentTimeline)
     created_at: datetime = field(default_factory=utcnow)
 
-    def add_timeline_entry(self, entry: str) -> None:
-        self.timeline.append(f"{utcnow().isoformat()} {entry}")
+    def add_timeline_entry(self, entry: str, at: Optional[datetime] = None) -> None:
+        self.timeline.append(TimelineEntryType.NOTE, at or utcnow(), (entry,))
+
+    def record_created(self, alert_ids: Sequence[str], at: Optional[datetime] = None) -> None:
+        self.timeline.append(TimelineEntryType.CREATED, at or utcnow(), alert_ids)
 
-    def assign(self, assignee: str, response_time: timedelta) -> None:
+    def assign(self, assignee: str, response_time: timedelta, now: Optional[datetime] = None) -> None:
+        now = now or utcnow()
         self.assignee = assignee
-        self.sla_due_at = utcnow() + response_time
-        self.add_timeline_entry(f"Incident assigned to {assignee}")
+        self.sla_due_at = now + response_time
+        self.timeline.append(TimelineEntryType.ASSIGNED, now, (assignee,))
 
-    def resolve(self, resolution: str) -> None:
+    def resolve(self, resolution: str, now: Optional[datetime] = None) -> None:
         self.resolution = resolution
-        self.add_timeline_entry(f"Incident resolved: {resolution}")
+        self.timeline.append(TimelineEntryType.RESOLVED, now or utcnow(), (resolution,))
 
 
 @dataclass(frozen=True)
@@ -122,6 +132,18 @@ def group_events_by_asset(events: Iterable[Event]) -> Dict[str, List[Event]]:
     return groups
 
 
+def iter_events_by_asset(
+    events: Iterable[Event], spill: Optional[SpillPolicy] = None
+) -> Iterator[Tuple[str, List[Event]]]:
+    """Yield ``(asset_id, events)`` pairs like :func:`group_events_by_asset`, spilling to disk if given a policy."""
+
+    if spill is None:
+        yield from group_events_by_asset(events).items()
+        return
+    for group in spill.group_by(events, lambda event: event.asset_id):
+        yield group[0].asset_id, group
+
+
 def pick_highest_severity(severities: Iterable[Severity]) -> Severity:
     """Return the highest severity value in the iterable."""
 
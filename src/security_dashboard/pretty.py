@@ -1,6 +1,15 @@
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from __future__ import annotations
+
+import time
+from collections import Counter, OrderedDict, deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Optional
+
+from .models import Alert, Event, Incident, Report, Severity
+
+# rich 는 실제로 화면을 그릴 때만 import 한다 (배치 실행의 시작 시간 단축).
+if TYPE_CHECKING:
+    from rich.console import Console, Group
+    from rich.live import Live
 
 
 def render_rich_dashboard(result: dict) -> None:
@@ -8,6 +17,10 @@ def render_rich_dashboard(result: dict) -> None:
     security_dashboard.DashboardPipeline.run() 결과 dict를
     rich를 이용해서 예쁘게 출력해준다.
     """
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
     console = Console()
 
     alerts = result.get("alerts", [])
@@ -67,4 +80,153 @@ def render_rich_dashboard(result: dict) -> None:
     for p in report_panels:
         console.print(p)
     console.print(actions_panel)
-    console.rule()
\ No newline at end of file
+    console.rule()
+
+class LiveDashboard:
+    """
+    rich.live 기반의 실시간 대시보드.
+
+    DashboardPipeline.observers 에 등록하면 이벤트/알림/인시던트/리포트가
+    들어올 때마다 카운터와 top-N 집계만 갱신한다. 화면은 refresh_per_second
+    이하로만 다시 그리고, 표에는 최근 max_rows 개 행만 유지하기 때문에
+    렌더링 비용이 이벤트 수와 무관하다.
+    """
+
+    def __init__(
+        self,
+        refresh_per_second: float = 4.0,
+        max_rows: int = 10,
+        top_n: int = 5,
+        console: Optional[Console] = None,
+        clock: Callable[[], float] = time.monotonic,
+        seen_incidents: int = 10_000,
+    ) -> None:
+        self.refresh_interval = 1.0 / refresh_per_second
+        self.max_rows = max_rows
+        self.top_n = top_n
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
+        self.console = console
+        self.clock = clock
+        self.event_count = 0
+        self.events_by_severity: Counter = Counter()
+        self.events_by_asset: Counter = Counter()
+        self.alerts_by_rule: Counter = Counter()
+        self.recent_alerts: Deque[Alert] = deque(maxlen=max_rows)
+        self.incidents: "OrderedDict[str, Incident]" = OrderedDict()
+        self.incident_count = 0
+        self.seen_incidents = seen_incidents
+        self._seen_incident_ids: "OrderedDict[str, None]" = OrderedDict()
+        self.reports: Dict[str, Report] = {}
+        self.renders = 0
+        self._live: Optional[Live] = None
+        self._last_render = float("-inf")
+
+    # 🔌 PipelineObserver 구현
+    def on_event(self, event: Event) -> None:
+        self.event_count += 1
+        self.events_by_severity[event.severity.value] += 1
+        self.events_by_asset[event.asset_id] += 1
+        self._maybe_refresh()
+
+    def on_alert(self, alert: Alert) -> None:
+        self.alerts_by_rule[alert.rule_id] += 1
+        self.recent_alerts.append(alert)
+        self._maybe_refresh()
+
+    def on_incident(self, incident: Incident) -> None:
+        # 화면에는 최근 max_rows 건만 두고, 전체 건수는 최근 seen_incidents 개의 id 로 따로 센다
+        if incident.id in self._seen_incident_ids:
+            self._seen_incident_ids.move_to_end(incident.id)
+        else:
+            self.incident_count += 1
+            self._seen_incident_ids[incident.id] = None
+            if len(self._seen_incident_ids) > self.seen_incidents:
+                self._seen_incident_ids.popitem(last=False)
+        self.incidents[incident.id] = incident
+        self.incidents.move_to_end(incident.id)
+        while len(self.incidents) > self.max_rows:
+            self.incidents.popitem(last=False)
+        self._maybe_refresh()
+
+    def on_report(self, report: Report) -> None:
+        self.reports[report.id] = report
+        self._maybe_refresh()
+
+    # ▶️ 라이프사이클
+    def __enter__(self) -> "LiveDashboard":
+        from rich.live import Live
+
+        self._live = Live(self.render(), console=self.console, auto_refresh=False)
+        self._live.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._live is not None:
+            self._live.update(self.render(), refresh=True)
+            self._live.__exit__(*exc_info)
+            self._live = None
+
+    def _maybe_refresh(self) -> None:
+        if self._live is None:
+            return
+        now = self.clock()
+        if now - self._last_render < self.refresh_interval:
+            return
+        self._last_render = now
+        self._live.update(self.render(), refresh=True)
+
+    # 🖼️ 렌더링 (항상 고정 크기)
+    def render(self) -> Group:
+        from rich.columns import Columns
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.table import Table
+
+        self.renders += 1
+        counters = Table.grid(padding=(0, 2))
+        counters.add_row("events", str(self.event_count))
+        for severity in Severity:
+            counters.add_row(f"  {severity.value}", str(self.events_by_severity[severity.value]))
+        counters.add_row("alerts", str(sum(self.alerts_by_rule.values())))
+        counters.add_row("incidents", str(self.incident_count))
+
+        assets_table = Table(title=f" Top {self.top_n} Assets")
+        assets_table.add_column("Asset")
+        assets_table.add_column("Events", justify="right")
+        for asset, count in self.events_by_asset.most_common(self.top_n):
+            assets_table.add_row(asset, str(count))
+
+        rules_table = Table(title=f" Top {self.top_n} Rules")
+        rules_table.add_column("Rule")
+        rules_table.add_column("Alerts", justify="right")
+        for rule, count in self.alerts_by_rule.most_common(self.top_n):
+            rules_table.add_row(rule, str(count))
+
+        alerts_table = Table(title=" Recent Alerts")
+        alerts_table.add_column("ID")
+        alerts_table.add_column("Rule")
+        alerts_table.add_column("Severity")
+        for alert in reversed(self.recent_alerts):
+            alerts_table.add_row(alert.id, alert.rule_id, alert.severity.value)
+
+        inc_table = Table(title=" Incidents")
+        inc_table.add_column("ID")
+        inc_table.add_column("Priority")
+        inc_table.add_column("Alerts", justify="right")
+        for inc in reversed(self.incidents.values()):
+            inc_table.add_row(inc.id, inc.priority.value, str(len(inc.alert_ids)))
+
+        report_lines = [
+            f"{rep.id}: " + ", ".join(f"{k}={v}" for k, v in rep.findings.items() if not isinstance(v, dict))
+            for rep in self.reports.values()
+        ]
+        return Group(
+            Panel(counters, title=" Counters"),
+            Columns([assets_table, rules_table]),
+            alerts_table,
+            inc_table,
+            Panel("\n".join(report_lines) or "(pending)", title=" Reports"),
+        )
@@ -0,0 +1,342 @@
+"""Indexed, paginated queries over pipeline output."""
+from __future__ import annotations
+
+import base64
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Alert, Event, Incident, Report
+
+SortKey = Tuple[float, int]
+Extractor = Callable[[Any], Iterable[str]]
+
+
+@dataclass
+class Page:
+    """One page of query results and the cursor for the next one."""
+
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]!r}:{key[1]}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        timestamp, seq = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return float(timestamp), int(seq)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+class SortedKeys:
+    """Sorted ``(timestamp, seq)`` keys split into short chunks.
+
+    Out-of-order inserts and deletes only shift one chunk of at most
+    ``2 * load`` keys instead of the whole list, while appends of newer keys
+    stay O(1).
+    """
+
+    def __init__(self, load: int = 512) -> None:
+        self._load = load
+        self._chunks: List[List[SortKey]] = []
+        self._maxes: List[SortKey] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def first(self) -> Optional[SortKey]:
+        return self._chunks[0][0] if self._chunks else None
+
+    def add(self, key: SortKey) -> None:
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            return
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            index -= 1
+            self._chunks[index].append(key)
+            self._maxes[index] = key
+        else:
+            insort(self._chunks[index], key)
+        chunk = self._chunks[index]
+        if len(chunk) > 2 * self._load:
+            self._chunks[index : index + 1] = [chunk[: self._load], chunk[self._load :]]
+            self._maxes[index : index + 1] = [chunk[self._load - 1], chunk[-1]]
+
+    def remove(self, key: SortKey) -> None:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return
+        chunk = self._chunks[index]
+        position = bisect_left(chunk, key)
+        if position == len(chunk) or chunk[position] != key:
+            return
+        del chunk[position]
+        self._len -= 1
+        if chunk:
+            self._maxes[index] = chunk[-1]
+        else:
+            del self._chunks[index]
+            del self._maxes[index]
+
+    def descending(self, lower: Optional[SortKey] = None, upper: Optional[SortKey] = None) -> Iterator[SortKey]:
+        """Yield keys ``lower <= key < upper`` from newest to oldest."""
+
+        index = len(self._chunks) - 1 if upper is None else bisect_left(self._maxes, upper)
+        index = min(index, len(self._chunks) - 1)
+        while index >= 0:
+            chunk = self._chunks[index]
+            position = len(chunk) if upper is None else bisect_left(chunk, upper)
+            for key in reversed(chunk[:position]):
+                if lower is not None and key < lower:
+                    return
+                yield key
+            index -= 1
+
+
+@dataclass
+class IndexedCollection:
+    """Items kept in timestamp order with hashed secondary indexes.
+
+    Every secondary index bucket is itself a :class:`SortedKeys` of
+    ``(timestamp, seq)`` keys, so a query walks only the smallest matching
+    bucket from the cursor position and stops as soon as the page is full.
+    When ``max_items`` or ``max_age`` (relative to the newest item) is set,
+    the oldest items are evicted on insert.
+    """
+
+    id_of: Callable[[Any], str]
+    timestamp_of: Callable[[Any], datetime]
+    indexes: Dict[str, Extractor]
+    max_items: Optional[int] = None
+    max_age: Optional[timedelta] = None
+    evicted: int = 0
+    _items: Dict[SortKey, Any] = field(default_factory=dict)
+    _keys_by_id: Dict[str, SortKey] = field(default_factory=dict)
+    _values_by_id: Dict[str, Dict[str, Tuple[str, ...]]] = field(default_factory=dict)
+    _order: SortedKeys = field(default_factory=SortedKeys)
+    _buckets: Dict[str, Dict[str, SortedKeys]] = field(default_factory=dict)
+    _newest: float = float("-inf")
+    _seq: int = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, item_id: str) -> Optional[Any]:
+        key = self._keys_by_id.get(item_id)
+        return self._items.get(key) if key is not None else None
+
+    def upsert(self, item: Any) -> None:
+        """Insert ``item`` or re-index it if an item with the same id exists."""
+
+        item_id = self.id_of(item)
+        if item_id in self._keys_by_id:
+            self._remove(item_id)
+        self._seq += 1
+        key = (_epoch_seconds(self.timestamp_of(item)), self._seq)
+        values = {name: tuple(extract(item)) for name, extract in self.indexes.items()}
+        self._items[key] = item
+        self._keys_by_id[item_id] = key
+        self._values_by_id[item_id] = values
+        self._order.add(key)
+        for name, index_values in values.items():
+            buckets = self._buckets.setdefault(name, {})
+            for value in index_values:
+                bucket = buckets.get(value)
+                if bucket is None:
+                    bucket = buckets[value] = SortedKeys()
+                bucket.add(key)
+        self._newest = max(self._newest, key[0])
+        self._evict()
+
+    def query(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Page:
+        """Return up to ``limit`` items, newest first, matching every filter."""
+
+        filters = {name: value for name, value in (filters or {}).items() if value is not None}
+        for name in filters:
+            if name not in self.indexes:
+                raise ValueError(f"Unknown filter: {name!r}")
+        candidates = self._order
+        for name, value in filters.items():
+            bucket = self._buckets.get(name, {}).get(value, _EMPTY)
+            if len(bucket) < len(candidates):
+                candidates = bucket
+        lower = (_epoch_seconds(since), 0) if since else None
+        upper = (_epoch_seconds(until), float("inf")) if until else None
+        if cursor:
+            cursor_key = decode_cursor(cursor)
+            upper = cursor_key if upper is None else min(upper, cursor_key)
+
+        items: List[Any] = []
+        next_cursor = None
+        for key in candidates.descending(lower, upper):
+            if items and len(items) == limit:
+                next_cursor = encode_cursor(last_key)
+                break
+            last_key = key
+            item_id = self.id_of(self._items[key])
+            values = self._values_by_id[item_id]
+            if all(value in values[name] for name, value in filters.items()):
+                items.append(self._items[key])
+        return Page(items=items, next_cursor=next_cursor)
+
+    def _evict(self) -> None:
+        horizon = self._newest - self.max_age.total_seconds() if self.max_age is not None else None
+        while len(self._order):
+            oldest = self._order.first()
+            too_many = self.max_items is not None and len(self._order) > self.max_items
+            too_old = horizon is not None and oldest[0] < horizon
+            if not (too_many or too_old):
+                break
+            self._remove(self.id_of(self._items[oldest]))
+            self.evicted += 1
+
+    def _remove(self, item_id: str) -> None:
+        key = self._keys_by_id.pop(item_id)
+        del self._items[key]
+        self._order.remove(key)
+        for name, index_values in self._values_by_id.pop(item_id).items():
+            for value in index_values:
+                bucket = self._buckets[name][value]
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[name][value]
+
+
+_EMPTY = SortedKeys()
+
+
+def _epoch_seconds(at: datetime) -> float:
+    """Seconds since the epoch, taking naive datetimes as UTC rather than server local time."""
+
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.timestamp()
+
+
+def _incident_status(incident: Incident) -> str:
+    return "resolved" if incident.resolution else "open"
+
+
+@dataclass
+class ResultStore:
+    """Pipeline observer that keeps events, alerts and incidents queryable as they are written.
+
+    Each collection keeps at most ``max_items`` items and, with ``max_age``,
+    only items within that age of its newest item; older ones are evicted.
+    """
+
+    max_items: Optional[int] = None
+    max_age: Optional[timedelta] = None
+    events: IndexedCollection = field(init=False)
+    alerts: IndexedCollection = field(init=False)
+    incidents: IndexedCollection = field(init=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __post_init__(self) -> None:
+        self.events = IndexedCollection(
+            id_of=lambda event: event.id,
+            timestamp_of=lambda event: event.timestamp,
+            indexes={
+                "asset": lambda event: (event.asset_id,),
+                "severity": lambda event: (event.severity.value,),
+                "category": lambda event: (event.category,),
+                "source": lambda event: (event.source,),
+            },
+            max_items=self.max_items,
+            max_age=self.max_age,
+        )
+        self.alerts = IndexedCollection(
+            id_of=lambda alert: alert.id,
+            timestamp_of=lambda alert: alert.created_at,
+            indexes={
+                "asset": self._alert_assets,
+                "severity": lambda alert: (alert.severity.value,),
+                "rule": lambda alert: (alert.rule_id,),
+                "status": lambda alert: (alert.status,),
+            },
+            max_items=self.max_items,
+            max_age=self.max_age,
+        )
+        self.incidents = IndexedCollection(
+            id_of=lambda incident: incident.id,
+            timestamp_of=lambda incident: incident.created_at,
+            indexes={
+                "asset": self._incident_assets,
+                "severity": lambda incident: (incident.priority.value,),
+                "status": lambda incident: (_incident_status(incident),),
+                "assignee": lambda incident: (incident.assignee,) if incident.assignee else (),
+            },
+            max_items=self.max_items,
+            max_age=self.max_age,
+        )
+
+    def collection(self, name: str) -> IndexedCollection:
+        if name not in {"events", "alerts", "incidents"}:
+            raise ValueError(f"Unknown collection: {name!r}")
+        return getattr(self, name)
+
+    def query(self, name: str, **kwargs: Any) -> Page:
+        with self._lock:
+            return self.collection(name).query(**kwargs)
+
+    def update_alert(self, alert: Alert) -> None:
+        """Re-index an alert after a status change such as :meth:`Alert.acknowledge`."""
+
+        self.on_alert(alert)
+
+    def on_event(self, event: Event) -> None:
+        with self._lock:
+            self.events.upsert(event)
+
+    def on_alert(self, alert: Alert) -> None:
+        with self._lock:
+            self.alerts.upsert(alert)
+
+    def on_incident(self, incident: Incident) -> None:
+        with self._lock:
+            self.incidents.upsert(incident)
+
+    def on_report(self, report: Report) -> None:
+        return None
+
+    def _alert_assets(self, alert: Alert) -> Sequence[str]:
+        assets = []
+        for event_id in alert.event_ids:
+            event = self.events.get(event_id)
+            if event is not None and event.asset_id not in assets:
+                assets.append(event.asset_id)
+        return assets
+
+    def _incident_assets(self, incident: Incident) -> Sequence[str]:
+        assets: List[str] = []
+        for alert_id in incident.alert_ids:
+            alert = self.alerts.get(alert_id)
+            if alert is not None:
+                assets.extend(asset for asset in self._alert_assets(alert) if asset not in assets)
+        return assets
+
+
+def project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only ``fields`` of a serialized record; ``None`` keeps everything."""
+
+    if not fields:
+        return record
+    return {name: record[name] for name in fields if name in record}
@@ -1,48 +1,69 @@
 """Reporting utilities for the security dashboard."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Optional
 
-from .models import Alert, Event, Incident, Report, Severity, group_events_by_asset
+from .models import Alert, Event, Incident, Report, Severity
 
 
 @dataclass
-class ReportBuilder:
-    """Build reports from dashboard data."""
+class EventSummaryAccumulator:
+    """Incrementally collect the figures of an event summary report."""
 
     generated_by: str
+    total_events: int = 0
+    per_asset: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
 
-    def build_event_summary(self, events: Iterable[Event]) -> Report:
-        event_list = list(events)
-        grouped = group_events_by_asset(event_list)
-        per_asset = {
-            asset: {
-                "count": len(asset_events),
-                "severities": {severity.value: 0 for severity in Severity},
-            }
-            for asset, asset_events in grouped.items()
-        }
-        for asset, asset_events in grouped.items():
-            for event in asset_events:
-                per_asset[asset]["severities"][event.severity.value] += 1
-        findings = {
-            "total_events": len(event_list),
-            "assets": per_asset,
-        }
-        period_start = min((event.timestamp for event in event_list), default=datetime.now(timezone.utc))
-        period_end = max((event.timestamp for event in event_list), default=period_start)
+    def add(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.total_events += 1
+            asset = self.per_asset.get(event.asset_id)
+            if asset is None:
+                asset = self.per_asset[event.asset_id] = {
+                    "count": 0,
+                    "severities": {severity.value: 0 for severity in Severity},
+                }
+            asset["count"] += 1
+            asset["severities"][event.severity.value] += 1
+            if self.period_start is None or event.timestamp < self.period_start:
+                self.period_start = event.timestamp
+            if self.period_end is None or event.timestamp > self.period_end:
+                self.period_end = event.timestamp
+
+    def build(self) -> Report:
+        period_start = self.period_start or datetime.now(timezone.utc)
         return Report(
             id="event-summary",
             type="event-summary",
             period_start=period_start,
-            period_end=period_end,
+            period_end=self.period_end or period_start,
             filters={},
             generated_by=self.generated_by,
-            findings=findings,
+            findings={
+                "total_events": self.total_events,
+                "assets": self.per_asset,
+            },
         )
 
+
+@dataclass
+class ReportBuilder:
+    """Build reports from dashboard data."""
+
+    generated_by: str
+
+    def event_summary_accumulator(self) -> EventSummaryAccumulator:
+        return EventSummaryAccumulator(generated_by=self.generated_by)
+
+    def build_event_summary(self, events: Iterable[Event]) -> Report:
+        accumulator = self.event_summary_accumulator()
+        accumulator.add(events)
+        return accumulator.build()
+
     def build_incident_summary(self, incidents: Iterable[Incident], alerts: Iterable[Alert]) -> Report:
         incident_list = list(incidents)
         alert_lookup: Dict[str, Alert] = {alert.id: alert for alert in alerts}
@@ -1,20 +1,33 @@
 """Detection rule engine for the security dashboard."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Sequence
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
-from .models import Alert, Event, Severity
+from .models import Alert, Event, Severity, utcnow
+
+if TYPE_CHECKING:
+    from .spill import ExternalGrouper, SpillPolicy
 
 
 @dataclass
 class DetectionRule:
-    """A rule that produces alerts when the condition evaluates to true."""
+    """A rule that produces alerts when the condition evaluates to true.
+
+    Rules that share an ``exclusive_group`` never match the same event, so
+    once one of them matches the others are not evaluated for that event.
+    With a :class:`RuleProfiler` the engine samples events to verify this and
+    evaluates a group fully once two of its rules match the same event.
+    """
 
     id: str
     name: str
     severity: Severity
     condition: Callable[[Event], bool]
+    exclusive_group: Optional[str] = None
 
     def matches(self, event: Event) -> bool:
         return self.condition(event)
@@ -30,7 +43,9 @@ class CorrelationRule:
     group_key: Callable[[Event], str]
     threshold: int
 
-    def correlate(self, events: Iterable[Event]) -> List[List[Event]]:
+    def correlate(self, events: Iterable[Event], spill: Optional[SpillPolicy] = None) -> List[List[Event]]:
+        if spill is not None:
+            return list(spill.group_by(events, self.group_key, min_size=self.threshold))
         buckets: Dict[str, List[Event]] = {}
         for event in events:
             key = self.group_key(event)
@@ -38,35 +53,408 @@ class CorrelationRule:
         return [bucket for bucket in buckets.values() if len(bucket) >= self.threshold]
 
 
+@dataclass(frozen=True)
+class SequenceStep:
+    """One step of a :class:`SequenceRule` that must match ``min_count`` times."""
+
+    condition: Callable[[Event], bool]
+    min_count: int = 1
+
+
+@dataclass
+class SequenceRule:
+    """A rule that fires when events for one key match the steps in order within a window."""
+
+    id: str
+    name: str
+    severity: Severity
+    steps: Sequence[SequenceStep]
+    key: Callable[[Event], str]
+    window: timedelta
+    max_partials_per_key: int = 16
+
+    def compile(self) -> "SequenceMatcher":
+        return SequenceMatcher(self)
+
+
+@dataclass
+class _PartialMatch:
+    """A run of the sequence NFA: the current step, its hit count and the events so far.
+
+    ``events`` holds only the events that satisfied a step, at most
+    ``min_count`` per step; further hits on a satisfied step are not kept.
+    """
+
+    started_at: datetime
+    step: int
+    count: int
+    events: List[Event]
+
+
+@dataclass
+class SequenceMatcher:
+    """Streaming NFA for a :class:`SequenceRule` with per-key partial-match state.
+
+    Each event only touches the partial matches of its own key, so the cost per
+    event is proportional to the number of active partial matches for that key.
+    A partial match whose step is satisfied forks when an event matches the
+    next step, so one event never has to choose between two paths; runs that
+    reach the same state from the same first event are merged. Partial matches
+    older than the rule window are discarded as time advances, and keys
+    without activity inside the window are dropped entirely.
+    """
+
+    rule: SequenceRule
+    _partials: "OrderedDict[str, Deque[_PartialMatch]]" = field(default_factory=OrderedDict)
+    _last_seen: Dict[str, datetime] = field(default_factory=dict)
+
+    def active_partials(self) -> int:
+        return sum(len(partials) for partials in self._partials.values())
+
+    def observe(self, event: Event) -> Optional[List[Event]]:
+        """Advance the NFA with ``event`` and return the matched events when the sequence completes."""
+
+        self._expire_idle_keys(event.timestamp)
+        key = self.rule.key(event)
+        partials = self._partials.get(key)
+        if partials is None:
+            partials = deque()
+            self._partials[key] = partials
+        else:
+            self._partials.move_to_end(key)
+        self._last_seen[key] = event.timestamp
+        horizon = event.timestamp - self.rule.window
+        while partials and partials[0].started_at < horizon:
+            partials.popleft()
+
+        steps = self.rule.steps
+        # A fork that reaches the state of a run from the same first event is dropped, keeping the older evidence.
+        states: Dict[Tuple[str, int, int], Tuple[bool, _PartialMatch]] = {}
+        for partial in partials:
+            for run in self._advance(partial, event):
+                if run.step == len(steps) - 1 and run.count >= steps[-1].min_count:
+                    del self._partials[key]
+                    del self._last_seen[key]
+                    return run.events
+                state = (run.events[0].id, run.step, run.count)
+                forked = run is not partial
+                if state not in states or states[state][0] and not forked:
+                    states[state] = (forked, run)
+        partials = deque(sorted((run for _, run in states.values()), key=lambda run: run.started_at))
+        self._partials[key] = partials
+
+        if steps[0].condition(event):
+            partial = _PartialMatch(started_at=event.timestamp, step=0, count=1, events=[event])
+            if len(steps) == 1 and steps[0].min_count <= 1:
+                del self._partials[key]
+                del self._last_seen[key]
+                return partial.events
+            partials.append(partial)
+        while len(partials) > self.rule.max_partials_per_key:
+            partials.popleft()
+        if not partials:
+            del self._partials[key]
+            del self._last_seen[key]
+        return None
+
+    def _advance(self, partial: _PartialMatch, event: Event) -> List[_PartialMatch]:
+        """Return the runs ``partial`` becomes after ``event``, itself included."""
+
+        steps = self.rule.steps
+        current = steps[partial.step]
+        if partial.count < current.min_count:
+            if current.condition(event):
+                partial.count += 1
+                partial.events.append(event)
+            return [partial]
+        if partial.step + 1 < len(steps) and steps[partial.step + 1].condition(event):
+            forked = _PartialMatch(partial.started_at, partial.step + 1, 1, partial.events + [event])
+            return [partial, forked]
+        return [partial]
+
+    def _expire_idle_keys(self, now: datetime) -> None:
+        horizon = now - self.rule.window
+        while self._partials:
+            key = next(iter(self._partials))
+            if self._last_seen[key] >= horizon:
+                break
+            del self._partials[key]
+            del self._last_seen[key]
+
+
+@dataclass
+class RuleStats:
+    """Counters collected for one detection rule by :class:`RuleProfiler`."""
+
+    calls: int = 0
+    matches: int = 0
+    sampled_calls: int = 0
+    sampled_seconds: float = 0.0
+
+    @property
+    def match_rate(self) -> float:
+        return self.matches / self.calls if self.calls else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.sampled_seconds / self.sampled_calls if self.sampled_calls else 0.0
+
+
+@dataclass
+class RuleProfiler:
+    """Sampled per-rule cost and selectivity statistics for detection rules.
+
+    Every rule call is counted, but only one call in ``sample_every`` is timed
+    so that profiling adds little overhead to the evaluation loop. The
+    statistics drive the report; they only change the evaluation order of
+    rules that share an ``exclusive_group``.
+    """
+
+    sample_every: int = 16
+    stats: Dict[str, RuleStats] = field(default_factory=dict)
+    exclusivity_violations: Dict[str, int] = field(default_factory=dict)
+
+    def matches(self, rule: DetectionRule, event: Event) -> bool:
+        stats = self.stats.get(rule.id)
+        if stats is None:
+            stats = self.stats[rule.id] = RuleStats()
+        stats.calls += 1
+        if stats.calls % self.sample_every == 1 or self.sample_every == 1:
+            started = time.perf_counter()
+            matched = rule.matches(event)
+            stats.sampled_seconds += time.perf_counter() - started
+            stats.sampled_calls += 1
+        else:
+            matched = rule.matches(event)
+        if matched:
+            stats.matches += 1
+        return matched
+
+    def rank(self, rule: DetectionRule) -> float:
+        """Mean cost divided by the probability that the rule matches and so ends its exclusive group."""
+
+        stats = self.stats.get(rule.id)
+        if stats is None or not stats.sampled_calls:
+            return 0.0
+        return stats.mean_seconds / max(stats.match_rate, 1e-6)
+
+    def order(self, rules: Sequence[DetectionRule], broken: Iterable[str] = ()) -> List[Tuple[int, DetectionRule]]:
+        """Return ``(declaration index, rule)`` pairs with each exclusive group sorted by :meth:`rank`.
+
+        Evaluation stops within a group at its first match, so only the order
+        inside a group changes how many conditions run. Ungrouped rules and
+        groups listed in ``broken`` keep their declaration positions.
+        """
+
+        broken = set(broken)
+        ordered = list(enumerate(rules))
+        positions: Dict[str, List[int]] = {}
+        for position, rule in ordered:
+            if rule.exclusive_group is not None and rule.exclusive_group not in broken:
+                positions.setdefault(rule.exclusive_group, []).append(position)
+        for slots in positions.values():
+            members = sorted((ordered[slot] for slot in slots), key=lambda item: (self.rank(item[1]), item[0]))
+            for slot, member in zip(slots, members):
+                ordered[slot] = member
+        return ordered
+
+    def record_violation(self, group: str) -> None:
+        self.exclusivity_violations[group] = self.exclusivity_violations.get(group, 0) + 1
+
+    def report(self) -> List[Dict[str, object]]:
+        """Per-rule statistics, most expensive rule first by estimated total time."""
+
+        rows = [
+            {
+                "rule_id": rule_id,
+                "calls": stats.calls,
+                "matches": stats.matches,
+                "match_rate": round(stats.match_rate, 6),
+                "mean_us": round(stats.mean_seconds * 1e6, 3),
+                "estimated_total_ms": round(stats.mean_seconds * stats.calls * 1e3, 3),
+            }
+            for rule_id, stats in self.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row["estimated_total_ms"], reverse=True)
+
+
 @dataclass
 class RuleEngine:
-    """Applies detection and correlation rules to events."""
+    """Applies detection, correlation and sequence rules to events.
+
+    :meth:`evaluate` handles one complete batch. For a stream, call
+    :meth:`process` for each micro-batch and :meth:`finish` once at the end:
+    detection and sequence alerts are returned as soon as their events arrive,
+    while correlation groups accumulate until :meth:`finish`. Sequence rules
+    keep their partial-match state across calls. With a ``spill`` policy the
+    correlation groups are kept on disk once they outgrow its memory budget.
+    With a ``profiler`` the detection rules are re-ranked every
+    ``reorder_interval`` events; alerts are still emitted in declaration order.
+    """
 
     detection_rules: Sequence[DetectionRule]
     correlation_rules: Sequence[CorrelationRule]
+    sequence_rules: Sequence[SequenceRule] = ()
+    profiler: Optional[RuleProfiler] = None
+    reorder_interval: int = 10000
+    clock: Callable[[], datetime] = utcnow
+    spill: Optional[SpillPolicy] = None
+    _sequence_matchers: List[SequenceMatcher] = field(init=False, repr=False)
+    _correlation_buckets: List[Union[Dict[str, List[Event]], ExternalGrouper[Event]]] = field(init=False, repr=False)
+    _evaluation_order: List[Tuple[int, DetectionRule]] = field(init=False, repr=False)
+    _since_reorder: int = field(default=0, init=False, repr=False)
+    _broken_groups: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._sequence_matchers = [rule.compile() for rule in self.sequence_rules]
+        self._correlation_buckets = [self._new_buckets(rule) for rule in self.correlation_rules]
+        self._evaluation_order = list(enumerate(self.detection_rules))
 
     def evaluate(self, events: Iterable[Event]) -> List[Alert]:
+        alerts = self.process(events)
+        alerts.extend(self.finish())
+        return alerts
+
+    def process(self, events: Iterable[Event]) -> List[Alert]:
+        """Evaluate one micro-batch and return the alerts it completes."""
+
         event_list = list(events)
         alerts: List[Alert] = []
-        for event in event_list:
-            for rule in self.detection_rules:
-                if rule.matches(event):
-                    alerts.append(
-                        Alert(
-                            id=f"{rule.id}:{event.id}",
-                            rule_id=rule.id,
-                            event_ids=[event.id],
-                            severity=rule.severity,
+        if self.profiler is not None:
+            self._detect_profiled(event_list, alerts)
+        else:
+            for event in event_list:
+                matched_groups: Optional[Set[str]] = None
+                for rule in self.detection_rules:
+                    group = rule.exclusive_group
+                    if matched_groups is not None and group in matched_groups and group not in self._broken_groups:
+                        continue
+                    if rule.matches(event):
+                        alerts.append(
+                            Alert(
+                                id=f"{rule.id}:{event.id}",
+                                rule_id=rule.id,
+                                event_ids=[event.id],
+                                severity=rule.severity,
+                                created_at=self.clock(),
+                            )
                         )
+                        if group is not None:
+                            matched_groups = matched_groups or set()
+                            matched_groups.add(group)
+        for rule, buckets in zip(self.correlation_rules, self._correlation_buckets):
+            if not isinstance(buckets, dict):
+                buckets.extend(event_list)
+                continue
+            for event in event_list:
+                buckets.setdefault(rule.group_key(event), []).append(event)
+        if self._sequence_matchers:
+            for event in sorted(event_list, key=lambda event: event.timestamp):
+                for matcher in self._sequence_matchers:
+                    matched = matcher.observe(event)
+                    if matched:
+                        alerts.append(
+                            Alert(
+                                id=f"{matcher.rule.id}:{matched[0].id}",
+                                rule_id=matcher.rule.id,
+                                event_ids=[event.id for event in matched],
+                                severity=matcher.rule.severity,
+                                created_at=self.clock(),
+                            )
+                        )
+        return alerts
+
+    def evaluation_order(self) -> List[str]:
+        return [rule.id for _, rule in self._evaluation_order]
+
+    def reorder(self) -> None:
+        """Re-rank the rules of each exclusive group from the profile gathered so far."""
+
+        if self.profiler is not None:
+            self._evaluation_order = self.profiler.order(self.detection_rules, self._broken_groups)
+        self._since_reorder = 0
+
+    def _detect_profiled(self, events: List[Event], alerts: List[Alert]) -> None:
+        """Evaluate detection rules in profiled order while emitting alerts in declaration order.
+
+        On one event in ``sample_every`` every rule of every exclusive group
+        is evaluated to check that the group really is exclusive. A group
+        with two matching rules is recorded as a violation and from then on
+        evaluated fully, in declaration order.
+        """
+
+        profiler = self.profiler
+        for event in events:
+            matched: List[int] = []
+            matched_groups: Optional[Set[str]] = None
+            verify = self._since_reorder % profiler.sample_every == 0
+            for index, rule in self._evaluation_order:
+                group = rule.exclusive_group
+                if matched_groups is not None and group in matched_groups and group not in self._broken_groups:
+                    if verify and profiler.matches(rule, event):
+                        self._break_group(group)
+                        matched.append(index)
+                    continue
+                if profiler.matches(rule, event):
+                    matched.append(index)
+                    if group is not None:
+                        matched_groups = matched_groups or set()
+                        matched_groups.add(group)
+            if len(matched) > 1:
+                matched.sort()
+            for index in matched:
+                rule = self.detection_rules[index]
+                alerts.append(
+                    Alert(
+                        id=f"{rule.id}:{event.id}",
+                        rule_id=rule.id,
+                        event_ids=[event.id],
+                        severity=rule.severity,
+                        created_at=self.clock(),
                     )
-        for rule in self.correlation_rules:
-            for group in rule.correlate(event_list):
+                )
+            self._since_reorder += 1
+            if self.reorder_interval and self._since_reorder >= self.reorder_interval:
+                self.reorder()
+
+    def _break_group(self, group: str) -> None:
+        self.profiler.record_violation(group)
+        self._broken_groups.add(group)
+        self._evaluation_order = self.profiler.order(self.detection_rules, self._broken_groups)
+
+    def finish(self) -> List[Alert]:
+        """Emit correlation alerts for everything processed since the last call."""
+
+        alerts: List[Alert] = []
+        for index, rule in enumerate(self.correlation_rules):
+            buckets = self._correlation_buckets[index]
+            if isinstance(buckets, dict):
+                id_groups: Iterable[List[str]] = (
+                    [event.id for event in group] for group in buckets.values() if len(group) >= rule.threshold
+                )
+            else:
+                # Spilled groups store event ids only, see _new_buckets.
+                id_groups = buckets.groups(min_size=rule.threshold)
+            for event_ids in id_groups:
                 alerts.append(
                     Alert(
-                        id=f"{rule.id}:{group[0].id}",
+                        id=f"{rule.id}:{event_ids[0]}",
                         rule_id=rule.id,
-                        event_ids=[event.id for event in group],
+                        event_ids=event_ids,
                         severity=rule.severity,
+                        created_at=self.clock(),
                     )
                 )
-        return alerts
\ No newline at end of file
+            self._correlation_buckets[index] = self._new_buckets(rule)
+        return alerts
+
+    def _new_buckets(self, rule: CorrelationRule) -> Union[Dict[str, List[Event]], ExternalGrouper[Event]]:
+        # With a spill policy only event ids are grouped, so the engine never
+        # holds references to whole events between process() and finish().
+        if self.spill is not None:
+            return self.spill.grouper(rule.group_key, value=_event_id)
+        return {}
+
+
+def _event_id(event: Event) -> str:
+    return event.id
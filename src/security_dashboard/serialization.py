@@ -0,0 +1,27 @@
+"""Conversion of pipeline results into JSON-compatible values."""
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from .timeline import IncidentTimeline
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Recursively turn dataclasses, enums, datetimes, timelines and sets into JSON values."""
+
+    if is_dataclass(obj):
+        return {f.name: to_jsonable(getattr(obj, f.name)) for f in fields(obj)}
+    if isinstance(obj, IncidentTimeline):
+        return obj.render()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {k: to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [to_jsonable(v) for v in obj]
+    return obj
@@ -0,0 +1,172 @@
+"""Disk-backed sorting and grouping for batches that exceed a memory budget."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExternalSorter(Generic[T]):
+    """Stable sort of items that spills sorted runs to temporary files.
+
+    Items are buffered until their total ``weight`` reaches ``memory_budget``
+    (by default each item weighs one, so the budget is a record count). The
+    buffer is then sorted and written to a temporary file as one run, and
+    iteration merges all runs with a k-way heap merge. Ties keep insertion
+    order, so the output matches ``sorted(items, key=key)``. Keys must be
+    mutually comparable.
+    """
+
+    key: Callable[[T], Any]
+    memory_budget: int = 100_000
+    directory: Optional[str] = None
+    weight: Optional[Callable[[T], int]] = None
+    runs: int = 0
+    _buffer: List[Tuple[Any, int, T]] = field(default_factory=list, repr=False)
+    _buffered_weight: int = field(default=0, repr=False)
+    _files: List[IO[bytes]] = field(default_factory=list, repr=False)
+    _sequence: "itertools.count[int]" = field(default_factory=itertools.count, repr=False)
+
+    def add(self, item: T) -> None:
+        self._buffer.append((self.key(item), next(self._sequence), item))
+        self._buffered_weight += 1 if self.weight is None else self.weight(item)
+        if self._buffered_weight >= self.memory_budget:
+            self._spill()
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __iter__(self) -> Iterator[T]:
+        """Yield every item in key order, then release the spill files."""
+
+        self._buffer.sort(key=_record_order)
+        try:
+            if not self._files:
+                for _, _, item in self._buffer:
+                    yield item
+                return
+            streams = [_read_run(handle) for handle in self._files]
+            streams.append(iter(self._buffer))
+            for _, _, item in heapq.merge(*streams, key=_record_order):
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for handle in self._files:
+            handle.close()
+        self._files = []
+        self._buffer = []
+        self._buffered_weight = 0
+
+    def _spill(self) -> None:
+        self._buffer.sort(key=_record_order)
+        handle = tempfile.TemporaryFile(prefix="security-dashboard-run-", dir=self.directory)
+        for record in self._buffer:
+            pickle.dump(record, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        handle.flush()
+        self._files.append(handle)
+        self.runs += 1
+        self._buffer = []
+        self._buffered_weight = 0
+
+
+@dataclass
+class ExternalGrouper(Generic[T]):
+    """Group items by key within a memory budget, like ``dict.setdefault(key, []).append``.
+
+    Groups come back in the order their first item was added, each group in
+    insertion order, so the result matches the in-memory dict-of-lists path.
+    With ``value`` only a projection of each item (such as its id) is stored.
+    The grouped records are bounded by the budget, but each group that is
+    yielded is materialized as a list, so a single group must fit in memory.
+    """
+
+    key: Callable[[T], Any]
+    memory_budget: int = 100_000
+    directory: Optional[str] = None
+    value: Optional[Callable[[T], Any]] = None
+    _by_key: ExternalSorter = field(init=False, repr=False)
+    _sequence: "itertools.count[int]" = field(default_factory=itertools.count, repr=False)
+
+    def __post_init__(self) -> None:
+        self._by_key = ExternalSorter(key=_first, memory_budget=self.memory_budget, directory=self.directory)
+
+    @property
+    def runs(self) -> int:
+        return self._by_key.runs
+
+    def add(self, item: T) -> None:
+        stored = item if self.value is None else self.value(item)
+        self._by_key.add((self.key(item), next(self._sequence), stored))
+
+    def extend(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.add(item)
+
+    def groups(self, min_size: int = 1) -> Iterator[List[T]]:
+        """Yield groups with at least ``min_size`` items in first-seen order."""
+
+        by_first_seen: ExternalSorter = ExternalSorter(
+            key=_first,
+            memory_budget=self.memory_budget,
+            directory=self.directory,
+            weight=lambda record: len(record[1]),
+        )
+        for _, records in itertools.groupby(self._by_key, key=_first):
+            records = list(records)
+            if len(records) >= min_size:
+                by_first_seen.add((records[0][1], [item for _, _, item in records]))
+        for _, group in by_first_seen:
+            yield group
+
+    def close(self) -> None:
+        self._by_key.close()
+
+
+@dataclass(frozen=True)
+class SpillPolicy:
+    """Disk-backed execution mode: how much to hold in memory and where to spill the rest."""
+
+    memory_budget: int = 100_000
+    directory: Optional[str] = None
+
+    def sorter(self, key: Callable[[T], Any]) -> ExternalSorter[T]:
+        return ExternalSorter(key=key, memory_budget=self.memory_budget, directory=self.directory)
+
+    def grouper(self, key: Callable[[T], Any], value: Optional[Callable[[T], Any]] = None) -> ExternalGrouper[T]:
+        return ExternalGrouper(key=key, memory_budget=self.memory_budget, directory=self.directory, value=value)
+
+    def sort(self, items: Iterable[T], key: Callable[[T], Any]) -> Iterator[T]:
+        sorter = self.sorter(key)
+        sorter.extend(items)
+        return iter(sorter)
+
+    def group_by(self, items: Iterable[T], key: Callable[[T], Any], min_size: int = 1) -> Iterator[List[T]]:
+        grouper = self.grouper(key)
+        grouper.extend(items)
+        return grouper.groups(min_size)
+
+
+def _record_order(record: Tuple[Any, int, Any]) -> Tuple[Any, int]:
+    return record[0], record[1]
+
+
+def _first(record: Tuple[Any, ...]) -> Any:
+    return record[0]
+
+
+def _read_run(handle: IO[bytes]) -> Iterator[Tuple[Any, int, Any]]:
+    handle.seek(0)
+    while True:
+        try:
+            yield pickle.load(handle)
+        except EOFError:
+            return
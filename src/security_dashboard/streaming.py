@@ -0,0 +1,156 @@
+"""Push pipeline output to connected clients with bounded, coalescing buffers."""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import Alert, Event, Incident, Report
+
+Message = Tuple[str, Any]
+
+
+@dataclass
+class ClientBuffer:
+    """Per-client outbox that never grows beyond ``max_items``.
+
+    Alerts are queued in order; when the buffer is full the oldest alerts are
+    dropped and a ``dropped`` message tells the client how many it missed.
+    Incident and report updates are keyed by id so a slow client only ever
+    receives the latest state of each.
+    """
+
+    max_items: int = 1000
+    notify: Optional[Callable[[], None]] = None
+    dropped: int = 0
+    _alerts: Deque[Any] = field(default_factory=deque)
+    _latest: "OrderedDict[Tuple[str, str], Any]" = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def push(self, kind: str, payload: Any, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._alerts.append(payload)
+            else:
+                self._latest[(kind, key)] = payload
+                self._latest.move_to_end((kind, key))
+            while len(self._alerts) + len(self._latest) > self.max_items:
+                if self._alerts:
+                    self._alerts.popleft()
+                else:
+                    self._latest.popitem(last=False)
+                self.dropped += 1
+        if self.notify is not None:
+            self.notify()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._alerts) + len(self._latest)
+
+    def drain(self) -> List[Message]:
+        with self._lock:
+            messages: List[Message] = []
+            if self.dropped:
+                messages.append(("dropped", {"count": self.dropped}))
+                self.dropped = 0
+            messages.extend(("alert", payload) for payload in self._alerts)
+            messages.extend((kind, payload) for (kind, _), payload in self._latest.items())
+            self._alerts.clear()
+            self._latest.clear()
+        return messages
+
+
+@dataclass
+class AlertBroadcaster:
+    """Pipeline observer that fans alerts, incident changes and report deltas out to clients.
+
+    Report deltas are computed against the previous report with the same id
+    from the same stream. Used directly as an observer, all runs form one
+    stream; :meth:`stream` returns an observer for a named stream, such as
+    one run or one collector, so unrelated runs are never compared. Only the
+    ``max_reports`` most recently updated stream and report pairs are kept.
+    """
+
+    serializer: Callable[[Any], Any] = lambda obj: obj
+    max_reports: int = 512
+    _clients: List[ClientBuffer] = field(default_factory=list)
+    _report_state: "OrderedDict[Tuple[Optional[str], str], Dict[str, Any]]" = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def stream(self, stream_id: str) -> "StreamObserver":
+        """Return an observer that publishes through this broadcaster under ``stream_id``."""
+
+        return StreamObserver(self, stream_id)
+
+    def subscribe(self, max_items: int = 1000, notify: Optional[Callable[[], None]] = None) -> ClientBuffer:
+        client = ClientBuffer(max_items=max_items, notify=notify)
+        with self._lock:
+            self._clients = self._clients + [client]
+        return client
+
+    def unsubscribe(self, client: ClientBuffer) -> None:
+        with self._lock:
+            self._clients = [existing for existing in self._clients if existing is not client]
+
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def on_event(self, event: Event) -> None:
+        return None
+
+    def on_alert(self, alert: Alert) -> None:
+        if self._clients:
+            self._publish("alert", self.serializer(alert))
+
+    def on_incident(self, incident: Incident) -> None:
+        if self._clients:
+            self._publish("incident", self.serializer(incident), key=incident.id)
+
+    def on_report(self, report: Report, stream_id: Optional[str] = None) -> None:
+        findings = self.serializer(report.findings)
+        state_key = (stream_id, report.id)
+        with self._lock:
+            previous = self._report_state.pop(state_key, {})
+            self._report_state[state_key] = findings
+            while len(self._report_state) > self.max_reports:
+                self._report_state.popitem(last=False)
+        delta = {name: value for name, value in findings.items() if previous.get(name) != value}
+        if delta and self._clients:
+            payload = {"id": report.id, "type": report.type, "findings": delta}
+            key = report.id
+            if stream_id is not None:
+                payload["stream"] = stream_id
+                key = f"{stream_id}:{report.id}"
+            self._publish("report", payload, key=key)
+
+    def _publish(self, kind: str, payload: Any, key: Optional[str] = None) -> None:
+        for client in self._clients:
+            client.push(kind, payload, key=key)
+
+
+@dataclass
+class StreamObserver:
+    """Pipeline observer that forwards to an :class:`AlertBroadcaster` under one stream id."""
+
+    broadcaster: AlertBroadcaster
+    stream_id: str
+
+    def on_event(self, event: Event) -> None:
+        return None
+
+    def on_alert(self, alert: Alert) -> None:
+        self.broadcaster.on_alert(alert)
+
+    def on_incident(self, incident: Incident) -> None:
+        self.broadcaster.on_incident(incident)
+
+    def on_report(self, report: Report) -> None:
+        self.broadcaster.on_report(report, stream_id=self.stream_id)
+
+
+def format_sse(kind: str, payload: Any) -> str:
+    """Encode one message in the ``text/event-stream`` wire format."""
+
+    return f"event: {kind}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
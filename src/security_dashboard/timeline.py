@@ -0,0 +1,260 @@
+"""Append-only incident timelines stored as compact records and rendered on read."""
+from __future__ import annotations
+
+import struct
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union, overload
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_RECORD = struct.Struct("<qiBI")
+_LENGTH = struct.Struct("<I")
+# Stored in place of the UTC offset for entries appended with a naive datetime.
+_NAIVE = -(2**31)
+
+
+class TimelineEntryType(IntEnum):
+    """Entry-type codes stored in a timeline instead of formatted text."""
+
+    NOTE = 0
+    CREATED = 1
+    ASSIGNED = 2
+    RESOLVED = 3
+
+
+_TEMPLATES = {
+    TimelineEntryType.CREATED: "Incident created with alerts: {refs}",
+    TimelineEntryType.ASSIGNED: "Incident assigned to {ref}",
+    TimelineEntryType.RESOLVED: "Incident resolved: {ref}",
+    TimelineEntryType.NOTE: "{ref}",
+}
+
+
+def to_micros(at: datetime) -> int:
+    """Microseconds since the Unix epoch; naive datetimes are taken as UTC."""
+
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return (at - _EPOCH) // timedelta(microseconds=1)
+
+
+def utc_offset_seconds(at: datetime) -> Optional[int]:
+    """Whole-second UTC offset of ``at``, or ``None`` for a naive datetime."""
+
+    offset = at.utcoffset()
+    return None if offset is None else offset // timedelta(seconds=1)
+
+
+def _split_stamped(text: str) -> Tuple[Optional[datetime], str]:
+    """Split an ``"<isoformat> <entry>"`` string as the old list timeline stored it."""
+
+    head, _, rest = text.partition(" ")
+    if "T" in head and rest:
+        try:
+            return datetime.fromisoformat(head), rest
+        except ValueError:
+            pass
+    return None, text
+
+
+class TimelineRecord(NamedTuple):
+    """One structured timeline entry: when, what kind, and the ids or text it refers to.
+
+    ``utcoffset`` is the offset in seconds the entry was appended with, or
+    ``None`` if its datetime was naive, so :attr:`at` and :meth:`render`
+    give back the same wall time and offset that went in.
+    """
+
+    timestamp: int
+    type: TimelineEntryType
+    refs: Tuple[str, ...]
+    utcoffset: Optional[int] = 0
+
+    @property
+    def at(self) -> datetime:
+        at = _EPOCH + timedelta(microseconds=self.timestamp)
+        if self.utcoffset is None:
+            return at.replace(tzinfo=None)
+        if self.utcoffset:
+            return at.astimezone(timezone(timedelta(seconds=self.utcoffset)))
+        return at
+
+    def render(self) -> str:
+        text = _TEMPLATES[self.type].format(refs=", ".join(self.refs), ref=self.refs[0] if self.refs else "")
+        return f"{self.at.isoformat()} {text}"
+
+
+class TimelineSegment:
+    """Append-only file shared by many timelines to keep their references off the heap.
+
+    Each record is the timestamp, UTC offset, type code and reference count
+    followed by length-prefixed UTF-8 references. Timelines keep only the
+    offsets. Every append is flushed to the OS before it returns, so the
+    file is complete even if the owner never calls :meth:`close`.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._handle = open(self.path, "a+b")
+        self._lock = threading.Lock()
+
+    def append(self, record: TimelineRecord) -> int:
+        encoded = [ref.encode("utf-8") for ref in record.refs]
+        utcoffset = _NAIVE if record.utcoffset is None else record.utcoffset
+        parts = [_RECORD.pack(record.timestamp, utcoffset, record.type, len(encoded))]
+        for ref in encoded:
+            parts.append(_LENGTH.pack(len(ref)))
+            parts.append(ref)
+        with self._lock:
+            self._handle.seek(0, 2)
+            offset = self._handle.tell()
+            self._handle.write(b"".join(parts))
+            self._handle.flush()
+            return offset
+
+    def read(self, offset: int) -> TimelineRecord:
+        with self._lock:
+            self._handle.seek(offset)
+            timestamp, utcoffset, code, count = _RECORD.unpack(self._handle.read(_RECORD.size))
+            refs = []
+            for _ in range(count):
+                (length,) = _LENGTH.unpack(self._handle.read(_LENGTH.size))
+                refs.append(self._handle.read(length).decode("utf-8"))
+        return TimelineRecord(
+            timestamp, TimelineEntryType(code), tuple(refs), None if utcoffset == _NAIVE else utcoffset
+        )
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "TimelineSegment":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "TimelineSegment":
+        return self
+
+
+class IncidentTimeline:
+    """Append-only log of :class:`TimelineRecord` entries for one incident.
+
+    Timestamps and type codes are kept in flat arrays; references stay in
+    memory or, with a ``segment``, in the shared segment file. Iterating or
+    indexing yields the familiar rendered strings, formatted only when read,
+    with each timestamp in the offset (or naive form) it was appended with.
+    """
+
+    def __init__(self, segment: Optional[TimelineSegment] = None) -> None:
+        self.segment = segment
+        self._timestamps = array("q")
+        self._utcoffsets = array("i")
+        self._codes = bytearray()
+        self._refs: List[Tuple[str, ...]] = []
+        self._offsets = array("Q")
+
+    @overload
+    def append(self, entry: str) -> None: ...
+
+    @overload
+    def append(self, entry: TimelineEntryType, at: datetime, refs: Sequence[str] = ()) -> None: ...
+
+    def append(
+        self, entry: Union[TimelineEntryType, str], at: Optional[datetime] = None, refs: Sequence[str] = ()
+    ) -> None:
+        """Append one entry.
+
+        A single string is kept as a ``NOTE``, as the list-of-strings
+        timeline accepted it: a leading ISO timestamp becomes the entry time,
+        otherwise the note is stamped with the current UTC time.
+        """
+
+        if isinstance(entry, str):
+            stamped, text = _split_stamped(entry)
+            entry, at, refs = TimelineEntryType.NOTE, stamped or datetime.now(timezone.utc), (text,)
+        elif at is None:
+            raise TypeError("append() needs a timestamp for a typed timeline entry")
+        utcoffset = utc_offset_seconds(at)
+        record = TimelineRecord(to_micros(at), entry, tuple(refs), utcoffset)
+        self._timestamps.append(record.timestamp)
+        self._utcoffsets.append(_NAIVE if utcoffset is None else utcoffset)
+        self._codes.append(record.type)
+        if self.segment is not None:
+            self._offsets.append(self.segment.append(record))
+        else:
+            self._refs.append(record.refs)
+
+    def record(self, index: int) -> TimelineRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("timeline index out of range")
+        if self.segment is not None:
+            return self.segment.read(self._offsets[index])
+        utcoffset = self._utcoffsets[index]
+        return TimelineRecord(
+            self._timestamps[index],
+            TimelineEntryType(self._codes[index]),
+            self._refs[index],
+            None if utcoffset == _NAIVE else utcoffset,
+        )
+
+    def records(
+        self, offset: int = 0, limit: Optional[int] = None, entry_type: Optional[TimelineEntryType] = None
+    ) -> List[TimelineRecord]:
+        """Return structured entries in append order, optionally of one type only."""
+
+        indexes: Sequence[int] = range(len(self))
+        if entry_type is not None:
+            indexes = [index for index, code in enumerate(self._codes) if code == entry_type]
+        end = None if limit is None else offset + limit
+        return [self.record(index) for index in indexes[offset:end]]
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[str]:
+        """Render one page of entries."""
+
+        return [record.render() for record in self.records(offset, limit)]
+
+    def render(self) -> List[str]:
+        return self.page(0, len(self))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.record(index).render()
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self.record(position).render() for position in range(len(self))[index]]
+        return self.record(index).render()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IncidentTimeline):
+            return self.records() == other.records()
+        if isinstance(other, list):
+            return self.render() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IncidentTimeline(entries={len(self)})"
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "IncidentTimeline":
+        copy = IncidentTimeline(self.segment)
+        copy._timestamps = array("q", self._timestamps)
+        copy._utcoffsets = array("i", self._utcoffsets)
+        copy._codes = bytearray(self._codes)
+        copy._refs = list(self._refs)
+        copy._offsets = array("Q", self._offsets)
+        return copy
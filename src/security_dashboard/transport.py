@@ -0,0 +1,367 @@
+"""Shared-memory transport of events between an ingest process and rule workers.
+
+Each :class:`SharedEventRing` is a single-producer/single-consumer ring of
+fixed-size slots in a :mod:`multiprocessing.shared_memory` segment::
+
+    header   64 bytes  magic, slot size, capacity, head (written), tail (read), closed
+    slots    capacity * slot_size bytes
+
+    slot     q timestamp (microseconds since the Unix epoch, UTC)
+             i failed_attempts, -1 when absent
+             B severity code
+             6H byte lengths of id, source, asset_id, category, extras JSON, tags
+             UTF-8 string table with the six strings back to back; tags are
+             sorted and separated by U+001F
+
+Consumers read slots through :class:`EventView`, which decodes fields from
+the shared buffer on first access instead of unpickling whole events.
+:class:`ShardedEventRings` routes events by asset to one ring per worker so
+per-asset correlation and sequence state stays inside a single worker.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from .models import Alert, Event, Severity
+from .rules import RuleEngine
+
+_MAGIC = 0x53444552
+_HEADER = struct.Struct("<III")
+_HEADER_SIZE = 64
+_HEAD_OFFSET = 16
+_TAIL_OFFSET = 24
+_CLOSED_OFFSET = 32
+_COUNTER = struct.Struct("<Q")
+_SLOT = struct.Struct("<qiB6H")
+_NO_ATTEMPTS = -1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SEVERITIES = list(Severity)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_STRINGS = 6
+_TAG_SEPARATOR = "\x1f"
+_FIXED_FIELDS = {"id", "source", "asset_id", "category", "severity", "timestamp", "failed_attempts"}
+
+
+class EventView:
+    """Read-only view of an encoded event exposing the fields :class:`RuleEngine` uses.
+
+    A view points into the ring and is only valid until its slot is released;
+    call :meth:`detach` first to keep it afterwards.
+    """
+
+    __slots__ = (
+        "_buffer", "_offset", "_lengths", "_timestamp", "_attempts", "severity", "_strings", "_payload", "_tags"
+    )
+
+    def __init__(self, buffer: memoryview, offset: int) -> None:
+        micros, attempts, severity, *lengths = _SLOT.unpack_from(buffer, offset)
+        self._buffer: Optional[memoryview] = buffer
+        self._offset = offset + _SLOT.size
+        self._lengths = lengths
+        self._timestamp = micros
+        self._attempts = attempts
+        self.severity = _SEVERITIES[severity]
+        self._strings: List[Optional[str]] = [None] * _STRINGS
+        self._payload: Optional[Dict[str, object]] = None
+        self._tags: Optional[FrozenSet[str]] = None
+
+    def _string(self, index: int) -> str:
+        value = self._strings[index]
+        if value is None:
+            start = self._offset + sum(self._lengths[:index])
+            value = str(self._buffer[start : start + self._lengths[index]], "utf-8")
+            self._strings[index] = value
+        return value
+
+    @property
+    def id(self) -> str:
+        return self._string(0)
+
+    @property
+    def source(self) -> str:
+        return self._string(1)
+
+    @property
+    def asset_id(self) -> str:
+        return self._string(2)
+
+    @property
+    def category(self) -> str:
+        return self._string(3)
+
+    @property
+    def timestamp(self) -> datetime:
+        if not isinstance(self._timestamp, datetime):
+            self._timestamp = _EPOCH + timedelta(microseconds=self._timestamp)
+        return self._timestamp
+
+    @property
+    def tags(self) -> FrozenSet[str]:
+        if self._tags is None:
+            joined = self._string(5)
+            self._tags = frozenset(joined.split(_TAG_SEPARATOR)) if joined else frozenset()
+        return self._tags
+
+    @property
+    def raw_payload(self) -> Dict[str, object]:
+        if self._payload is None:
+            payload: Dict[str, object] = {}
+            if self._lengths[4]:
+                payload.update(json.loads(self._string(4)))
+            if self._attempts != _NO_ATTEMPTS:
+                payload["failed_attempts"] = self._attempts
+            self._payload = payload
+        return self._payload
+
+    def detach(self) -> "EventView":
+        """Copy every field out of shared memory so the slot can be reused."""
+
+        for index in range(_STRINGS):
+            self._string(index)
+        self._timestamp = self.timestamp
+        self._payload = self.raw_payload
+        self._tags = self.tags
+        self._buffer = None
+        return self
+
+    def to_event(self) -> Event:
+        return Event(
+            id=self.id,
+            source=self.source,
+            asset_id=self.asset_id,
+            severity=self.severity,
+            category=self.category,
+            timestamp=self.timestamp,
+            raw_payload={**self.raw_payload, "id": self.id},
+            tags=self.tags,
+        )
+
+
+class EventTooLarge(ValueError):
+    """Raised when an encoded event does not fit into one ring slot."""
+
+    def __init__(self, event: Event, size: int, slot_size: int) -> None:
+        super().__init__(f"Event {event.id!r} needs {size} bytes but slots hold {slot_size}")
+        self.event = event
+        self.size = size
+
+
+def encode_event(event: Event, buffer: memoryview, offset: int, slot_size: int) -> None:
+    """Encode ``event`` into one slot; raise :class:`EventTooLarge` when it does not fit."""
+
+    extras = {key: value for key, value in event.raw_payload.items() if key not in _FIXED_FIELDS}
+    strings = [
+        event.id.encode("utf-8"),
+        event.source.encode("utf-8"),
+        event.asset_id.encode("utf-8"),
+        event.category.encode("utf-8"),
+        json.dumps(extras, separators=(",", ":"), default=str).encode("utf-8") if extras else b"",
+        _TAG_SEPARATOR.join(sorted(event.tags)).encode("utf-8"),
+    ]
+    size = _SLOT.size + sum(len(value) for value in strings)
+    if size > slot_size:
+        raise EventTooLarge(event, size, slot_size)
+    timestamp = event.timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    attempts = event.raw_payload.get("failed_attempts")
+    _SLOT.pack_into(
+        buffer,
+        offset,
+        (timestamp - _EPOCH) // timedelta(microseconds=1),
+        _NO_ATTEMPTS if attempts is None else int(attempts),
+        _SEVERITY_CODES[event.severity],
+        *(len(value) for value in strings),
+    )
+    position = offset + _SLOT.size
+    for value in strings:
+        buffer[position : position + len(value)] = value
+        position += len(value)
+
+
+@dataclass
+class SharedEventRing:
+    """Single-producer/single-consumer ring of encoded events in shared memory."""
+
+    memory: shared_memory.SharedMemory
+    capacity: int
+    slot_size: int
+    owner: bool = False
+
+    @classmethod
+    def create(cls, capacity: int = 4096, slot_size: int = 512, name: Optional[str] = None) -> "SharedEventRing":
+        memory = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity * slot_size)
+        memory.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, slot_size, capacity)
+        return cls(memory=memory, capacity=capacity, slot_size=slot_size, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedEventRing":
+        """Open an existing ring, typically from a worker started by the creating process.
+
+        Workers should be child processes of the creator so they share its
+        resource tracker; only the creator unlinks the segment.
+        """
+
+        memory = shared_memory.SharedMemory(name=name)
+        magic, slot_size, capacity = _HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC:
+            memory.close()
+            raise ValueError(f"Shared memory {name!r} is not an event ring")
+        return cls(memory=memory, capacity=capacity, slot_size=slot_size)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.memory.buf[_CLOSED_OFFSET])
+
+    def __len__(self) -> int:
+        return self._counter(_HEAD_OFFSET) - self._counter(_TAIL_OFFSET)
+
+    def try_put(self, event: Event) -> bool:
+        """Write ``event`` into the next free slot; return ``False`` when the ring is full."""
+
+        head = self._counter(_HEAD_OFFSET)
+        if head - self._counter(_TAIL_OFFSET) >= self.capacity:
+            return False
+        encode_event(event, self.memory.buf, self._slot_offset(head), self.slot_size)
+        _COUNTER.pack_into(self.memory.buf, _HEAD_OFFSET, head + 1)
+        return True
+
+    def put(self, event: Event, timeout: Optional[float] = None, poll_interval: float = 0.0005) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_put(event):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Ring {self.name!r} stayed full for {timeout}s")
+            time.sleep(poll_interval)
+
+    def read(self, max_events: int = 256) -> List[EventView]:
+        """Return views of up to ``max_events`` unread slots without consuming them."""
+
+        tail = self._counter(_TAIL_OFFSET)
+        available = min(self._counter(_HEAD_OFFSET) - tail, max_events)
+        buffer = self.memory.buf
+        return [EventView(buffer, self._slot_offset(tail + index)) for index in range(available)]
+
+    def release(self, count: int) -> None:
+        """Hand ``count`` slots back to the producer once their views are no longer needed."""
+
+        _COUNTER.pack_into(self.memory.buf, _TAIL_OFFSET, self._counter(_TAIL_OFFSET) + count)
+
+    def close_writer(self) -> None:
+        """Signal consumers that no more events will be written."""
+
+        self.memory.buf[_CLOSED_OFFSET] = 1
+
+    def close(self) -> None:
+        self.memory.close()
+
+    def unlink(self) -> None:
+        if self.owner:
+            self.memory.unlink()
+
+    def _counter(self, offset: int) -> int:
+        return _COUNTER.unpack_from(self.memory.buf, offset)[0]
+
+    def _slot_offset(self, sequence: int) -> int:
+        return _HEADER_SIZE + (sequence % self.capacity) * self.slot_size
+
+
+@dataclass
+class ShardedEventRings:
+    """One ring per worker; events are routed by asset so each asset stays on one worker."""
+
+    rings: List[SharedEventRing]
+
+    @classmethod
+    def create(cls, workers: int, capacity: int = 4096, slot_size: int = 512) -> "ShardedEventRings":
+        return cls([SharedEventRing.create(capacity=capacity, slot_size=slot_size) for _ in range(workers)])
+
+    @property
+    def names(self) -> List[str]:
+        return [ring.name for ring in self.rings]
+
+    def put(self, event: Event, timeout: Optional[float] = None) -> None:
+        shard = zlib.crc32(event.asset_id.encode("utf-8")) % len(self.rings)
+        self.rings[shard].put(event, timeout=timeout)
+
+    def feed(
+        self,
+        events: Iterable[Event],
+        timeout: Optional[float] = None,
+        on_oversized: Optional[Callable[[Event], None]] = None,
+    ) -> int:
+        """Route ``events`` to the rings, then close them; return the number written.
+
+        Events larger than a slot are passed to ``on_oversized`` (for example
+        to evaluate them in the producer) instead of aborting the stream;
+        without it :class:`EventTooLarge` is raised. The rings are closed for
+        writing even when feeding fails, so consumers always terminate.
+        """
+
+        count = 0
+        try:
+            for event in events:
+                try:
+                    self.put(event, timeout=timeout)
+                except EventTooLarge:
+                    if on_oversized is None:
+                        raise
+                    on_oversized(event)
+                    continue
+                count += 1
+        finally:
+            for ring in self.rings:
+                ring.close_writer()
+        return count
+
+    def close(self) -> None:
+        for ring in self.rings:
+            ring.close()
+            ring.unlink()
+
+
+def consume(
+    ring: SharedEventRing,
+    engine: RuleEngine,
+    on_alerts: Callable[[List[Alert]], None],
+    batch_size: int = 256,
+    poll_interval: float = 0.0005,
+) -> int:
+    """Run ``engine`` over a ring until the producer closes it; return the event count.
+
+    Views are detached before their slots are released only when the engine
+    has correlation or sequence rules, which keep events between batches.
+    """
+
+    retains_events = bool(engine.correlation_rules or engine.sequence_rules)
+    processed = 0
+    while True:
+        views = ring.read(batch_size)
+        if not views:
+            if ring.closed and not len(ring):
+                break
+            time.sleep(poll_interval)
+            continue
+        alerts = engine.process(views)
+        if retains_events:
+            for view in views:
+                view.detach()
+        if alerts:
+            on_alerts(alerts)
+        ring.release(len(views))
+        processed += len(views)
+    alerts = engine.finish()
+    if alerts:
+        on_alerts(alerts)
+    return processed
@@ -0,0 +1,91 @@
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import (
+    Alert,
+    ApprovalQueue,
+    InMemoryEventSource,
+    LoggingActionExecutor,
+    Playbook,
+    PlaybookAction,
+    Severity,
+    default_pipeline,
+)
+
+
+def test_pipeline_parks_approval_required_playbooks():
+    events = [{"id": "evt-1", "asset_id": "srv-1", "severity": "critical", "category": "network",
+               "timestamp": datetime.now(UTC).isoformat()}]
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    result = pipeline.run()
+
+    assert result["executed_actions"] == []
+    [request] = result["pending_approvals"]
+    assert (request.playbook_id, request.alert_id, request.status) == ("PB-1", "RULE-1:evt-1", "pending")
+
+    assert pipeline.approval_queue.approve(request.id, "lead") is request
+    pipeline.approval_queue.wait(timeout=5)
+    assert pipeline.executed_actions == ["isolate-host:INC-1", "notify:INC-1"]
+    assert request.dispatch_status == "completed"
+    assert pipeline.approval_queue.approve(request.id, "lead") is None
+
+
+def test_queue_expires_requests_and_survives_restart(tmp_path):
+    now = [datetime(2024, 1, 1, tzinfo=UTC)]
+    executed = []
+    playbook = Playbook("PB-9", "contain", "*", [PlaybookAction("isolate-host", {})], approval_required=True)
+    alert = Alert("A-1", "RULE-1", ["evt-1"], Severity.CRITICAL)
+    journal = tmp_path / "approvals.jsonl"
+
+    def make_queue():
+        return ApprovalQueue(
+            executor_factory=lambda _: LoggingActionExecutor(executed),
+            ttl=timedelta(minutes=30),
+            journal_path=journal,
+            clock=lambda: now[0],
+        )
+
+    queue = make_queue()
+    first = queue.park(playbook, alert, {"incident_id": "INC-1"})
+    now[0] += timedelta(minutes=20)
+    second = queue.park(playbook, alert, {"incident_id": "INC-2"})
+    queue.reject(first.id, "lead", "false positive")
+    # No close(): every record is on disk once the call that wrote it returns.
+    assert len(journal.read_text().splitlines()) == 3
+
+    restarted = make_queue()
+    restarted.register_playbooks([playbook])
+    assert restarted.get(first.id).status == "rejected"
+    assert [request.id for request in restarted.query(alert_id="A-1")] == [second.id]
+    third = restarted.park(playbook, alert, {"incident_id": "INC-3"})
+    assert third.id == "APR-3"
+
+    now[0] += timedelta(minutes=31)
+    assert {request.id for request in restarted.expire()} == {second.id, third.id}
+    assert restarted.approve(second.id, "lead") is None
+    assert executed == []
+
+
+def test_failed_dispatch_is_recorded_and_journaled(tmp_path):
+    import pytest
+
+    class FailingExecutor:
+        def execute(self, action, context):
+            raise RuntimeError(f"cannot {action.type}")
+
+    playbook = Playbook("PB-9", "contain", "*", [PlaybookAction("isolate-host", {})], approval_required=True)
+    alert = Alert("A-1", "RULE-1", ["evt-1"], Severity.CRITICAL)
+    journal = tmp_path / "approvals.jsonl"
+    queue = ApprovalQueue(executor_factory=lambda _: FailingExecutor(), journal_path=journal)
+    request = queue.park(playbook, alert, {})
+    waiting = queue.park(playbook, alert, {})
+    assert queue.approve(request.id, "lead").dispatch_status in ("dispatched", "failed")
+    with pytest.raises(RuntimeError):
+        queue.wait(timeout=5)
+    queue.close()
+    assert (request.dispatch_status, request.dispatch_error) == ("failed", "RuntimeError: cannot isolate-host")
+
+    restarted = ApprovalQueue(executor_factory=lambda _: FailingExecutor(), journal_path=journal)
+    assert restarted.get(request.id).dispatch_status == "failed"
+    unregistered = restarted.approve(waiting.id, "lead")
+    assert (unregistered.dispatch_status, unregistered.dispatch_error) == ("failed", "Playbook 'PB-9' is not registered")
+    restarted.close()
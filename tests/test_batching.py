@@ -0,0 +1,132 @@
+from security_dashboard import AdaptiveBatcher, InMemoryEventSource, default_pipeline
+from synthetic import generate_events
+
+
+def test_batcher_flushes_on_size_and_timeout():
+    now = [0.0]
+    batcher = AdaptiveBatcher(max_batch_size=3, flush_timeout=1.0, clock=lambda: now[0])
+    assert batcher.batch_size == 3
+    assert batcher.add("a") is None
+    assert batcher.add("b") is None
+    assert batcher.add("c") == ["a", "b", "c"]
+    assert batcher.add("d") is None
+    now[0] = 1.5
+    assert batcher.poll() == ["d"]
+    assert batcher.poll() is None
+
+
+def test_batcher_adapts_size_to_observed_cost():
+    batcher = AdaptiveBatcher(target_latency=0.01, max_batch_size=1000, smoothing=1.0)
+    batcher.record(100, 0.1)
+    assert batcher.batch_size == 10
+    batcher.record(10, 0.00001)
+    assert batcher.batch_size == 1000
+
+
+def test_micro_batched_pipeline_matches_single_batch_output():
+    events = generate_events(2000, assets=20, seed=7)
+    single = default_pipeline(InMemoryEventSource(events)).run()
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.batcher = AdaptiveBatcher(max_batch_size=37, flush_timeout=60.0)
+    batched = pipeline.run()
+
+    key = lambda alert: (alert.id, tuple(alert.event_ids))  # noqa: E731
+    assert sorted(map(key, batched["alerts"])) == sorted(map(key, single["alerts"]))
+    assert batched["reports"][0].findings == single["reports"][0].findings
+    assert len(batched["events"]) == 2000
+
+
+def test_batcher_flushes_partial_batch_while_source_is_blocked():
+    import threading
+    import time
+
+    release = threading.Event()
+    handled = []
+
+    def slow_source():
+        yield "a"
+        yield "b"
+        release.wait(5.0)
+        yield "c"
+
+    def handler(batch):
+        handled.append((list(batch), release.is_set()))
+        release.set()
+
+    batcher = AdaptiveBatcher(max_batch_size=10, flush_timeout=0.05)
+    started = time.monotonic()
+    assert batcher.run(slow_source(), handler) == 2
+    assert time.monotonic() - started < 2.0
+    assert handled == [(["a", "b"], False), (["c"], True)]
+
+
+def test_batcher_reraises_source_errors():
+    import pytest
+
+    def broken_source():
+        yield "a"
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        AdaptiveBatcher(flush_timeout=60.0).run(broken_source(), lambda batch: None)
+
+
+def test_batched_sequence_alerts_match_single_batch_with_reorder_buffer():
+    import random
+    from datetime import timedelta
+
+    from security_dashboard import WatermarkBuffer
+
+    events = generate_events(2000, assets=20, seed=7)
+    random.Random(3).shuffle(events)
+    single = default_pipeline(InMemoryEventSource(events)).run()
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.batcher = AdaptiveBatcher(max_batch_size=37, flush_timeout=60.0)
+    pipeline.reorder_buffer = WatermarkBuffer(allowed_lateness=timedelta(days=365))
+    batched = pipeline.run()
+
+    key = lambda result: sorted(a.id for a in result["alerts"] if not a.rule_id.startswith("CORR"))  # noqa: E731
+    assert any(alert.rule_id == "SEQ-1" for alert in single["alerts"])
+    assert key(batched) == key(single)
+
+
+def test_batcher_stops_and_closes_the_source_when_the_handler_fails():
+    import threading
+
+    import pytest
+
+    closed = threading.Event()
+
+    def endless_source():
+        try:
+            while True:
+                yield "event"
+        finally:
+            closed.set()
+
+    def failing_handler(batch):
+        raise ValueError("handler failed")
+
+    with pytest.raises(ValueError):
+        AdaptiveBatcher(max_batch_size=4).run(endless_source(), failing_handler)
+    assert closed.wait(2.0)
+
+
+def test_batched_replay_is_deterministic_on_the_event_time_clock():
+    import random
+    from datetime import timedelta
+
+    from security_dashboard import WatermarkBuffer
+
+    events = generate_events(1000, assets=10, seed=5)
+    random.Random(1).shuffle(events)
+
+    def run(batcher):
+        pipeline = default_pipeline(InMemoryEventSource(events))
+        pipeline.batcher = batcher
+        pipeline.reorder_buffer = WatermarkBuffer(allowed_lateness=timedelta(days=365), max_buffered=200)
+        return sorted((alert.id, alert.created_at) for alert in pipeline.run()["alerts"])
+
+    replayed = run(None)
+    assert run(AdaptiveBatcher(max_batch_size=7, flush_timeout=60.0)) == replayed
+    assert run(AdaptiveBatcher(max_batch_size=64, flush_timeout=60.0)) == replayed
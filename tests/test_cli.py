@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from synthetic import generate_events
+
+from security_dashboard.cli import main
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_cli_scans_files_and_directories_and_writes_reports(tmp_path, capsys):
+    events = generate_events(40)
+    (tmp_path / "in" / "nested").mkdir(parents=True)
+    (tmp_path / "in" / "batch.json").write_text(json.dumps(events[:20]))
+    (tmp_path / "in" / "nested" / "stream.jsonl").write_text("\n".join(json.dumps(event) for event in events[20:]))
+    (tmp_path / "in" / "notes.txt").write_text("ignored")
+
+    assert main([str(tmp_path / "in"), "--output", str(tmp_path / "out"), "--replay"]) == 0
+
+    summary = json.loads((tmp_path / "out" / "event-summary.json").read_text())
+    assert summary["findings"]["total_events"] == 40
+    assert (tmp_path / "out" / "incident-summary.json").exists()
+    err = capsys.readouterr().err
+    assert err.startswith("40 events,")
+    approvals = json.loads((tmp_path / "out" / "pending-approvals.json").read_text())
+    assert f"{len(approvals)} playbook runs awaiting approval" in err
+
+
+def test_cli_lists_pending_approvals_and_journals_them(tmp_path, capsys):
+    events = generate_events(200)
+    (tmp_path / "events.json").write_text(json.dumps(events))
+    journal = tmp_path / "approvals.jsonl"
+
+    assert main([str(tmp_path / "events.json"), "--approval-journal", str(journal)]) == 0
+
+    err = capsys.readouterr().err
+    listed = [line for line in err.splitlines() if line.startswith("pending approval ")]
+    assert listed
+    assert f"{len(listed)} playbook runs awaiting approval" in err
+    assert len(journal.read_text().splitlines()) == len(listed)
+
+
+def test_cli_reports_malformed_event_file_with_exit_status_2(tmp_path, capsys):
+    good = json.dumps(generate_events(1)[0])
+    (tmp_path / "events.jsonl").write_text(f"{good}\n{{not json\n")
+
+    assert main([str(tmp_path / "events.jsonl")]) == 2
+
+    err = capsys.readouterr().err
+    assert f"{tmp_path / 'events.jsonl'}:2:" in err
+    assert "Traceback" not in err
+
+
+def test_package_import_is_lazy():
+    code = (
+        "import sys, security_dashboard as sd\n"
+        "assert 'security_dashboard.rules' not in sys.modules\n"
+        "assert sd.RuleEngine.__name__ == 'RuleEngine'\n"
+        "import security_dashboard.pretty\n"
+        "assert 'rich' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
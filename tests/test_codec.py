@@ -0,0 +1,109 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from security_dashboard import EventNormalizer
+from security_dashboard.codec import CodecError, decode_events, encode_events
+
+
+def test_binary_batch_round_trips_into_normalized_events():
+    raw_events = [
+        {"id": "evt-1", "source": "auth", "asset_id": "srv-1", "severity": "high", "category": "auth",
+         "timestamp": "2024-01-01T00:00:00.123456+00:00", "failed_attempts": 7},
+        {"id": "evt-2", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": datetime(2024, 1, 1, 0, 5, tzinfo=UTC), "src_ip": "10.0.0.1"},
+    ]
+    normalizer = EventNormalizer(id_factory=lambda event: str(event.get("id")))
+    data = encode_events(raw_events)
+    decoded = [normalizer.normalize(raw_event) for raw_event in decode_events(data)]
+    expected = [normalizer.normalize(dict({"source": "unknown"}, **raw_event)) for raw_event in raw_events]
+
+    for event, reference in zip(decoded, expected):
+        assert (event.id, event.source, event.asset_id, event.severity, event.category, event.timestamp) == (
+            reference.id, reference.source, reference.asset_id, reference.severity, reference.category,
+            reference.timestamp,
+        )
+    assert decoded[0].raw_payload["failed_attempts"] == 7
+    assert decoded[1].raw_payload["src_ip"] == "10.0.0.1"
+    assert "failed_attempts" not in decoded[1].raw_payload
+
+
+def test_decode_rejects_truncated_batches():
+    data = encode_events([{"id": "evt-1", "timestamp": "2024-01-01T00:00:00+00:00"}])
+    with pytest.raises(CodecError):
+        decode_events(data[:-3])
+    with pytest.raises(CodecError):
+        decode_events(b"JUNK" + data[4:])
+
+
+def _batch(strings, record):
+    from security_dashboard import codec
+
+    parts = [codec._HEADER.pack(codec.MAGIC, codec.VERSION), codec._COUNT.pack(len(strings))]
+    for text in strings:
+        parts.append(codec._LENGTH.pack(len(text)))
+        parts.append(text)
+    parts.append(codec._COUNT.pack(1))
+    parts.append(codec._RECORD.pack(*record))
+    return b"".join(parts)
+
+
+@pytest.mark.parametrize(
+    "strings, record",
+    [
+        ([b"evt-\xff"], (0, 0, 0, 0, 0, 0, -1, 0xFFFFFFFF)),
+        ([b"evt-1", b"[1, 2]"], (0, 0, 0, 0, 0, 0, -1, 1)),
+        ([b"evt-1", b"{not json"], (0, 0, 0, 0, 0, 0, -1, 1)),
+        ([b"evt-1"], (0, 0, 0, 0, 0, 2**62, -1, 0xFFFFFFFF)),
+        ([b"evt-1"], (0, 0, 0, 0, 99, 0, -1, 0xFFFFFFFF)),
+    ],
+    ids=["invalid-utf8", "extras-not-object", "extras-not-json", "timestamp-overflow", "unknown-severity"],
+)
+def test_decode_reports_malformed_batches_as_codec_errors(strings, record):
+    with pytest.raises(CodecError):
+        decode_events(_batch(strings, record))
+
+
+def test_binary_endpoint_answers_malformed_batches_with_400():
+    import asyncio
+
+    import httpx
+
+    from main import app
+    from security_dashboard.codec import CONTENT_TYPE
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/run-pipeline/binary",
+                content=_batch([b"evt-1", b'"text"'], (0, 0, 0, 0, 0, 0, -1, 1)),
+                headers={"content-type": CONTENT_TYPE},
+            )
+
+    assert asyncio.run(post()).status_code == 400
+
+
+def test_encode_rejects_strings_over_the_length_prefix():
+    with pytest.raises(CodecError):
+        encode_events([{"id": "x" * 70_000, "timestamp": "2024-01-01T00:00:00+00:00"}])
+    with pytest.raises(CodecError):
+        encode_events([{"id": "evt-1", "timestamp": "2024-01-01T00:00:00+00:00", "blob": "y" * 70_000}])
+
+
+def test_binary_and_json_paths_agree_on_naive_and_offset_timestamps():
+    raw_events = [
+        {"id": "evt-1", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": "2024-01-01T09:00:00"},
+        {"id": "evt-2", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": "2024-01-01T09:00:00+09:00"},
+    ]
+    normalizer = EventNormalizer(id_factory=lambda event: str(event.get("id")))
+    from_json = [normalizer.normalize(raw_event).timestamp for raw_event in raw_events]
+    from_binary = [normalizer.normalize(raw_event).timestamp for raw_event in decode_events(encode_events(raw_events))]
+
+    assert from_json == from_binary
+    assert [timestamp.isoformat() for timestamp in from_json] == [
+        "2024-01-01T09:00:00+00:00",
+        "2024-01-01T00:00:00+00:00",
+    ]
@@ -0,0 +1,90 @@
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import BloomFilter, EventDeduplicator, InMemoryEventSource, default_pipeline
+from security_dashboard.dedup import field_fingerprint
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=10_000, false_positive_rate=0.01)
+    for index in range(10_000):
+        bloom.add(f"evt-{index}")
+    assert all(f"evt-{index}" in bloom for index in range(10_000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10_000))
+    assert false_positives < 300
+
+
+def test_deduplicator_covers_exact_window_then_bloom_generations():
+    now = [0.0]
+    dedup = EventDeduplicator(window=timedelta(seconds=10), exact_capacity=2, bloom_capacity=1000,
+                              clock=lambda: now[0], drop_unconfirmed=True)
+    assert not dedup.is_duplicate({"id": "evt-1"})
+    assert not dedup.is_duplicate({"id": "evt-2"})
+    assert not dedup.is_duplicate({"id": "evt-3"})
+    # evt-1 fell out of the exact set but is still in the Bloom filter.
+    assert dedup.is_duplicate({"id": "evt-1"})
+    now[0] = 15.0
+    assert dedup.is_duplicate({"id": "evt-2"})
+    now[0] = 25.0
+    assert not dedup.is_duplicate({"id": "evt-2"})
+    assert (dedup.duplicates, dedup.unconfirmed_duplicates) == (0, 2)
+
+
+def test_deduplicator_keeps_bloom_only_hits_by_default():
+    dedup = EventDeduplicator(exact_capacity=1, bloom_capacity=1000)
+    assert not dedup.is_duplicate({"id": "evt-1"})
+    assert not dedup.is_duplicate({"id": "evt-2"})
+    # evt-1 is only in the Bloom filter now: counted, but not dropped.
+    assert not dedup.is_duplicate({"id": "evt-1"})
+    assert dedup.is_duplicate({"id": "evt-1"})
+    assert (dedup.duplicates, dedup.unconfirmed_duplicates) == (1, 1)
+
+
+def test_pipeline_drops_redelivered_events_before_detection():
+    event = {"id": "evt-1", "asset_id": "srv-1", "severity": "critical", "category": "network",
+             "timestamp": (datetime.now(UTC) - timedelta(minutes=1)).isoformat()}
+    result = default_pipeline(InMemoryEventSource([event, dict(event), event])).run()
+
+    assert [e.id for e in result["events"]] == ["evt-1"]
+    assert [a.id for a in result["alerts"]] == ["RULE-1:evt-1"]
+    assert result["duplicates_dropped"] == 2
+
+
+def test_deduplicator_accepts_content_fingerprint():
+    dedup = EventDeduplicator(fingerprint=field_fingerprint("asset_id", "timestamp"))
+    assert not dedup.is_duplicate({"id": "a", "asset_id": "srv-1", "timestamp": "t1"})
+    assert dedup.is_duplicate({"id": "b", "asset_id": "srv-1", "timestamp": "t1"})
+    assert not dedup.is_duplicate({"id": "a", "asset_id": "srv-2", "timestamp": "t1"})
+
+
+def test_events_without_id_are_deduplicated_by_content_only():
+    base = {"asset_id": "srv-1", "severity": "low", "category": "network"}
+    raw = [{**base, "timestamp": f"2024-01-01T00:00:0{index}+00:00"} for index in range(5)]
+    result = default_pipeline(InMemoryEventSource(raw + [dict(raw[0])])).run()
+
+    assert len(result["events"]) == 5
+    assert result["duplicates_dropped"] == 1
+
+
+def test_api_drops_events_resent_in_a_later_request():
+    import asyncio
+
+    import httpx
+
+    from main import app
+
+    event = {"id": "evt-resent-1", "asset_id": "srv-resent", "severity": "critical", "category": "network",
+             "timestamp": datetime.now(UTC).isoformat()}
+    other = dict(event, id="evt-resent-2", severity="low")
+
+    async def post_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/run-pipeline", json=[event])
+            second = await client.post("/run-pipeline", json=[event, other])
+            return first.json(), second.json()
+
+    first, second = asyncio.run(post_twice())
+    alerts = [alert["id"] for result in (first, second) for alert in result["alerts"]]
+    assert alerts == ["RULE-1:evt-resent-1"]
+    assert second["duplicates_dropped"] == 1
+    assert second["incidents"] == []
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+from security_dashboard import (
+    InMemoryEventSource,
+    ThreatIntelEnricher,
+    ThreatIntelIndex,
+    default_pipeline,
+)
+
+
+def test_indexes_match_each_indicator_kind(tmp_path):
+    feed = tmp_path / "botnet.txt"
+    feed.write_text("# botnet C2\n10.0.0.0/8\n10.1.2.0/24,apt-x\n2001:db8::/32\n")
+    index = ThreatIntelIndex()
+    assert index.load_file(feed, "ip") == 3
+    index.add("domain", "evil.com", "phishing")
+    index.add("hash", "D41D8CD98F00B204E9800998ECF8427E", "dropper")
+    index.add("substring", "mimikatz", "credential-dumping")
+    index.add("substring", "katz", "short-pattern")
+
+    assert index.lookup("ip", "10.1.2.3") == {"botnet", "apt-x"}
+    assert index.lookup("ip", "10.200.0.1") == {"botnet"}
+    assert index.lookup("ip", "11.0.0.1") == frozenset()
+    assert index.lookup("ip", "2001:db8::1") == {"botnet"}
+    assert index.lookup("domain", "https://login.evil.com/path") == {"phishing"}
+    assert index.lookup("domain", "notevil.com") == frozenset()
+    assert index.lookup("hash", "d41d8cd98f00b204e9800998ecf8427e") == {"dropper"}
+    assert index.lookup("substring", "C:\\tools\\MIMIKATZ.exe") == {"credential-dumping", "short-pattern"}
+
+
+def test_load_file_skips_and_counts_invalid_indicators(tmp_path):
+    feed = tmp_path / "feed.txt"
+    feed.write_text("10.0.0.0/8\n10.0.0.300\nnot-an-ip,junk\n192.0.2.0/24,scanner\n")
+    index = ThreatIntelIndex()
+
+    assert index.load_file(feed, "ip") == 2
+    assert index.invalid_indicators == 2
+    assert index.lookup("ip", "192.0.2.7") == {"scanner"}
+
+
+def test_pipeline_alerts_on_enrichment_tags():
+    index = ThreatIntelIndex()
+    index.add("ip", "203.0.113.0/24", "tor-exit")
+    enricher = ThreatIntelEnricher(index)
+    events = [
+        {"id": "evt-1", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": datetime.now(UTC).isoformat(), "src_ip": "203.0.113.9"},
+        {"id": "evt-2", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": datetime.now(UTC).isoformat(), "src_ip": "203.0.113.9"},
+    ]
+    result = default_pipeline(InMemoryEventSource(events), enricher=enricher).run()
+
+    assert result["events"][0].tags == {"tor-exit"}
+    assert [alert.id for alert in result["alerts"] if alert.rule_id == "RULE-3"] == ["RULE-3:evt-1", "RULE-3:evt-2"]
+    assert (enricher.cache_hits, enricher.cache_misses) == (1, 1)
@@ -0,0 +1,49 @@
+import io
+import re
+from datetime import UTC, datetime
+
+from rich.console import Console
+
+from security_dashboard import InMemoryEventSource, default_pipeline
+from security_dashboard.pretty import LiveDashboard
+
+
+def test_live_dashboard_updates_incrementally_and_throttles_refresh():
+    events = [
+        {"id": f"evt-{index}", "asset_id": f"srv-{index % 7}", "severity": "critical",
+         "category": "network", "timestamp": datetime.now(UTC).isoformat()}
+        for index in range(500)
+    ]
+    ticks = iter(range(10_000))
+    console = Console(file=io.StringIO(), width=120)
+    live = LiveDashboard(refresh_per_second=1, max_rows=5, top_n=3, console=console,
+                         clock=lambda: next(ticks) * 0.1)
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.observers.append(live)
+    with live:
+        pipeline.run()
+
+    assert live.event_count == 500
+    assert live.events_by_asset["srv-0"] == 72
+    assert len(live.recent_alerts) == 5
+    assert list(live.incidents) == ["INC-1"]
+    assert set(live.reports) == {"event-summary", "incident-summary"}
+    # One refresh per ten observed items plus the enter/exit renders.
+    assert live.renders < 120
+
+
+def test_live_dashboard_counts_incidents_beyond_the_visible_rows():
+    from security_dashboard import Incident, Severity
+
+    console = Console(file=io.StringIO(), width=120)
+    live = LiveDashboard(max_rows=3, console=console)
+    for index in range(8):
+        live.on_incident(Incident(id=f"INC-{index}", alert_ids={"A-1"}, priority=Severity.HIGH))
+    live.on_incident(live.incidents["INC-7"])
+    # An update for an incident whose row was already evicted is not a new incident.
+    live.on_incident(Incident(id="INC-0", alert_ids={"A-1"}, priority=Severity.HIGH))
+
+    assert list(live.incidents) == ["INC-6", "INC-7", "INC-0"]
+    assert live.incident_count == 8
+    console.print(live.render())
+    assert re.search(r"incidents\s+8\b", console.file.getvalue())
@@ -0,0 +1,79 @@
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+from loadtest import MIN_SAMPLES, find_saturation, format_step, parse_server_timing, percentile, percentiles, run_step
+
+
+@pytest.fixture
+def app_state(monkeypatch):
+    """Run against fresh module-level API state so later tests see none of this load."""
+
+    import main
+    from security_dashboard import ApprovalQueue, EventDeduplicator, LoggingActionExecutor
+    from security_dashboard.cache import ResultCache
+    from security_dashboard.query import ResultStore
+    from security_dashboard.streaming import AlertBroadcaster
+
+    approved_actions = []
+    queue = ApprovalQueue(executor_factory=lambda playbook: LoggingActionExecutor(approved_actions))
+    monkeypatch.setattr(main, "broadcaster", AlertBroadcaster(serializer=main.to_jsonable))
+    monkeypatch.setattr(main, "result_store", ResultStore(max_items=main.RESULT_STORE_MAX_ITEMS))
+    monkeypatch.setattr(main, "incident_ids", itertools.count(1))
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_bytes=main.RESULT_CACHE_BYTES))
+    monkeypatch.setattr(main, "approval_queue", queue)
+    monkeypatch.setattr(main, "deduplicator", EventDeduplicator(exact_capacity=1000, bloom_capacity=1000))
+    yield main
+    queue.close()
+
+
+def _step(concurrency, events_per_s, p99=10.0, errors=0):
+    return {"concurrency": concurrency, "events_per_s": events_per_s, "errors": errors, "latency_ms": {"p99": p99}}
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 1001))
+    assert percentile(values, 50) == 500
+    assert percentile(values, 99.9) == 999
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_percentiles_need_enough_samples():
+    assert MIN_SAMPLES["p999"] == 1000 and MIN_SAMPLES["p99"] == 100
+    few = percentiles(list(range(1, 201)))
+    assert few["p99"] == 198 and few["p999"] is None
+    assert percentiles(list(range(1, 1001)))["p999"] == 999
+
+
+def test_parse_server_timing():
+    assert parse_server_timing("pipeline;dur=1.5, serialize;desc=json;dur=0.25") == {
+        "pipeline": 1.5,
+        "serialize": 0.25,
+    }
+    assert parse_server_timing("") == {}
+
+
+def test_find_saturation_reports_last_scaling_step():
+    steps = [_step(1, 100), _step(2, 190), _step(4, 200), _step(8, 150)]
+    saturation = find_saturation(steps, min_gain=0.1, p99_target_ms=None)
+    assert saturation["reason"] == "throughput"
+    assert saturation["concurrency"] == 2
+    assert saturation["first_saturated_concurrency"] == 4
+    assert find_saturation(steps[:2], 0.1, None) is None
+    assert find_saturation([_step(1, 100), _step(2, 300, p99=80)], 0.1, 50)["reason"] == "p99"
+
+
+def test_run_step_collects_latencies_and_server_timings(app_state):
+    async def run():
+        transport = httpx.ASGITransport(app=app_state.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await run_step(client, 2, 5, 4, "baseline", itertools.count())
+
+    step = asyncio.run(run())
+    assert step["requests"] == step["samples"] == 4 and step["errors"] == 0 and step["cache_hits"] == 0
+    assert step["latency_ms"]["p50"] > 0 and step["latency_ms"]["p999"] is None
+    assert "n=    4" in format_step(step) and "p999=n/a" in format_step(step)
+    assert len(app_state.result_store.incidents) > 0
+    assert {"prepare", "pipeline", "serialize", "total"} <= set(step["server_timing_ms"])
@@ -0,0 +1,132 @@
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import InMemoryEventSource, default_pipeline
+from security_dashboard.query import ResultStore, project
+
+
+def _run_into_store(events):
+    store = ResultStore()
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.observers.append(store)
+    pipeline.run()
+    return store
+
+
+def test_result_store_filters_and_paginates_newest_first():
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    events = [
+        {"id": f"evt-{index}", "asset_id": f"srv-{index % 3}", "severity": "critical" if index % 2 else "low",
+         "category": "network", "timestamp": (start + timedelta(minutes=index)).isoformat()}
+        for index in range(30)
+    ]
+    store = _run_into_store(events)
+
+    seen = []
+    cursor = None
+    while True:
+        page = store.query("events", filters={"asset": "srv-1", "severity": "critical"}, cursor=cursor, limit=4)
+        seen.extend(event.id for event in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    expected = [f"evt-{index}" for index in reversed(range(30)) if index % 3 == 1 and index % 2]
+    assert seen == expected
+
+    window = store.query("events", since=start + timedelta(minutes=10), until=start + timedelta(minutes=12))
+    assert [event.id for event in window.items] == ["evt-12", "evt-11", "evt-10"]
+
+    alerts = store.query("alerts", filters={"rule": "RULE-1", "asset": "srv-0"}, limit=100)
+    assert {alert.id for alert in alerts.items} == {f"RULE-1:evt-{index}" for index in range(30) if index % 6 == 3}
+
+
+def test_result_store_reindexes_status_changes():
+    events = [{"id": "evt-1", "asset_id": "srv-1", "severity": "critical", "category": "network",
+               "timestamp": datetime.now(UTC).isoformat()}]
+    store = _run_into_store(events)
+    alert = store.alerts.get("RULE-1:evt-1")
+    alert.acknowledge("analyst")
+    store.update_alert(alert)
+
+    assert not store.query("alerts", filters={"status": "open", "rule": "RULE-1"}).items
+    assert store.query("alerts", filters={"status": "acknowledged"}).items == [alert]
+    assert store.query("incidents", filters={"asset": "srv-1", "status": "open"}).items[0].id == "INC-1"
+    assert project({"id": "a", "rule_id": "r", "severity": "low"}, ["id", "severity"]) == {"id": "a", "severity": "low"}
+
+
+def test_sorted_keys_matches_a_sorted_list_under_out_of_order_inserts():
+    import random
+
+    from security_dashboard.query import SortedKeys
+
+    rng = random.Random(7)
+    keys = SortedKeys(load=4)
+    reference = []
+    for seq in range(500):
+        key = (float(rng.randrange(100)), seq)
+        keys.add(key)
+        reference.append(key)
+        if seq % 5 == 0:
+            victim = reference.pop(rng.randrange(len(reference)))
+            keys.remove(victim)
+    reference.sort()
+    assert len(keys) == len(reference)
+    assert keys.first() == reference[0]
+    assert list(keys.descending()) == reference[::-1]
+    lower, upper = (20.0, 0), (60.0, 0)
+    assert list(keys.descending(lower, upper)) == [key for key in reversed(reference) if lower <= key < upper]
+
+
+def test_result_store_evicts_oldest_items_by_count_and_age():
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    events = [
+        {"id": f"evt-{index}", "asset_id": "srv-1", "severity": "low", "category": "network",
+         "timestamp": (start + timedelta(minutes=index)).isoformat()}
+        for index in reversed(range(20))
+    ]
+    store = ResultStore(max_items=5)
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.observers.append(store)
+    pipeline.run()
+    assert [event.id for event in store.query("events", limit=50).items] == [f"evt-{i}" for i in range(19, 14, -1)]
+    assert store.events.evicted == 15
+    assert store.events.get("evt-0") is None
+    assert len(store.query("events", filters={"asset": "srv-1"}, limit=50).items) == 5
+
+    aged = ResultStore(max_age=timedelta(minutes=3))
+    pipeline = default_pipeline(InMemoryEventSource(events))
+    pipeline.observers.append(aged)
+    pipeline.run()
+    assert [event.id for event in aged.query("events", limit=50).items] == ["evt-19", "evt-18", "evt-17", "evt-16"]
+
+
+def test_pipelines_with_distinct_incident_ids_accumulate_incidents():
+    store = ResultStore()
+    for run in (1, 2):
+        pipeline = default_pipeline(InMemoryEventSource([
+            {"id": f"evt-{run}", "asset_id": "srv-1", "severity": "critical", "category": "network",
+             "timestamp": datetime(2024, 1, 1, run, tzinfo=UTC).isoformat()}
+        ]))
+        pipeline.incident_id = f"INC-{run}"
+        pipeline.observers.append(store)
+        pipeline.run()
+    assert [incident.id for incident in store.query("incidents").items] == ["INC-2", "INC-1"]
+
+
+def test_naive_query_bounds_are_taken_as_utc(monkeypatch):
+    import time
+
+    monkeypatch.setenv("TZ", "Asia/Seoul")
+    time.tzset()
+    try:
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        events = [
+            {"id": f"evt-{index}", "asset_id": "srv-1", "severity": "low", "category": "network",
+             "timestamp": (start + timedelta(hours=index)).isoformat()}
+            for index in range(5)
+        ]
+        store = _run_into_store(events)
+        window = store.query("events", since=datetime(2024, 1, 1, 1), until=datetime(2024, 1, 1, 2))
+        assert [event.id for event in window.items] == ["evt-2", "evt-1"]
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
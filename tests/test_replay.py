@@ -0,0 +1,45 @@
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import EventTimeClock, InMemoryEventSource, WatermarkBuffer, default_pipeline
+
+
+def _event(index, minutes, **extra):
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return {"id": f"evt-{index}", "asset_id": "srv-1", "severity": "low", "category": "network",
+            "timestamp": (base + timedelta(minutes=minutes)).isoformat(), **extra}
+
+
+def test_watermark_buffer_reorders_within_lateness_and_drops_late_events():
+    pipeline = default_pipeline(InMemoryEventSource([]))
+    normalize = pipeline.normalizer.normalize
+    buffer = WatermarkBuffer(allowed_lateness=timedelta(minutes=2))
+    minutes = [0, 3, 1, 5, 4, 0, 9]
+    released = list(buffer.reorder(normalize(_event(i, m)) for i, m in enumerate(minutes)))
+
+    assert [event.id for event in released] == ["evt-0", "evt-2", "evt-1", "evt-4", "evt-3", "evt-6"]
+    assert buffer.late_events == 1
+    assert buffer.clock() == datetime(2024, 1, 1, 0, 9, tzinfo=UTC)
+
+
+def test_replay_uses_event_time_for_alerts_incidents_and_sla():
+    raw = [_event(1, 0, severity="critical"), _event(3, 2), _event(2, 1)]
+    pipeline = default_pipeline(InMemoryEventSource(raw))
+    pipeline.reorder_buffer = WatermarkBuffer(allowed_lateness=timedelta(minutes=5))
+    result = pipeline.run()
+
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    assert [event.id for event in result["events"]] == ["evt-1", "evt-2", "evt-3"]
+    assert result["late_events"] == 0
+    [incident] = result["incidents"]
+    assert incident.created_at == start + timedelta(minutes=2)
+    assert incident.sla_due_at == start + timedelta(minutes=2, seconds=15 * 60)
+    assert incident.timeline[0].startswith((start + timedelta(minutes=2)).isoformat())
+    assert all(alert.created_at <= start + timedelta(minutes=2) for alert in result["alerts"])
+
+
+def test_event_time_clock_never_moves_backwards():
+    clock = EventTimeClock()
+    later = datetime(2024, 1, 2, tzinfo=UTC)
+    clock.advance(later)
+    clock.advance(later - timedelta(hours=1))
+    assert clock() == later
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from security_dashboard import DetectionRule, InMemoryEventSource, Severity, default_pipeline
+from security_dashboard.cache import ResultCache, canonical_hash, pipeline_fingerprint
+
+
+def test_canonical_hash_ignores_key_order_but_not_ruleset_version():
+    first = canonical_hash([{"id": "evt-1", "severity": "low"}], "v1")
+    assert first == canonical_hash([{"severity": "low", "id": "evt-1"}], "v1")
+    assert first != canonical_hash([{"severity": "low", "id": "evt-1"}], "v2")
+
+
+def test_pipeline_fingerprint_tracks_rule_changes():
+    pipeline = default_pipeline(InMemoryEventSource([]))
+    version = pipeline_fingerprint(pipeline)
+    assert version == pipeline_fingerprint(default_pipeline(InMemoryEventSource([])))
+    pipeline.correlation_rules[0].threshold = 10
+    assert pipeline_fingerprint(pipeline) != version
+
+
+def test_result_cache_evicts_by_bytes_and_coalesces_concurrent_misses():
+    cache = ResultCache(max_bytes=10)
+    assert cache.get_or_compute("a", lambda: b"aaaa") == (b"aaaa", False)
+    assert cache.get_or_compute("a", lambda: b"xxxx") == (b"aaaa", True)
+    cache.get_or_compute("b", lambda: b"bbbb")
+    cache.get_or_compute("c", lambda: b"cccc")
+    assert len(cache) == 2 and cache.size == 8
+    assert cache.get_or_compute("a", lambda: b"new!") == (b"new!", False)
+
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"slow"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("s", slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+    assert cache.coalesced == 4
+
+
+def test_pipeline_fingerprint_tracks_captured_constants():
+    def rule_with_limit(limit):
+        return DetectionRule("RULE-X", "limit", Severity.HIGH, lambda event: event.raw_payload.get("n", 0) > limit)
+
+    pipeline = default_pipeline(InMemoryEventSource([]))
+    pipeline.detection_rules.append(rule_with_limit(5))
+    version = pipeline_fingerprint(pipeline)
+    pipeline.detection_rules[-1] = rule_with_limit(5)
+    assert pipeline_fingerprint(pipeline) == version
+    pipeline.detection_rules[-1] = rule_with_limit(6)
+    assert pipeline_fingerprint(pipeline) != version
+
+
+def test_json_and_binary_endpoints_share_cache_entries():
+    import asyncio
+
+    import httpx
+
+    from main import app, result_cache
+    from security_dashboard.codec import CONTENT_TYPE, encode_events
+
+    events = [{"id": "evt-shared-1", "asset_id": "srv-shared", "severity": "low", "category": "network",
+               "timestamp": "2024-03-01T12:00:00Z"}]
+
+    async def post_both():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/run-pipeline", json=events)
+            second = await client.post(
+                "/run-pipeline/binary", content=encode_events(events), headers={"content-type": CONTENT_TYPE}
+            )
+            return first, second
+
+    first, second = asyncio.run(post_both())
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert first.content == second.content
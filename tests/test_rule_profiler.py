@@ -0,0 +1,78 @@
+import time
+
+from security_dashboard import (
+    DetectionRule,
+    InMemoryEventSource,
+    RuleEngine,
+    RuleProfiler,
+    RuleStats,
+    Severity,
+    default_pipeline,
+)
+from synthetic import generate_events
+
+
+def _slow(event):
+    time.sleep(0.0001)
+    return event.category == "auth"
+
+
+def test_profiled_engine_reorders_exclusive_rules_without_changing_alerts():
+    events = list(default_pipeline(InMemoryEventSource(generate_events(300, seed=3))).run()["events"])
+    rules = [
+        DetectionRule("SLOW", "slow auth", Severity.LOW, _slow, exclusive_group="category"),
+        DetectionRule("CHEAP", "network", Severity.HIGH, lambda event: event.category == "network",
+                      exclusive_group="category"),
+        DetectionRule("CRIT", "critical", Severity.HIGH, lambda event: event.severity == Severity.CRITICAL),
+    ]
+    plain = RuleEngine(detection_rules=rules, correlation_rules=[]).evaluate(events)
+    profiler = RuleProfiler(sample_every=4)
+    engine = RuleEngine(detection_rules=rules, correlation_rules=[], profiler=profiler, reorder_interval=50)
+    profiled = engine.evaluate(events)
+
+    assert [alert.id for alert in profiled] == [alert.id for alert in plain]
+    order = engine.evaluation_order()
+    assert order.index("CHEAP") < order.index("SLOW")
+    report = {row["rule_id"]: row for row in profiler.report()}
+    network = sum(1 for event in events if event.category == "network")
+    assert network > 0
+    assert report["SLOW"]["calls"] < 300
+    assert report["CHEAP"]["matches"] == network
+    assert report["CRIT"]["calls"] == 300
+    assert report["CRIT"]["matches"] == sum(1 for event in events if event.severity == Severity.CRITICAL)
+    assert profiler.exclusivity_violations == {}
+
+
+def test_profiler_only_reorders_within_exclusive_groups():
+    rules = [
+        DetectionRule("A", "a", Severity.LOW, lambda event: True),
+        DetectionRule("B", "b", Severity.LOW, lambda event: True, exclusive_group="g"),
+        DetectionRule("C", "c", Severity.LOW, lambda event: True),
+        DetectionRule("D", "d", Severity.LOW, lambda event: True, exclusive_group="g"),
+    ]
+    profiler = RuleProfiler(sample_every=1)
+    profiler.stats["B"] = RuleStats(calls=10, matches=1, sampled_calls=10, sampled_seconds=1.0)
+    profiler.stats["D"] = RuleStats(calls=10, matches=9, sampled_calls=10, sampled_seconds=1.0)
+    assert [rule.id for _, rule in profiler.order(rules)] == ["A", "D", "C", "B"]
+    assert [rule.id for _, rule in profiler.order(rules, broken={"g"})] == ["A", "B", "C", "D"]
+
+
+def test_non_exclusive_group_falls_back_to_full_evaluation():
+    events = list(default_pipeline(InMemoryEventSource(generate_events(200, seed=3))).run()["events"])
+    rules = [
+        DetectionRule("AUTH", "auth", Severity.LOW, lambda event: event.category == "auth", exclusive_group="g"),
+        DetectionRule("ANY", "any", Severity.LOW, lambda event: True, exclusive_group="g"),
+    ]
+    profiler = RuleProfiler(sample_every=1)
+    engine = RuleEngine(detection_rules=rules, correlation_rules=[], profiler=profiler)
+    profiled = engine.evaluate(events)
+
+    assert profiler.exclusivity_violations == {"g": 1}
+    assert sum(alert.rule_id == "ANY" for alert in profiled) == len(events)
+
+
+def test_pipeline_exports_rule_profile():
+    pipeline = default_pipeline(InMemoryEventSource(generate_events(50)))
+    pipeline.profiler = RuleProfiler(sample_every=1)
+    result = pipeline.run()
+    assert {row["rule_id"] for row in result["rule_profile"]} == {"RULE-1", "RULE-2", "RULE-3"}
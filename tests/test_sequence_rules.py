@@ -0,0 +1,86 @@
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import Event, InMemoryEventSource, SequenceRule, SequenceStep, Severity, default_pipeline
+
+
+def _attack(asset_id, start, gap=timedelta(minutes=1)):
+    payloads = [
+        {"category": "auth", "failed_attempts": 3},
+        {"category": "auth", "failed_attempts": 4},
+        {"category": "auth", "failed_attempts": 2},
+        {"category": "auth"},
+        {"category": "network"},
+    ]
+    return [
+        {
+            "id": f"{asset_id}-evt-{index}",
+            "source": "sensor",
+            "asset_id": asset_id,
+            "severity": "low",
+            "timestamp": (start + gap * index).isoformat(),
+            **payload,
+        }
+        for index, payload in enumerate(payloads)
+    ]
+
+
+def test_sequence_rule_fires_for_ordered_events_on_same_asset():
+    start = datetime.now(UTC) - timedelta(hours=1)
+    events = _attack("srv-1", start) + [
+        # Interleaved noise on another asset must not advance srv-1's match.
+        {"id": "noise", "asset_id": "srv-2", "severity": "low", "category": "network",
+         "timestamp": (start + timedelta(seconds=30)).isoformat()},
+    ]
+    result = default_pipeline(InMemoryEventSource(events)).run()
+
+    seq_alerts = [alert for alert in result["alerts"] if alert.rule_id == "SEQ-1"]
+    assert len(seq_alerts) == 1
+    assert seq_alerts[0].id == "SEQ-1:srv-1-evt-0"
+    assert seq_alerts[0].event_ids == [f"srv-1-evt-{index}" for index in range(5)]
+
+
+def test_sequence_rule_respects_window():
+    start = datetime.now(UTC) - timedelta(hours=1)
+    events = _attack("srv-1", start, gap=timedelta(minutes=4))
+    result = default_pipeline(InMemoryEventSource(events)).run()
+
+    assert not [alert for alert in result["alerts"] if alert.rule_id == "SEQ-1"]
+
+
+def _auth_events(categories, start=datetime(2024, 1, 1, tzinfo=UTC)):
+    return [
+        Event(id=f"evt-{index}", source="sensor", timestamp=start + timedelta(seconds=index),
+              severity=Severity.LOW, category=category, asset_id="srv-1", raw_payload={})
+        for index, category in enumerate(categories)
+    ]
+
+
+def test_sequence_matcher_forks_on_ambiguous_steps_and_keeps_only_needed_events():
+    # "auth" satisfies both the repeated first step and the looser second step.
+    matcher = SequenceRule(
+        id="SEQ-T",
+        name="fork",
+        severity=Severity.HIGH,
+        steps=[
+            SequenceStep(condition=lambda event: event.category == "auth", min_count=2),
+            SequenceStep(condition=lambda event: event.category in ("auth", "vpn")),
+            SequenceStep(condition=lambda event: event.category == "network"),
+        ],
+        key=lambda event: event.asset_id,
+        window=timedelta(minutes=10),
+        max_partials_per_key=64,
+    ).compile()
+    events = _auth_events(["auth"] * 12 + ["network"])
+
+    for event in events[:3]:
+        assert matcher.observe(event) is None
+    # The first run both waits on step one and has advanced to step two.
+    runs = sorted((run.step, run.count) for run in matcher._partials["srv-1"] if run.events[0].id == "evt-0")
+    assert runs == [(0, 2), (1, 1)]
+
+    for event in events[3:-1]:
+        assert matcher.observe(event) is None
+    assert all(len(run.events) <= 3 for run in matcher._partials["srv-1"])
+    matched = matcher.observe(events[-1])
+    assert [event.id for event in matched] == ["evt-0", "evt-1", "evt-2", "evt-12"]
+    assert matcher.active_partials() == 0
@@ -0,0 +1,108 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from security_dashboard import (
+    CorrelationRule,
+    Event,
+    ExternalSorter,
+    RuleEngine,
+    Severity,
+    SpillPolicy,
+    iter_events_by_asset,
+)
+
+
+def _events(count, assets=7, seed=3):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Event(
+            id=f"evt-{index}",
+            source="test",
+            asset_id=f"asset-{rng.randrange(assets)}",
+            severity=Severity.LOW,
+            category="network",
+            timestamp=base + timedelta(seconds=rng.randrange(3600)),
+            raw_payload={},
+        )
+        for index in range(count)
+    ]
+
+
+def test_external_sort_matches_stable_in_memory_sort(tmp_path):
+    events = _events(500)
+    sorter = ExternalSorter(key=lambda event: event.asset_id, memory_budget=40, directory=str(tmp_path))
+    sorter.extend(events)
+
+    assert [event.id for event in sorter] == [event.id for event in sorted(events, key=lambda event: event.asset_id)]
+    assert sorter.runs == 12
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spilled_grouping_preserves_first_seen_group_order():
+    events = _events(300)
+    spill = SpillPolicy(memory_budget=16)
+    rule = CorrelationRule("C", "busy asset", Severity.HIGH, lambda event: event.asset_id, threshold=45)
+
+    assert rule.correlate(events, spill=spill) == rule.correlate(events)
+    assert [(asset, [e.id for e in group]) for asset, group in iter_events_by_asset(events, spill)] == [
+        (asset, [e.id for e in group]) for asset, group in iter_events_by_asset(events)
+    ]
+
+
+def test_rule_engine_correlation_alerts_match_with_spill():
+    events = _events(400)
+    rules = [CorrelationRule("C", "busy asset", Severity.HIGH, lambda event: event.asset_id, threshold=50)]
+    clock = lambda: datetime(2024, 1, 2, tzinfo=UTC)
+    in_memory = RuleEngine([], rules, clock=clock)
+    spilled = RuleEngine([], rules, clock=clock, spill=SpillPolicy(memory_budget=25))
+    for start in range(0, len(events), 64):
+        in_memory.process(events[start : start + 64])
+        spilled.process(events[start : start + 64])
+
+    expected = in_memory.finish()
+    assert expected
+    assert spilled.finish() == expected
+
+
+class _GeneratedSource:
+    def __init__(self, count):
+        self.count = count
+
+    def fetch(self):
+        from synthetic import generate_events
+
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        for start in range(0, self.count, 1000):
+            chunk_start = base + timedelta(seconds=start)
+            yield from generate_events(1000, seed=start, start=chunk_start, id_prefix=f"evt-{start}")
+
+
+def _run(count, **options):
+    import tracemalloc
+
+    from security_dashboard import default_pipeline
+
+    pipeline = default_pipeline(_GeneratedSource(count))
+    for name, value in options.items():
+        setattr(pipeline, name, value)
+    tracemalloc.start()
+    try:
+        result = pipeline.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def test_streaming_pipeline_mode_matches_output_with_lower_peak_memory(tmp_path):
+    retained, retained_peak = _run(8_000)
+    streamed, streamed_peak = _run(
+        8_000, retain_events=False, spill=SpillPolicy(memory_budget=1_000, directory=str(tmp_path))
+    )
+
+    assert streamed["events"] == [] and streamed["event_count"] == retained["event_count"] == 8_000
+    # Chunking interleaves detection and sequence alerts differently, but the set is the same.
+    assert sorted(alert.id for alert in streamed["alerts"]) == sorted(alert.id for alert in retained["alerts"])
+    assert streamed["reports"][0].findings == retained["reports"][0].findings
+    assert streamed_peak < retained_peak / 2
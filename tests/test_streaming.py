@@ -0,0 +1,76 @@
+from datetime import UTC, datetime
+
+from security_dashboard import InMemoryEventSource, default_pipeline
+from security_dashboard.streaming import AlertBroadcaster, ClientBuffer, format_sse
+
+
+def test_client_buffer_is_bounded_and_coalesces_keyed_updates():
+    buffer = ClientBuffer(max_items=3)
+    for index in range(5):
+        buffer.push("alert", {"id": index})
+    buffer.push("incident", {"id": "INC-1", "v": 1}, key="INC-1")
+    buffer.push("incident", {"id": "INC-1", "v": 2}, key="INC-1")
+
+    assert buffer.drain() == [
+        ("dropped", {"count": 3}),
+        ("alert", {"id": 3}),
+        ("alert", {"id": 4}),
+        ("incident", {"id": "INC-1", "v": 2}),
+    ]
+    assert buffer.drain() == []
+
+
+def test_broadcaster_streams_pipeline_output_and_report_deltas():
+    broadcaster = AlertBroadcaster()
+    wakeups = []
+    client = broadcaster.subscribe(notify=lambda: wakeups.append(1))
+    events = [{"id": "evt-1", "asset_id": "srv-1", "severity": "critical", "category": "network",
+               "timestamp": datetime.now(UTC).isoformat()}]
+    for _ in range(2):
+        pipeline = default_pipeline(InMemoryEventSource(events))
+        pipeline.observers.append(broadcaster)
+        pipeline.run()
+
+    kinds = [kind for kind, _ in client.drain()]
+    assert kinds.count("alert") == 2
+    assert kinds.count("incident") == 1
+    # Identical reports on the second run produce no delta, so each id appears once.
+    assert kinds.count("report") == 2
+    assert wakeups
+    assert format_sse("alert", {"id": 1}) == 'event: alert\ndata: {"id":1}\n\n'
+
+
+def test_report_deltas_are_kept_per_stream():
+    broadcaster = AlertBroadcaster(max_reports=2)
+    client = broadcaster.subscribe()
+    events = [{"id": "evt-1", "asset_id": "srv-1", "severity": "critical", "category": "network",
+               "timestamp": datetime.now(UTC).isoformat()}]
+    for stream_id in ("run-1", "run-2", "run-2"):
+        pipeline = default_pipeline(InMemoryEventSource(events))
+        pipeline.observers.append(broadcaster.stream(stream_id))
+        pipeline.run()
+
+    reports = [payload for kind, payload in client.drain() if kind == "report"]
+    # Each new stream starts from scratch; the repeated run-2 adds no delta.
+    assert sorted((report["stream"], report["id"]) for report in reports) == [
+        ("run-1", "event-summary"), ("run-1", "incident-summary"),
+        ("run-2", "event-summary"), ("run-2", "incident-summary"),
+    ]
+    assert all(report["findings"] for report in reports)
+    assert len(broadcaster._report_state) == 2
+
+
+def test_stream_client_with_closed_loop_does_not_fail_publishers():
+    import asyncio
+
+    from main import wake_on
+    from security_dashboard import Alert, Severity
+
+    broadcaster = AlertBroadcaster()
+    loop = asyncio.new_event_loop()
+    wake = asyncio.Event()
+    client = broadcaster.subscribe(notify=wake_on(loop, wake, lambda: broadcaster.unsubscribe(client)))
+    loop.close()
+
+    broadcaster.on_alert(Alert("A-1", "RULE-1", ["evt-1"], Severity.HIGH))
+    assert broadcaster.client_count() == 0
@@ -0,0 +1,79 @@
+import copy
+from datetime import UTC, datetime, timedelta, timezone
+
+from security_dashboard import (
+    Alert,
+    IncidentPolicy,
+    IncidentService,
+    IncidentTimeline,
+    Severity,
+    TimelineEntryType,
+    TimelineSegment,
+)
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _service(segment=None):
+    policy = IncidentPolicy({Severity.HIGH: timedelta(minutes=30)})
+    return IncidentService(policy, clock=lambda: NOW, timeline_segment=segment)
+
+
+def test_timeline_renders_lifecycle_lazily_and_pages():
+    service = _service()
+    alerts = [Alert(id=f"A-{index}", rule_id="R", event_ids=[], severity=Severity.HIGH) for index in range(3)]
+    incident = service.create_incident("INC-1", alerts)
+    service.resolve_incident("INC-1", "contained")
+
+    assert list(incident.timeline) == [
+        f"{NOW.isoformat()} Incident created with alerts: A-0, A-1, A-2",
+        f"{NOW.isoformat()} Incident assigned to soc_on_call",
+        f"{NOW.isoformat()} Incident resolved: contained",
+    ]
+    assert incident.timeline.page(offset=1, limit=1) == [f"{NOW.isoformat()} Incident assigned to soc_on_call"]
+    [created] = incident.timeline.records(entry_type=TimelineEntryType.CREATED)
+    assert created.refs == ("A-0", "A-1", "A-2") and created.at == NOW
+    assert incident.timeline[-1].endswith("resolved: contained")
+
+
+def test_segment_backed_timelines_share_one_file(tmp_path):
+    with TimelineSegment(tmp_path / "timeline.seg") as segment:
+        service = _service(segment)
+        first = service.create_incident("INC-1", [Alert("A-1", "R", [], Severity.HIGH)])
+        second = service.create_incident("INC-2", [Alert("A-2", "R", [], Severity.HIGH)])
+        second.add_timeline_entry("escalated to tier 2 — 담당자 확인", at=NOW)
+
+        in_memory = IncidentTimeline()
+        in_memory.append(TimelineEntryType.CREATED, NOW, ["A-1"])
+        in_memory.append(TimelineEntryType.ASSIGNED, NOW, ["soc_on_call"])
+        assert first.timeline == in_memory
+        assert second.timeline[2] == f"{NOW.isoformat()} escalated to tier 2 — 담당자 확인"
+        assert copy.deepcopy(second.timeline).render() == second.timeline.render()
+    assert (tmp_path / "timeline.seg").stat().st_size > 0
+
+
+def test_timeline_keeps_each_entry_offset_and_accepts_plain_strings(tmp_path):
+    kst = NOW.astimezone(timezone(timedelta(hours=9)))
+    naive = NOW.replace(tzinfo=None)
+    segment_path = tmp_path / "timeline.seg"
+    segment = TimelineSegment(segment_path)
+    for timeline in (IncidentTimeline(), IncidentTimeline(segment)):
+        timeline.append(TimelineEntryType.NOTE, kst, ["paged"])
+        timeline.append(TimelineEntryType.NOTE, naive, ["imported"])
+        timeline.append(f"{kst.isoformat()} legacy entry")
+        timeline.append("no timestamp")
+
+        assert timeline[:3] == [
+            f"{kst.isoformat()} paged",
+            f"{naive.isoformat()} imported",
+            f"{kst.isoformat()} legacy entry",
+        ]
+        assert timeline.record(0).at == kst and timeline.record(0).at.utcoffset() == timedelta(hours=9)
+        assert timeline.record(1).at.tzinfo is None
+        last = timeline.record(-1)
+        assert last.type is TimelineEntryType.NOTE and last.refs == ("no timestamp",)
+        assert last.at.tzinfo is not None
+
+    flushed = segment_path.stat().st_size
+    segment.close()
+    assert flushed == segment_path.stat().st_size > 0
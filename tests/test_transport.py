@@ -0,0 +1,106 @@
+import multiprocessing
+
+import pytest
+
+from security_dashboard import InMemoryEventSource, RuleEngine, default_pipeline
+from security_dashboard.transport import SharedEventRing, ShardedEventRings, consume
+from synthetic import generate_events
+
+
+def _events(count):
+    return default_pipeline(InMemoryEventSource(generate_events(count, seed=5))).run()["events"]
+
+
+def _engine():
+    pipeline = default_pipeline(InMemoryEventSource([]))
+    return RuleEngine(
+        detection_rules=pipeline.detection_rules,
+        correlation_rules=pipeline.correlation_rules,
+        sequence_rules=pipeline.sequence_rules,
+    )
+
+
+def test_ring_views_expose_event_fields_and_wrap_around():
+    ring = SharedEventRing.create(capacity=4, slot_size=256)
+    reader = SharedEventRing.attach(ring.name)
+    try:
+        events = _events(10)
+        seen = []
+        for event in events:
+            while not ring.try_put(event):
+                views = reader.read()
+                seen.extend(view.to_event() for view in views)
+                reader.release(len(views))
+        seen.extend(view.to_event() for view in reader.read())
+        assert [(e.id, e.asset_id, e.severity, e.category, e.timestamp) for e in seen] == [
+            (e.id, e.asset_id, e.severity, e.category, e.timestamp) for e in events
+        ]
+        assert [e.raw_payload.get("failed_attempts") for e in seen] == [
+            e.raw_payload.get("failed_attempts") for e in events
+        ]
+        with pytest.raises(ValueError):
+            ring.try_put(events[0].__class__(**{**events[0].__dict__, "id": "x" * 300}))
+    finally:
+        reader.close()
+        ring.close()
+        ring.unlink()
+
+
+def _worker(name, queue):
+    ring = SharedEventRing.attach(name)
+    alerts = []
+    consume(ring, _engine(), alerts.extend, batch_size=16)
+    ring.close()
+    queue.put(sorted(alert.id for alert in alerts))
+
+
+def test_sharded_rings_feed_worker_processes_with_identical_alerts():
+    events = _events(400)
+    expected = sorted(alert.id for alert in _engine().evaluate(events))
+    context = multiprocessing.get_context("fork")
+    rings = ShardedEventRings.create(workers=2, capacity=32)
+    queue = context.Queue()
+    workers = [context.Process(target=_worker, args=(name, queue)) for name in rings.names]
+    try:
+        for worker in workers:
+            worker.start()
+        assert rings.feed(events, timeout=10) == 400
+        results = sorted(alert_id for _ in workers for alert_id in queue.get(timeout=10))
+        for worker in workers:
+            worker.join(timeout=10)
+    finally:
+        rings.close()
+    assert results == expected
+
+
+def test_tags_survive_the_ring_and_fire_tag_rules():
+    [event] = _events(1)
+    tagged = event.__class__(**{**event.__dict__, "tags": frozenset({"ioc:ip", "known-bad"})})
+    ring = SharedEventRing.create(capacity=2, slot_size=256)
+    try:
+        ring.try_put(tagged)
+        [view] = ring.read()
+        assert view.tags == tagged.tags
+        assert view.to_event().tags == tagged.tags
+        assert any(alert.rule_id == "RULE-3" for alert in _engine().evaluate([view]))
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def test_feed_closes_rings_on_failure_and_routes_oversized_events():
+    events = _events(3)
+    huge = events[0].__class__(**{**events[0].__dict__, "id": "x" * 600})
+    failing = ShardedEventRings.create(workers=1, capacity=8, slot_size=256)
+    routed = ShardedEventRings.create(workers=1, capacity=8, slot_size=256)
+    try:
+        with pytest.raises(ValueError):
+            failing.feed([events[0], huge, events[1]])
+        assert failing.rings[0].closed
+
+        oversized = []
+        assert routed.feed([events[2], huge], on_oversized=oversized.append) == 1
+        assert oversized == [huge] and routed.rings[0].closed
+    finally:
+        failing.close()
+        routed.close()